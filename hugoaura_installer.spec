@@ -65,6 +65,22 @@ hiddenimports = [
     'utils.uac',
     'utils.dirSearch',
     'utils.fileDownloader',
+    'utils.partialDownload',
+    'utils.artifactCache',
+    'utils.checksum',
+    'utils.progressReporter',
+    'utils.mirrorScoreboard',
+    'utils.httpClient',
+    'utils.zipFormat',
+    'utils.remoteZip',
+    'utils.zipExtractor',
+    'utils.asarArchive',
+    'utils.patchedAsarCache',
+    'utils.deltaUpgrade',
+    'utils.downloadService',
+    'utils.releasePrefetch',
+    'utils.networkLimits',
+    'utils.peerCache',
     'utils.killer',
     'config.config',
     'installer',
@@ -45,12 +45,13 @@ def run_as_admin():
         return True
     
     try:
-        # 以管理员权限重新运行程序
+        # 以管理员权限重新运行程序, 并传递原有的命令行参数; 打包后 sys.executable 即为程序本身, 无需传入脚本路径
+        argv = sys.argv[1:] if getattr(sys, "frozen", False) else [__file__] + sys.argv[1:]
         ctypes.windll.shell32.ShellExecuteW(
             None, 
             "runas", 
             sys.executable, 
-            f'"{__file__}"', 
+            " ".join(f'"{arg}"' for arg in argv), 
             None, 
             1
         )
@@ -81,6 +82,15 @@ def show_error_dialog(message):
 def main():
     """应用程序入口"""
     try:
+        # 共享资源缓存无需管理员权限, 在提权前交由 CLI 入口处理
+        if any(arg.split("=", 1)[0] == "--serve-cache" for arg in sys.argv[1:]):
+            try:
+                setup_logger()
+            except Exception as e:
+                print(f"日志初始化失败: {e}")
+            cliEntryMain.main()
+            return
+
         # 检查并提升管理员权限
         if not is_admin():
             print("AuraInstaller 需要管理员权限才能正常工作")
@@ -99,6 +109,8 @@ def main():
             # 以 CLI 模式启动
             app = cliEntryMain.main()
         else:
+            # 网络限速与局域网设备参数在图形界面模式下同样生效
+            cliEntryMain.apply_network_arguments(cliEntryMain.parse_arguments())
             # 创建并启动主控制器
             app = MainController()
             app.run()
@@ -16,6 +16,8 @@ class MainController:
     def __init__(self, theme="flatly"):
         # 创建模型和视图
         self.model = InstallerModel()
+        # 在窗口创建及用户选择版本期间预先建立网络连接
+        self.model.prewarm_connections()
         self.view = MainWindow(theme=theme)
 
         # 绑定事件
@@ -35,6 +37,7 @@ class MainController:
         self.view.set_install_callback(self._on_install)
         self.view.set_cancel_callback(self._on_cancel)
         self.view.set_uninstall_callback(self._on_uninstall)
+        self.view.set_version_selected_callback(self._on_version_selected)
 
         # 设置窗口关闭事件
         self.view.root.protocol("WM_DELETE_WINDOW", self._on_window_close)
@@ -80,6 +83,10 @@ class MainController:
             self.view.show_message("错误", f"安装启动失败: {str(e)}", "error")
             self.view.set_installing_state(False)
 
+    def _on_version_selected(self, tag: str | None):
+        """处理所选版本变化事件"""
+        self.model.prefetch_version(tag)
+
     def _on_cancel(self):
         """处理取消事件"""
         logger.info("用户请求取消操作")
@@ -98,6 +105,7 @@ class MainController:
 
     def _on_progress_update(self, progress: int, step: str, status: str | None = None):
         """处理进度更新"""
+        # 下载 / 解压进度已在上游由 ThrottledProgress 节流, 此处逐次转交主线程即可
         # 使用线程安全的方式更新UI
         self.view.root.after(
             0, lambda: self.view.update_progress(progress, step, status)
@@ -158,6 +166,8 @@ class MainController:
     def _cleanup(self):
         """清理资源"""
         try:
+            self.model.cancel_prefetch()
+
             # 等待安装线程结束 (最多等待2秒)
             if self.model.install_thread and self.model.install_thread.is_alive():
                 self.model.install_thread.join(timeout=2.0)
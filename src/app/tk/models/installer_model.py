@@ -8,6 +8,8 @@ from typing import Callable, Optional, Dict, Any
 import argparse
 
 from installer import run_installation
+from utils.releasePrefetch import release_prefetcher
+from utils.fileDownloader import prewarm_connections
 from uninstaller import run_uninstallation, get_uninstall_info, check_hugoaura_installation
 
 
@@ -249,6 +251,20 @@ class InstallerModel:
             self.is_uninstalling = False  # 设置 Flag
             self.update_status("正在取消卸载...")
 
+    def prewarm_connections(self):
+        """在后台预先建立到下载源与 GitHub API 的连接"""
+        prewarm_connections()
+
+    def prefetch_version(self, tag: str | None):
+        """在后台预取所选版本的资源文件, tag 为空时取消预取"""
+        if self.is_installing or self.is_uninstalling:
+            return
+        release_prefetcher.start(tag)
+
+    def cancel_prefetch(self):
+        """取消后台预取"""
+        release_prefetcher.cancel()
+
     def get_uninstall_info(self) -> Dict[str, Any]:
         """获取卸载信息"""
         return get_uninstall_info()  # Call func in uninstaller.py
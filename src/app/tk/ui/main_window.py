@@ -83,6 +83,7 @@ class MainWindow:
         self.install_callback: Optional[Callable] = None
         self.uninstall_callback: Optional[Callable] = None
         self.cancel_callback: Optional[Callable] = None
+        self.version_selected_callback: Optional[Callable] = None
 
         # 控件变量
         self.version_var = tk.StringVar(
@@ -95,6 +96,7 @@ class MainWindow:
         self.progress_var = tk.DoubleVar()
         self.status_var = tk.StringVar(value="正在加载版本信息...")
         self.step_var = tk.StringVar()
+        self._version_selected_after_id = None
 
         # 控件全局挂载
         self.version_frame = None
@@ -107,6 +109,10 @@ class MainWindow:
         # 创建界面
         self._create_widgets()
 
+        # 所选版本变化时通知控制器 (用于后台预取)
+        self.version_var.trace_add("write", self._on_version_selection_changed)
+        self.specific_version_var.trace_add("write", self._on_version_selection_changed)
+
         # 初始状态
         self.is_installing = False
 
@@ -377,6 +383,24 @@ class MainWindow:
         if ci_builds:
             self.specific_version_var.set(ci_builds[0]["tag"])
 
+    def _on_version_selection_changed(self, *_):
+        """所选版本变化时延迟通知, 合并重建选项过程中的连续变化"""
+        if self._version_selected_after_id:
+            self.root.after_cancel(self._version_selected_after_id)
+        self._version_selected_after_id = self.root.after(
+            500, self._notify_version_selected
+        )
+
+    def _notify_version_selected(self):
+        self._version_selected_after_id = None
+        if not self.version_selected_callback or self.is_installing:
+            return
+        # 仅列表中的版本会被预取, 自定义版本号 / 本地文件不预取
+        if self.version_var.get() in ["release", "prerelease", "ci"]:
+            self.version_selected_callback(self.specific_version_var.get() or None)
+        else:
+            self.version_selected_callback(None)
+
     def _is_valid_version_for_type(self, version_type: str) -> bool:
         """检查当前选择的版本是否对指定的版本类型有效"""
         current_version = self.specific_version_var.get()
@@ -1048,6 +1072,10 @@ Install 主仓库: HugoAura/HugoAura-Install"""
         """设置卸载回调函数"""
         self.uninstall_callback = callback
 
+    def set_version_selected_callback(self, callback: Callable):
+        """设置所选版本变化回调函数"""
+        self.version_selected_callback = callback
+
     def update_progress(self, progress: int, step: str = "", status: str | None = None):
         """更新进度"""
         self.progress_var.set(progress)
@@ -16,6 +16,8 @@ CORE_FILENAME = "core.zip"
 AURA_FILENAME = "aura.zip"
 TARGET_ASAR_NAME = "app.asar"
 EXTRACTED_FOLDER_NAME = "aura"
+# aura.zip 的文件若被多套了一层 (或多层) 以下名称的外层目录, 解压时直接去除
+AURA_ZIP_ROOT_NAMES = (EXTRACTED_FOLDER_NAME, AURA_FILENAME.rsplit(".", 1)[0])
 
 # 下载 URL 列表
 BASE_DOWNLOAD_URLS = [
@@ -30,9 +32,67 @@ BASE_DOWNLOAD_URLS = [
     f"https://github.com/{GITHUB_OWNER}/{GITHUB_DL_REPO}/releases/download",
 ]
 
+# 分段并行下载
+SEGMENTED_DOWNLOAD_ENABLED = True
+SEGMENTED_MAX_MIRRORS = 4  # 同时参与分段下载的下载源数量上限 (按测速排名取前 N 个)
+SEGMENTED_CONNECTIONS_PER_MIRROR = 1
+SEGMENT_SIZE_BYTES = 1024 * 1024
+SEGMENT_MIN_SPLIT_BYTES = 256 * 1024  # 慢分段剩余量低于该值的两倍时不再拆分
+SEGMENTED_MIN_FILE_SIZE = 2 * 1024 * 1024  # 小于该大小的文件直接单连接下载
+SEGMENTED_MIRROR_MAX_FAILURES = 3  # 单个下载源连续失败次数上限, 超过后不再参与本次下载
+
+# 下载进度回报节流: 最高回报频率及两次回报间的最小字节增量 (最终进度总会送达)
+PROGRESS_REPORT_MAX_HZ = 20
+PROGRESS_REPORT_MIN_BYTES = 64 * 1024
+
+# 下载读块大小随实测速度自适应, 目标为每次读取约 DOWNLOAD_CHUNK_TARGET_SECONDS 秒的数据
+DOWNLOAD_CHUNK_MIN_BYTES = 16 * 1024
+DOWNLOAD_CHUNK_MAX_BYTES = 1024 * 1024
+DOWNLOAD_CHUNK_TARGET_SECONDS = 0.1
+
+# 多文件并发下载时, 是否让各文件从不同的下载源开始下载
+CONCURRENT_DOWNLOAD_SPREAD_MIRRORS = True
+
+# 后台下载服务: 同时运行的下载任务数上限, 及同一主机 (按首选下载源计) 上的任务数上限
+DOWNLOAD_SERVICE_MAX_JOBS = 4
+DOWNLOAD_SERVICE_MAX_JOBS_PER_HOST = 2
+
+# 远程 ZIP 解压: 通过 Range 请求读取中央目录后直接获取并解压各条目, 不在本地保存完整 ZIP;
+# 结果无法存入资源缓存, 也无法校验整个文件的 SHA-256, 因此只用于不缓存的版本 (如 vAutoBuild) 中没有期望 SHA-256 的文件
+REMOTE_ZIP_EXTRACT_ENABLED = True
+REMOTE_ZIP_WORKERS = 4
+REMOTE_ZIP_BATCH_BYTES = 1024 * 1024  # 相邻的小条目合并为一个请求, 单个请求的数据量上限
+REMOTE_ZIP_MAX_GAP_BYTES = 64 * 1024  # 两个条目之间间隔不超过该值时合并请求, 间隔数据直接丢弃
+
+# 本地 ZIP 并行解压: 内存映射 ZIP 文件, 由线程池并行解压各条目 (zlib 解压时释放 GIL)
+ZIP_EXTRACT_WORKERS = min(8, os.cpu_count() or 4)
+ZIP_EXTRACT_TASK_BYTES = 512 * 1024  # 相邻的小条目合并为一个任务, 单个任务的压缩数据量下限
+
+# ASAR 修补: 直接拼接出新归档, 未改动的文件按原始字节区间拷贝, 无需解包整个归档; 关闭时解包后重新打包
+ASAR_SPLICE_PATCH_ENABLED = True
+ASAR_EXTRACT_WORKERS = min(8, os.cpu_count() or 4)  # 需要完整解包时并行写出文件的线程数
+
 # GitHub API URL
 GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/releases"
 
+# 共享 HTTP 客户端: 默认超时 (连接, 读取), 建连失败时的重试次数与退避系数, 每个主机保持的连接数
+HTTP_CONNECT_TIMEOUT = 10
+HTTP_READ_TIMEOUT = 30
+HTTP_CONNECT_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.3
+HTTP_POOL_MAXSIZE = 8
+# 限制单主机连接数时, 等待空闲连接的最长时间 (秒), 超时按连接失败处理, 避免未归还的连接使请求永久阻塞
+HTTP_POOL_TIMEOUT = 60
+# 图形界面启动时预先建立到评分最高的 N 个下载源及 GitHub API 的连接
+HTTP_PREWARM_ENABLED = True
+HTTP_PREWARM_MIRRORS = 3
+
+# 网络限速 (批量部署时使用): 总速率上限 (字节/秒), 单主机连接数上限, 开始下载前的最大随机延迟 (秒); 0 表示不限
+# 可在 NETWORK_LIMITS_CONFIG_PATH 中以 {"max_rate": "2M", "max_conns_per_host": 2, "jitter": 30} 覆盖, 命令行参数优先
+NETWORK_MAX_BYTES_PER_SEC = 0
+NETWORK_MAX_CONNECTIONS_PER_HOST = 0
+NETWORK_START_JITTER_SECONDS = 0
+
 # 目标路径模式
 SWASS_PATH_PATTERN = r"C:\\Program Files (x86)\\Seewo\\SeewoService\\SeewoService_*\\SeewoServiceAssistant\\resources"
 
@@ -40,6 +100,77 @@ SWASS_PATH_PATTERN = r"C:\\Program Files (x86)\\Seewo\\SeewoService\\SeewoServic
 TEMP_DIR_NAME = "Aura-Install-Temp"
 TEMP_INSTALL_DIR = os.path.join(tempfile.gettempdir(), TEMP_DIR_NAME)
 
+# 可续传下载 (.part) 目录, 独立于临时目录, 以便安装失败 / 重新启动后继续下载
+PARTIAL_DOWNLOAD_DIR = os.path.join(tempfile.gettempdir(), "Aura-Install-Partial")
+PARTIAL_DOWNLOAD_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# 增量更新: 已安装 aura 目录时仅获取 CRC32 / 大小发生变化的条目, 暂存目录独立于临时目录
+DELTA_UPGRADE_ENABLED = True
+DELTA_STAGING_DIR = os.path.join(tempfile.gettempdir(), "Aura-Install-Delta")
+
+# 下载时边下载边计算 SHA-256, 并与 Release 元数据或 <filename>.sha256 校验文件比对
+DOWNLOAD_VERIFY_SHA256 = True
+CHECKSUM_SIDECAR_SUFFIX = ".sha256"
+
+# 管理工具持久化数据目录 (资源缓存, 下载源评分等)
+APP_STATE_DIR = os.path.join(
+    os.getenv("LOCALAPPDATA", tempfile.gettempdir()), "HugoAura-Install"
+)
+
+# 网络限速配置文件
+NETWORK_LIMITS_CONFIG_PATH = os.path.join(APP_STATE_DIR, "network.json")
+
+# 本地资源缓存 (按 Tag 与 SHA-256 索引), 重装 / 回滚到已下载过的版本时无需联网
+ARTIFACT_CACHE_ENABLED = True
+ARTIFACT_CACHE_DIR = os.path.join(APP_STATE_DIR, "artifacts")
+ARTIFACT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+ARTIFACT_CACHE_MAX_AGE_SECONDS = 30 * 24 * 3600
+ARTIFACT_CACHE_MUTABLE_TAGS = ["vAutoBuild"]  # 会被覆盖发布的 Tag, 不进行缓存
+
+# 图形界面加载版本列表后, 在后台以低优先级预取所选版本的资源文件并存入资源缓存
+PREFETCH_ENABLED = True
+PREFETCH_DIR = os.path.join(ARTIFACT_CACHE_DIR, "prefetch")
+
+# ASAR 修补结果缓存: 以 (原始 ASAR 的 SHA-256, core 内容摘要, 修补规则版本) 为键 gzip 压缩保存 app-patched.asar,
+# 输入完全一致的重装直接取出上次的修补结果
+PATCHED_ASAR_CACHE_ENABLED = True
+PATCHED_ASAR_CACHE_DIR = os.path.join(APP_STATE_DIR, "patched-asar")
+PATCHED_ASAR_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 压缩后的总容量
+PATCHED_ASAR_CACHE_COMPRESSLEVEL = 1  # gzip 压缩级别, 速度优先
+
+# 局域网资源共享: --serve-cache 的监听地址与默认端口; LAN_PEERS 中的设备 (如 "http://192.168.1.10:8765")
+# 排在公网下载源之前, 也可通过 --peer 指定
+PEER_CACHE_BIND = "0.0.0.0"
+PEER_CACHE_PORT = 8765
+LAN_PEERS = []
+
+# 下载源评分 (EWMA 首字节时间 / 吞吐量 / 连续失败次数), 用于下载源排序及熔断
+MIRROR_SCOREBOARD_PATH = os.path.join(APP_STATE_DIR, "mirrors.json")
+MIRROR_SCORE_EWMA_ALPHA = 0.3
+MIRROR_SCORE_STALE_SECONDS = 6 * 3600  # 评分数据超过该时长未更新时在后台重新测速
+MIRROR_SCORE_REFERENCE_BYTES = 20 * 1024 * 1024  # 按该文件大小估算各下载源的预计完成时间
+MIRROR_BREAKER_FAILURE_THRESHOLD = 3  # 连续失败达到该次数后熔断
+MIRROR_BREAKER_COOLDOWN_SECONDS = 30 * 60
+
+# 下载源测速方式: "range" 为并发下载资源文件开头的一小段, 分别测量首字节时间与吞吐量;
+# "head" 为仅测量 HEAD 请求的响应时间
+MIRROR_PROBE_MODE = "range"
+MIRROR_PROBE_BYTES = 256 * 1024
+# 测速提前结束: 已有 MIRROR_RACE_QUORUM 个下载源可用, 或达到截止时间时即开始下载, 其余测速转入后台
+MIRROR_RACE_QUORUM = 3
+MIRROR_RACE_DEADLINE_SECONDS = 2.5
+
+# 下载停滞检测: 连续 DOWNLOAD_STALL_SECONDS 秒平均速度低于下限时切换下载源续传
+DOWNLOAD_STALL_SECONDS = 15
+DOWNLOAD_STALL_MIN_BYTES_PER_SEC = 16 * 1024
+
+# 对冲下载: 单连接下载开始 DOWNLOAD_HEDGE_AFTER_SECONDS 秒后, 若速度低于下限或预计完成时间
+# 慢于下一个下载源的评分估算, 则从下一个下载源并行下载剩余部分, 先完成者胜出
+DOWNLOAD_HEDGE_ENABLED = True
+DOWNLOAD_HEDGE_AFTER_SECONDS = 5
+DOWNLOAD_HEDGE_MIN_BYTES_PER_SEC = 512 * 1024
+DOWNLOAD_HEDGE_MIN_REMAINING_BYTES = 2 * 1024 * 1024  # 剩余量低于该值时不再对冲
+
 # HugoAura 数据路径
 HUGOAURA_USER_DATA_DIR = os.path.join(os.path.expanduser("~"), "Documents", "HugoAura")
 HUGOAURA_REGISTRY_KEY = r"SOFTWARE\\HugoAura"
@@ -5,10 +5,12 @@ import subprocess
 import time
 import sys
 import winreg
-import requests
 from pathlib import Path
 from loguru import logger as log
 from utils import dirSearch, fileDownloader, killer, asarPatcher
+from utils.httpClient import http_client
+from utils.releasePrefetch import release_prefetcher
+from utils.networkLimits import network_limits
 from config import config
 import lifecycle as lifecycleMgr
 import typeDefs.lifecycle as lifecycleTypes
@@ -17,7 +19,7 @@ import typeDefs.lifecycle as lifecycleTypes
 def fetch_github_releases():
     url = config.GITHUB_API_URL
     try:
-        resp = requests.get(url, timeout=30)
+        resp = http_client.get(url, timeout=30)
         resp.raise_for_status()
         return resp.json()
     except Exception as e:
@@ -150,6 +152,7 @@ def run_installation(args, installerClassIns=None):
     downloaded_aura_zip_path = None
     downloaded_core_zip_path = None
     download_source = None
+    delta_upgrade = None
     ssa_asar = config.TARGET_ASAR_NAME
     if_patch = True
 
@@ -163,18 +166,37 @@ def run_installation(args, installerClassIns=None):
         if status_callback:
             status_callback(status)
 
-    def update_progress(progress, step, status=None):
+    def update_progress(progress, step, status=None, log_step=True):
         if installerClassIns:
             if not installerClassIns.is_installing:
                 update_status("安装已取消")
                 raise Exception("INSTALLATION_CANCELLED")
         if progress_callback:
             progress_callback(progress, step, status)
-        log.info(step)
+        if log_step:
+            log.info(step)
+
+    last_logged_dl_decile = -1
 
     def rep_dl_progress(curDownloadSize, fullSize, fileName):
-        progress = round(curDownloadSize / fullSize * 100, 2)
-        update_progress(progress, f"[3 / 10] {fileName} 文件下载中, 进度: {progress} %")
+        nonlocal last_logged_dl_decile
+        progress = round(curDownloadSize / fullSize * 100, 2) if fullSize else 0
+        # 下载进度仅在每跨过 10% 时写入日志
+        decile = int(progress // 10)
+        update_progress(
+            progress,
+            f"[3 / 10] {fileName} 文件下载中, 进度: {progress} %",
+            log_step=decile != last_logged_dl_decile,
+        )
+        last_logged_dl_decile = decile
+
+    def rep_unzip_progress(curSize, fullSize, fileName):
+        progress = round(curSize / fullSize * 100, 2) if fullSize else 100
+        update_progress(
+            40 + round(progress / 10, 2),
+            f"[4 / 10] {fileName} 解压中, 进度: {progress} %",
+            log_step=False,
+        )
 
     try:
         update_progress(0, "[0 / 10] 准备")
@@ -204,6 +226,7 @@ def run_installation(args, installerClassIns=None):
                     return False
 
         install_dir_path = Path(install_dir_path_str)
+        target_aura_path = install_dir_path / config.EXTRACTED_FOLDER_NAME
 
         update_progress(20, "[2 / 10] 选择 HugoAura 版本")
         download_source = select_release_source(args)
@@ -218,6 +241,8 @@ def run_installation(args, installerClassIns=None):
         dlCallbackFuncName = (
             lifecycleTypes.GLOBAL_CALLBACKS.REPORT_DOWNLOAD_PROGRESS.value
         )
+        temp_extract_path = Path(config.TEMP_INSTALL_DIR) / "aura"
+        temp_extract_path_core = Path(config.TEMP_INSTALL_DIR) / "core"
         if is_download_src_from_local:
             if os.path.exists(download_source) and os.path.isdir(download_source):
                 downloaded_aura_zip_path = Path(download_source) / "aura.zip"
@@ -235,48 +260,48 @@ def run_installation(args, installerClassIns=None):
                 error_detail = "无效的路径, 请检查路径输入"
                 return False
         else:
+            # 下载与解压在同一步骤中完成, 资源文件直接解压至临时目录
             update_progress(32, "[3 / 10] 正在下载资源文件")
             lifecycleMgr.callbacks[dlCallbackFuncName] = rep_dl_progress
-            downloaded_core_zip_path, downloaded_aura_zip_path = (
-                fileDownloader.download_release_files(download_source)
+            network_limits.apply_jitter()
+            # 图形界面已在后台预取该版本时接管预取, 预取完成的文件随后直接从资源缓存取得
+            release_prefetcher.adopt(download_source, rep_dl_progress)
+            extract_dirs = {
+                config.CORE_FILENAME: temp_extract_path_core,
+                config.AURA_FILENAME: temp_extract_path,
+            }
+            if config.DELTA_UPGRADE_ENABLED and target_aura_path.is_dir():
+                # 已安装旧版本时仅获取变化的文件, 在第 6 步写入安装目录
+                delta_upgrade = fileDownloader.prepare_delta_upgrade(
+                    download_source, target_aura_path
+                )
+                if delta_upgrade:
+                    extract_dirs.pop(config.AURA_FILENAME)
+            release_extracted = fileDownloader.extract_release_files(
+                download_source, extract_dirs
             )
-        if not downloaded_core_zip_path or not downloaded_aura_zip_path:
-            log.critical("资源文件下载失败, 即将结束安装")
-            error_detail = "资源文件下载失败, 请检查网络连接及日志信息"
-            return False
-
-        lifecycleMgr.callbacks[dlCallbackFuncName] = None
+            lifecycleMgr.callbacks[dlCallbackFuncName] = None
+            if not release_extracted:
+                log.critical("资源文件下载失败, 即将结束安装")
+                error_detail = "资源文件下载失败, 请检查网络连接及日志信息"
+                return False
 
         update_progress(40, "[4 / 10] 解压资源文件")
-        temp_extract_path = Path(config.TEMP_INSTALL_DIR) / "aura"
-        temp_extract_path_core = Path(config.TEMP_INSTALL_DIR) / "core"
-        if not fileDownloader.unzip_file(
-            downloaded_aura_zip_path, temp_extract_path
-        ) or not fileDownloader.unzip_file(
-            downloaded_core_zip_path, temp_extract_path_core
+        if is_download_src_from_local and (
+            not fileDownloader.unzip_file(
+                downloaded_aura_zip_path,
+                temp_extract_path,
+                rep_unzip_progress,
+                config.AURA_ZIP_ROOT_NAMES,
+            )
+            or not fileDownloader.unzip_file(
+                downloaded_core_zip_path, temp_extract_path_core, rep_unzip_progress
+            )
         ):
             error_detail = "资源文件解压失败"
             log.critical(error_detail)
             raise Exception(error_detail)
 
-        expected_aura_source_path = temp_extract_path
-        if not expected_aura_source_path.is_dir():
-            log.error(
-                f"ZIP 解压后目录结构校验异常 {config.EXTRACTED_FOLDER_NAME} {temp_extract_path}, 尝试自动修复..."
-            )
-            potential_nested_path = (
-                temp_extract_path
-                / Path(downloaded_aura_zip_path.stem)
-                / config.EXTRACTED_FOLDER_NAME
-            )
-            if potential_nested_path.is_dir():
-                log.warning(f"检测到嵌套文件夹, 自动移动中...")
-                expected_aura_source_path = potential_nested_path
-            else:
-                error_detail = "Aura.zip 结构解析失败, 文件结构不正确"
-                log.critical(error_detail)
-                raise Exception(error_detail)
-
         update_progress(50, "[5 / 10] 卸载文件系统过滤驱动")
         try:
             if not args.dry_run:
@@ -300,18 +325,22 @@ def run_installation(args, installerClassIns=None):
             log.error(f"调用 fltmc 时发生未知错误: {e}")
 
         update_progress(60, "[6 / 10] 移动 Aura 文件夹")
-        target_aura_path = install_dir_path / config.EXTRACTED_FOLDER_NAME
         log.info(
             f"即将将 '{config.EXTRACTED_FOLDER_NAME}' 移动至 {target_aura_path}..."
         )
         try:
             if target_aura_path.exists():
-                log.warning(
-                    f"发现旧版本 HugoAura 目录: {target_aura_path}, 即将清理..."
-                )
-                if not args.dry_run:
-                    shutil.rmtree(target_aura_path)
-                    time.sleep(0.1)
+                if delta_upgrade:
+                    log.info(f"发现旧版本 HugoAura 目录: {target_aura_path}, 即将增量更新...")
+                    if not args.dry_run:
+                        delta_upgrade.apply()
+                else:
+                    log.warning(
+                        f"发现旧版本 HugoAura 目录: {target_aura_path}, 即将清理..."
+                    )
+                    if not args.dry_run:
+                        shutil.rmtree(target_aura_path)
+                        time.sleep(0.1)
                 ssa_asar = "app.asar.bak"  # 此情况默认为更新 HugoAura, 因此使用上次 patch 时留存的原版 ASAR 备份
                 if os.path.exists(install_dir_path / ssa_asar):
                     log.warning(
@@ -327,8 +356,8 @@ def run_installation(args, installerClassIns=None):
                     if_patch = False
                     # TODO: 允许用户强制使用当前的 app.asar 进行 Patch
 
-            if not args.dry_run:
-                shutil.move(str(expected_aura_source_path), str(target_aura_path))
+            if not delta_upgrade and not args.dry_run:
+                shutil.move(str(temp_extract_path), str(target_aura_path))
             log.success(f"成功移动文件夹 '{config.EXTRACTED_FOLDER_NAME}'")
         except Exception as e:
             error_detail = (
@@ -476,6 +505,8 @@ def run_installation(args, installerClassIns=None):
             except OSError as e:
                 log.warning(f"临时文件夹清理失败: {e}")
                 log.warning("请尝试手动清理")
+        if delta_upgrade and not args.dry_run:
+            delta_upgrade.cleanup()
 
         if install_success:
             log.success("-----------------------------------------")
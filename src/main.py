@@ -6,6 +6,8 @@ from loguru import logger as log
 from utils import uac
 from version import __appVer__
 import installer
+from utils.networkLimits import network_limits
+from utils import peerCache
 from config import config
 
 
@@ -50,9 +52,46 @@ def parse_arguments():
         "--cli", help="以 CLI 模式启动", action="store_true"
     )
 
+    # 网络限速参数, 未指定时使用配置文件中的设置
+    parser.add_argument(
+        "--max-rate", help="下载总速率上限, 例如 512K / 2M (字节/秒)", type=str
+    )
+    parser.add_argument(
+        "--max-conns-per-host", help="到同一主机的最大连接数", type=int
+    )
+    parser.add_argument(
+        "--jitter", help="开始下载前随机等待的最长时间 (秒)", type=float
+    )
+
+    # 局域网资源共享
+    parser.add_argument(
+        "--serve-cache",
+        help=f"将本地资源缓存共享给局域网中的其他设备, 可指定端口 (默认 {config.PEER_CACHE_PORT})",
+        nargs="?",
+        const=config.PEER_CACHE_PORT,
+        type=int,
+    )
+    parser.add_argument(
+        "--peer",
+        help="优先从局域网设备下载, 例如 http://192.168.1.10:8765, 可多次指定",
+        action="append",
+        default=[],
+    )
+
     return parser.parse_args()
 
 
+def apply_network_arguments(args):
+    """
+    应用网络限速与局域网设备参数, CLI 与图形界面模式共用
+
+    Args:
+        args: parse_arguments() 返回的参数对象
+    """
+    network_limits.configure(args)
+    peerCache.add_lan_peers(args.peer)
+
+
 def print_exit_codes():
     """
     打印所有退出代码及其释义
@@ -77,6 +116,13 @@ def main():
     log.info(f"EXEC: {sys.executable}")
     log.info(f"Arg: {sys.argv}")
 
+    apply_network_arguments(args)
+
+    if args.serve_cache is not None:
+        # 共享资源缓存无需管理员权限, 图形界面启动器 (app.py) 在提权前即转交至此
+        peerCache.serve_cache(args.serve_cache)
+        sys.exit(0)
+
     has_version_args = args.version or args.path or args.pre or args.latest
     is_double_click = len(sys.argv) == 1
     
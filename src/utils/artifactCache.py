@@ -0,0 +1,205 @@
+"""
+本地资源缓存
+按内容 (SHA-256) 存储已下载并校验过的 aura.zip / core.zip, 并以 Tag + 文件名建立索引,
+重装或回滚到已下载过的版本时直接从缓存取出, 超出容量 / 期限时按最近最少使用淘汰
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from loguru import logger as log
+from utils.checksum import sha256_file
+from config.config import (
+    ARTIFACT_CACHE_DIR,
+    ARTIFACT_CACHE_ENABLED,
+    ARTIFACT_CACHE_MAX_AGE_SECONDS,
+    ARTIFACT_CACHE_MAX_BYTES,
+    ARTIFACT_CACHE_MUTABLE_TAGS,
+)
+
+
+class ArtifactCache:
+    """内容寻址的本地资源缓存"""
+
+    def __init__(self, cache_dir: str = ARTIFACT_CACHE_DIR):
+        """
+        初始化资源缓存
+
+        Args:
+            cache_dir: 缓存根目录, 其下 objects/ 存放以 SHA-256 命名的文件, index.json 为索引
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, tag: str | None) -> bool:
+        return bool(ARTIFACT_CACHE_ENABLED and tag and tag not in ARTIFACT_CACHE_MUTABLE_TAGS)
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.objects_dir / sha256[:2] / sha256
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            return json.loads(self.index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.warning(f"资源缓存索引损坏, 将重建: {e}")
+            return {}
+
+    def _save_index(self, index: Dict[str, Dict]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+
+    def contains(self, tag: str, filename: str) -> bool:
+        """仅检查索引中是否有该文件, 不校验内容"""
+        if not self.is_cacheable(tag):
+            return False
+        with self._lock:
+            return f"{tag}/{filename}" in self._load_index()
+
+    def digest_of(self, tag: str, filename: str) -> Optional[str]:
+        """返回索引中该文件的 SHA-256, 不校验内容"""
+        if not self.is_cacheable(tag):
+            return None
+        with self._lock:
+            entry = self._load_index().get(f"{tag}/{filename}")
+        return entry["sha256"] if entry else None
+
+    def object_path(self, sha256: str) -> Optional[Path]:
+        """按 SHA-256 取得缓存对象的路径, 不存在时返回 None"""
+        object_path = self._object_path(sha256)
+        return object_path if object_path.is_file() else None
+
+    def lookup(self, tag: str, filename: str, dest_folder: str) -> Optional[Path]:
+        """
+        从缓存中取出文件
+
+        Args:
+            tag: 版本标签
+            filename: 文件名
+            dest_folder: 目标目录, 文件将以 filename 为名复制到此处
+
+        Returns:
+            命中时返回目标路径, 否则返回 None
+        """
+        if not self.is_cacheable(tag):
+            return None
+
+        key = f"{tag}/{filename}"
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if not entry:
+                return None
+            object_path = self._object_path(entry["sha256"])
+
+            try:
+                if (
+                    not object_path.exists()
+                    or object_path.stat().st_size != entry["size"]
+                    or sha256_file(object_path) != entry["sha256"]
+                ):
+                    log.warning(f"缓存文件 {key} 已损坏, 将重新下载")
+                    index.pop(key, None)
+                    self._save_index(index)
+                    self._remove_unreferenced(index, entry["sha256"])
+                    return None
+
+                dest_path = Path(dest_folder) / filename
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                if dest_path.exists():
+                    os.remove(dest_path)
+                # 复制而非硬链接: 缓存对象同时供局域网设备使用, 不能与可写的临时目录共享同一份数据;
+                # shutil.copyfile 在支持的平台上使用系统的快速拷贝
+                shutil.copyfile(object_path, dest_path)
+
+                entry["last_used"] = time.time()
+                self._save_index(index)
+            except OSError as e:
+                log.warning(f"读取缓存文件 {key} 失败: {e}")
+                return None
+
+        log.success(f"资源缓存命中: {key} (SHA-256: {entry['sha256'][:12]}...)")
+        return dest_path
+
+    def store(self, tag: str, filename: str, path: Path, sha256: str | None = None):
+        """
+        将已下载的文件存入缓存
+
+        Args:
+            tag: 版本标签
+            filename: 文件名
+            path: 已下载文件路径
+            sha256: 已知的文件 SHA-256, 为空时重新计算
+        """
+        if not self.is_cacheable(tag):
+            return
+
+        key = f"{tag}/{filename}"
+        try:
+            sha256 = sha256 or sha256_file(path)
+            size = path.stat().st_size
+            with self._lock:
+                object_path = self._object_path(sha256)
+                if not object_path.exists():
+                    object_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = object_path.with_suffix(".tmp")
+                    shutil.copyfile(path, tmp_path)
+                    os.replace(tmp_path, object_path)
+
+                index = self._load_index()
+                now = time.time()
+                index[key] = {
+                    "sha256": sha256,
+                    "size": size,
+                    "stored_at": index.get(key, {}).get("stored_at", now),
+                    "last_used": now,
+                }
+                self._evict(index)
+                self._save_index(index)
+            log.info(f"已将 {key} 存入资源缓存")
+        except OSError as e:
+            log.warning(f"写入资源缓存失败 ({key}): {e}")
+
+    def _remove_unreferenced(self, index: Dict[str, Dict], sha256: str):
+        if any(entry["sha256"] == sha256 for entry in index.values()):
+            return
+        object_path = self._object_path(sha256)
+        try:
+            if object_path.exists():
+                os.remove(object_path)
+        except OSError as e:
+            log.warning(f"删除缓存文件 {object_path} 失败: {e}")
+
+    def _evict(self, index: Dict[str, Dict]):
+        """按期限及总容量淘汰缓存项, 调用方需持有锁"""
+        deadline = time.time() - ARTIFACT_CACHE_MAX_AGE_SECONDS
+        for key, entry in list(index.items()):
+            if entry["last_used"] < deadline:
+                log.info(f"资源缓存项 {key} 已过期, 正在清理")
+                index.pop(key)
+                self._remove_unreferenced(index, entry["sha256"])
+
+        def total_size() -> int:
+            return sum({entry["sha256"]: entry["size"] for entry in index.values()}.values())
+
+        by_last_used = sorted(index.items(), key=lambda item: item[1]["last_used"])
+        # 保留最近使用的一项, 避免单个文件超出容量时刚写入就被淘汰
+        for key, entry in by_last_used[:-1]:
+            if total_size() <= ARTIFACT_CACHE_MAX_BYTES:
+                break
+            log.info(f"资源缓存超出容量, 正在淘汰 {key}")
+            index.pop(key)
+            self._remove_unreferenced(index, entry["sha256"])
+
+
+# 全局资源缓存实例
+artifact_cache = ArtifactCache()
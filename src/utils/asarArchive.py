@@ -0,0 +1,643 @@
+"""
+ASAR 归档读写
+解析 ASAR 头部并内存映射源归档, 头部按需展开为扁平的 路径 -> 节点 索引, 供列目录、读取、解包与修补共用;
+修补时仅替换 / 新增少量文件, 其余文件内容按原始字节区间直接拷贝至新归档, 无需解包整个归档;
+写出归档时先按文件大小生成头部, 再将各文件内容流式拷贝至输出, 平台支持时由内核直接完成拷贝 (copy_file_range / sendfile)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from loguru import logger as log
+from config.config import ASAR_EXTRACT_WORKERS
+
+_PREFIX = struct.Struct("<4I")
+COPY_CHUNK_SIZE = 1024 * 1024
+# 与 asar 库 / @electron/asar 一致的完整性校验分块大小
+INTEGRITY_BLOCK_SIZE = 4 * 1024 * 1024
+# 链接最多跟随的层数
+MAX_LINK_DEPTH = 32
+# 单个文件在归档中的最大大小
+MAX_FILE_SIZE = 0xFFFFFFFF
+# copy_file_range / sendfile 单次调用拷贝的最大字节数 (Linux 的上限)
+_MAX_KERNEL_COPY = 0x7FFFF000
+_HAS_PREAD = hasattr(os, "pread")
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+# 仅 Linux 的 sendfile 支持写入普通文件, macOS 等平台只能写入套接字
+_HAS_FILE_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+# 节点标志
+FLAG_DIR = 0x1
+FLAG_LINK = 0x2
+FLAG_UNPACKED = 0x4
+FLAG_EXECUTABLE = 0x8
+
+
+class AsarFormatError(Exception):
+    """ASAR 无法解析"""
+
+
+class AsarExtractError(Exception):
+    """解包时部分文件写出失败"""
+
+    def __init__(self, errors: List[Tuple[str, Exception]]):
+        self.errors = errors
+        details = "; ".join(f"{path}: {error}" for path, error in errors[:5])
+        more = f" 等 {len(errors)} 个文件" if len(errors) > 5 else ""
+        super().__init__(f"解包时 {len(errors)} 个文件出错: {details}{more}")
+
+
+def _align(size: int, alignment: int = 4) -> int:
+    return (size + alignment - 1) & ~(alignment - 1)
+
+
+def encode_header(header: Dict[str, Any]) -> bytes:
+    """按 Chromium Pickle 格式编码头部, 与 asar 库的输出一致"""
+    header_json = json.dumps(
+        header, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    aligned_size = _align(len(header_json))
+    header_object_size = aligned_size + 4
+    return (
+        _PREFIX.pack(4, header_object_size + 4, header_object_size, len(header_json))
+        + header_json
+        + b"\0" * (aligned_size - len(header_json))
+    )
+
+
+def compute_integrity(chunks: Iterable[bytes | memoryview]) -> Tuple[Dict[str, Any], int]:
+    """
+    计算文件内容的完整性校验信息
+
+    Args:
+        chunks: 文件内容, 每块 (最后一块除外) 须为 INTEGRITY_BLOCK_SIZE 字节
+
+    Returns:
+        (integrity, 文件大小)
+    """
+    hasher = hashlib.sha256()
+    blocks = []
+    size = 0
+    for chunk in chunks:
+        hasher.update(chunk)
+        blocks.append(hashlib.sha256(chunk).hexdigest())
+        size += len(chunk)
+    return {
+        "algorithm": "SHA256",
+        "hash": hasher.hexdigest(),
+        "blockSize": INTEGRITY_BLOCK_SIZE,
+        "blocks": blocks,
+    }, size
+
+
+def _iter_file_blocks(path: Path) -> Iterator[memoryview]:
+    # 复用同一块缓冲区, 每块仅在取下一块之前有效
+    buffer = bytearray(INTEGRITY_BLOCK_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            filled = 0
+            while filled < INTEGRITY_BLOCK_SIZE:
+                read = f.readinto(view[filled:])
+                if not read:
+                    break
+                filled += read
+            if not filled:
+                return
+            yield view[:filled]
+            if filled < INTEGRITY_BLOCK_SIZE:
+                return
+
+
+def _iter_bytes_blocks(data: bytes) -> Iterator[bytes]:
+    for start in range(0, len(data), INTEGRITY_BLOCK_SIZE):
+        yield data[start : start + INTEGRITY_BLOCK_SIZE]
+
+
+def _is_packed_file(node: Dict[str, Any]) -> bool:
+    return "files" not in node and "link" not in node and not node.get("unpacked")
+
+
+def _iter_nodes(node: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for name, child in node["files"].items():
+        path = f"{prefix}{name}"
+        yield path, child
+        if "files" in child:
+            yield from _iter_nodes(child, f"{path}/")
+
+
+# 文件内容来源: 直接给出的 bytes, 或 (源文件路径, 起始位置, 长度)
+AsarBody = bytes | Tuple[Path, int, int]
+
+
+def _write_all(fd: int, data: bytes | memoryview):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+class _BodyCopier:
+    """
+    向输出文件描述符的当前位置顺序拷贝源文件中的字节区间
+
+    依次尝试 copy_file_range 与 sendfile, 某种方式不被当前文件系统支持时不再使用, 都不可用时退回缓冲拷贝
+    """
+
+    def __init__(self, out_fd: int):
+        self.out_fd = out_fd
+        self._use_copy_file_range = _HAS_COPY_FILE_RANGE
+        self._use_sendfile = _HAS_FILE_SENDFILE
+
+    def copy(self, src_fd: int, offset: int, size: int):
+        end = offset + size
+        while offset < end:
+            copied = self._copy_once(src_fd, offset, min(end - offset, _MAX_KERNEL_COPY))
+            if not copied:
+                raise AsarFormatError("拷贝文件内容时遇到意外的文件结尾")
+            offset += copied
+
+    def _copy_once(self, src_fd: int, offset: int, count: int) -> int:
+        if self._use_copy_file_range:
+            try:
+                return os.copy_file_range(src_fd, self.out_fd, count, offset)
+            except OSError as e:
+                # EXDEV / ENOSYS / EINVAL / EOPNOTSUPP 等: 跨文件系统或不受支持
+                log.debug(f"copy_file_range 不可用, 改用其他方式拷贝: {e}")
+                self._use_copy_file_range = False
+        if self._use_sendfile:
+            try:
+                return os.sendfile(self.out_fd, src_fd, offset, count)
+            except OSError as e:
+                log.debug(f"sendfile 不可用, 改用缓冲拷贝: {e}")
+                self._use_sendfile = False
+        count = min(count, COPY_CHUNK_SIZE)
+        if _HAS_PREAD:
+            chunk = os.pread(src_fd, count, offset)
+        else:
+            os.lseek(src_fd, offset, os.SEEK_SET)
+            chunk = os.read(src_fd, count)
+        _write_all(self.out_fd, chunk)
+        return len(chunk)
+
+
+def write_archive(output_path: Path, header: Dict[str, Any], bodies: Iterable[AsarBody]):
+    """
+    写出头部后将各文件内容依次流式拷贝至输出, 内存占用与归档大小无关
+
+    Args:
+        output_path: 输出路径
+        header: 已为各文件分配好 offset 的头部
+        bodies: 按 offset 顺序排列的文件内容来源, 相邻来源之间不留空隙
+    """
+    out_fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o666)
+    src_path: Path | None = None
+    src_fd = -1
+    try:
+        _write_all(out_fd, encode_header(header))
+        copier = _BodyCopier(out_fd)
+        for body in bodies:
+            if isinstance(body, bytes):
+                _write_all(out_fd, body)
+                continue
+            path, offset, size = body
+            if path != src_path:
+                # 同一源文件的连续区间 (拼接时的源归档) 共用一个描述符
+                if src_fd >= 0:
+                    os.close(src_fd)
+                    src_fd = -1
+                src_fd = os.open(path, os.O_RDONLY | _O_BINARY)
+                src_path = path
+            copier.copy(src_fd, offset, size)
+    finally:
+        if src_fd >= 0:
+            os.close(src_fd)
+        os.close(out_fd)
+
+
+class AsarNode:
+    """
+    索引中的一个节点
+
+    raw 为头部中对应的原始对象; 目录节点的 children 在首次展开前为 None, 展开后为子节点名称
+    """
+
+    __slots__ = ("offset", "size", "flags", "raw", "children")
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self.children: Tuple[str, ...] | None = None
+        self.offset = 0
+        self.size = 0
+        if "files" in raw:
+            self.flags = FLAG_DIR
+        elif "link" in raw:
+            self.flags = FLAG_LINK
+        else:
+            self.flags = FLAG_EXECUTABLE if raw.get("executable") else 0
+            try:
+                self.size = int(raw.get("size", 0))
+                if not raw.get("unpacked"):
+                    self.offset = int(raw["offset"])
+            except (KeyError, TypeError, ValueError):
+                raise AsarFormatError("ASAR 头部中的文件节点无效")
+        if raw.get("unpacked"):
+            self.flags |= FLAG_UNPACKED
+
+    @property
+    def is_dir(self) -> bool:
+        return bool(self.flags & FLAG_DIR)
+
+    @property
+    def is_link(self) -> bool:
+        return bool(self.flags & FLAG_LINK)
+
+    @property
+    def is_unpacked(self) -> bool:
+        return bool(self.flags & FLAG_UNPACKED)
+
+    @property
+    def is_packed_file(self) -> bool:
+        return not self.flags & (FLAG_DIR | FLAG_LINK | FLAG_UNPACKED)
+
+
+class AsarIndex:
+    """
+    ASAR 头部的扁平索引: 归档内路径 ("/" 分隔, 根目录为 "") -> AsarNode
+
+    目录在首次被访问时才展开其直接子节点, 已展开的路径查找为 O(1)
+    """
+
+    def __init__(self, header: Dict[str, Any]):
+        self._nodes: Dict[str, AsarNode] = {"": AsarNode(header)}
+
+    def _expand(self, path: str, node: AsarNode):
+        if node.children is not None:
+            return
+        prefix = f"{path}/" if path else ""
+        files = node.raw["files"]
+        if not isinstance(files, dict):
+            raise AsarFormatError(f"ASAR 中的目录 {path} 无效")
+        for name, raw in files.items():
+            if not isinstance(raw, dict):
+                raise AsarFormatError(f"ASAR 中的节点 {prefix}{name} 无效")
+            if name in ("", ".", "..") or "/" in name or "\\" in name:
+                raise AsarFormatError(f"ASAR 中的文件名无效: {prefix}{name!r}")
+            self._nodes[prefix + name] = AsarNode(raw)
+        node.children = tuple(files)
+
+    def lookup(self, path: str) -> Optional[AsarNode]:
+        """查找节点, 不存在时返回 None; 沿途未展开的目录会被展开"""
+        path = path.strip("/")
+        node = self._nodes.get(path)
+        if node is not None or not path:
+            return node
+        parts = path.split("/")
+        for depth in range(len(parts)):
+            parent_path = "/".join(parts[:depth])
+            parent = self._nodes.get(parent_path)
+            if parent is None or not parent.is_dir:
+                return None
+            self._expand(parent_path, parent)
+        return self._nodes.get(path)
+
+    def listdir(self, path: str = "") -> Tuple[str, ...]:
+        """目录的直接子节点名称"""
+        path = path.strip("/")
+        node = self.lookup(path)
+        if node is None:
+            raise FileNotFoundError(f"ASAR 中不存在 {path}")
+        if not node.is_dir:
+            raise NotADirectoryError(f"ASAR 中的 {path} 不是目录")
+        self._expand(path, node)
+        return node.children  # type: ignore
+
+    def walk(self, path: str = "") -> Iterator[Tuple[str, AsarNode]]:
+        """深度优先遍历目录下的全部节点 (不含该目录本身), 父目录总在其子节点之前"""
+        path = path.strip("/")
+        prefix = f"{path}/" if path else ""
+        for name in self.listdir(path):
+            child_path = prefix + name
+            node = self._nodes[child_path]
+            yield child_path, node
+            if node.is_dir:
+                yield from self.walk(child_path)
+
+    def export(self) -> Dict[str, Any]:
+        """导出完整头部的副本: 目录对象重建, 文件与链接对象为浅拷贝, 可直接修改后写出"""
+
+        def export_dir(path: str, node: AsarNode) -> Dict[str, Any]:
+            prefix = f"{path}/" if path else ""
+            files = {}
+            for name in self.listdir(path):
+                child = self._nodes[prefix + name]
+                files[name] = (
+                    export_dir(prefix + name, child) if child.is_dir else dict(child.raw)
+                )
+            exported: Dict[str, Any] = {"files": files}
+            if node.raw.get("unpacked"):
+                exported["unpacked"] = True
+            return exported
+
+        return export_dir("", self._nodes[""])
+
+
+class AsarArchive:
+    """只读打开的 ASAR 归档"""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: ASAR 文件路径
+
+        Raises:
+            AsarFormatError: 头部无法解析
+        """
+        self.path = Path(path)
+        self.unpacked_dir = Path(f"{self.path}.unpacked")
+        with open(self.path, "rb") as f:
+            header, self.data_offset = self._read_header(f)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = AsarIndex(header)
+
+    @staticmethod
+    def _read_header(f) -> Tuple[Dict[str, Any], int]:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise AsarFormatError("文件过短, 不是有效的 ASAR 归档")
+        size_pickle, header_size, _, header_string_size = _PREFIX.unpack(prefix)
+        if size_pickle != 4 or header_string_size + 8 > header_size:
+            raise AsarFormatError("ASAR 头部长度无效")
+        try:
+            header = json.loads(f.read(header_string_size).decode("utf-8"))
+        except (UnicodeDecodeError, ValueError) as e:
+            raise AsarFormatError(f"ASAR 头部无法解析: {e}")
+        if not isinstance(header, dict) or "files" not in header:
+            raise AsarFormatError("ASAR 头部缺少根目录")
+        return header, 8 + header_size
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _body_range(self, path: str, offset: int, size: int) -> Tuple[int, int]:
+        start = self.data_offset + offset
+        end = start + size
+        if end > len(self._mm):
+            raise AsarFormatError(f"文件 {path} 的内容超出归档范围")
+        return start, end
+
+    def _resolve(self, path: str) -> Tuple[str, AsarNode]:
+        """查找节点并跟随链接"""
+        path = path.strip("/")
+        for _ in range(MAX_LINK_DEPTH):
+            node = self.index.lookup(path)
+            if node is None:
+                raise FileNotFoundError(f"ASAR 中不存在 {path}")
+            if not node.is_link:
+                return path, node
+            path = Path(node.raw["link"]).as_posix().strip("/")
+        raise AsarFormatError(f"ASAR 中的链接 {path} 层数过多")
+
+    def ls(self, path: str = "", recursive: bool = False) -> List[str]:
+        """
+        列出目录内容
+
+        Args:
+            path: 归档内目录, "/" 分隔, 默认为根目录
+            recursive: 是否递归列出, 为 True 时返回相对于归档根目录的完整路径
+        """
+        if recursive:
+            return [child_path for child_path, _ in self.index.walk(path)]
+        return list(self.index.listdir(path))
+
+    def cat(self, path: str) -> bytes:
+        """读取归档内的文件内容, 跟随链接"""
+        path, node = self._resolve(path)
+        if node.is_dir:
+            raise IsADirectoryError(f"ASAR 中的 {path} 是目录")
+        if node.is_unpacked:
+            return (self.unpacked_dir / path).read_bytes()
+        start, end = self._body_range(path, node.offset, node.size)
+        return self._mm[start:end]
+
+    def _read_at(self, fd: int, offset: int, size: int) -> bytes:
+        # 按位置读取, 多个线程共用同一个文件描述符; 无 os.pread 的平台 (Windows) 从内存映射读取
+        if _HAS_PREAD:
+            return os.pread(fd, size, offset)
+        return self._mm[offset : offset + size]
+
+    def _extract_file(self, fd: int, path: str, node: AsarNode, target: Path):
+        if node.is_unpacked:
+            source = self.unpacked_dir / path
+            if source.exists():
+                shutil.copy2(source, target)
+            else:
+                # 以 app.asar.bak 为源时 .unpacked 目录通常不在其旁边, 与原先的行为一致, 跳过即可
+                log.warning(f"文件 {path} 位于 .unpacked 目录中但不存在, 跳过")
+            return
+        start, end = self._body_range(path, node.offset, node.size)
+        with open(target, "wb") as f:
+            position = start
+            while position < end:
+                chunk = self._read_at(fd, position, min(COPY_CHUNK_SIZE, end - position))
+                if not chunk:
+                    raise AsarFormatError(f"读取文件 {path} 时遇到意外的文件结尾")
+                f.write(chunk)
+                position += len(chunk)
+        if node.flags & FLAG_EXECUTABLE and os.name != "nt":
+            target.chmod(target.stat().st_mode | 0o111)
+
+    def extract(
+        self,
+        dest: Path,
+        progress_cb: Callable[[int, int, str], None] | None = None,
+    ):
+        """
+        将整个归档解包到目标目录
+
+        先一次性创建全部目录, 再由线程池并行写出各文件, 最后创建链接
+
+        Args:
+            dest: 目标目录
+            progress_cb: 进度回调, 每写完一个文件按累计字节数回报, 文件名为其归档内路径
+
+        Raises:
+            AsarExtractError: 部分文件写出失败, 其余文件仍会写出
+        """
+        dest = Path(dest)
+        directories = [dest]
+        files: List[Tuple[str, AsarNode, Path]] = []
+        links: List[Tuple[str, AsarNode, Path]] = []
+        for path, node in self.index.walk():
+            target = dest.joinpath(*path.split("/"))
+            if node.is_dir:
+                directories.append(target)
+            elif node.is_link:
+                links.append((path, node, target))
+            else:
+                files.append((path, node, target))
+        for directory in directories:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        total_size = sum(node.size for _, node, _ in files)
+        done_size = 0
+        errors: List[Tuple[str, Exception]] = []
+        fd = os.open(self.path, os.O_RDONLY | _O_BINARY)
+        try:
+            with ThreadPoolExecutor(
+                max_workers=ASAR_EXTRACT_WORKERS, thread_name_prefix="AuraAsarExtract"
+            ) as pool:
+                futures = {
+                    pool.submit(self._extract_file, fd, path, node, target): (path, node)
+                    for path, node, target in sorted(
+                        files, key=lambda item: item[1].size, reverse=True
+                    )
+                }
+                for future in as_completed(futures):
+                    path, node = futures[future]
+                    try:
+                        future.result()
+                    except (OSError, AsarFormatError) as e:
+                        errors.append((path, e))
+                        continue
+                    done_size += node.size
+                    if progress_cb:
+                        progress_cb(done_size, total_size, path)
+        finally:
+            os.close(fd)
+
+        for path, node, target in links:
+            try:
+                if target.is_symlink() or target.exists():
+                    target.unlink()
+                target.symlink_to(dest / node.raw["link"])
+            except OSError as e:
+                errors.append((path, e))
+
+        if errors:
+            raise AsarExtractError(errors)
+
+    def splice(self, output_path: Path, replacements: Dict[str, bytes | Path]):
+        """
+        写出替换 / 新增了部分文件的新归档, 其余文件内容按原始字节区间拷贝
+
+        原样保留的文件按其在源归档中的顺序排列, 相邻的区间合并为一次拷贝; 替换或新增的文件排在最后。
+        位于 .unpacked 目录中的文件与链接保持不变。
+
+        Args:
+            output_path: 输出路径
+            replacements: 归档内路径 ("/" 分隔) -> 新内容 (bytes 或本地文件路径)
+        """
+        header = self.index.export()
+        new_nodes: List[Tuple[Dict[str, Any], bytes | Path]] = []
+        for path, source in replacements.items():
+            parts = path.strip("/").split("/")
+            node = header
+            for part in parts[:-1]:
+                child = node["files"].get(part)
+                if child is None or "files" not in child:
+                    child = {"files": {}}
+                    node["files"][part] = child
+                node = child
+            if isinstance(source, Path):
+                integrity, size = compute_integrity(_iter_file_blocks(source))
+            else:
+                integrity, size = compute_integrity(_iter_bytes_blocks(source))
+            new_node = {"size": size, "integrity": integrity}
+            node["files"][parts[-1]] = new_node
+            new_nodes.append((new_node, source))
+
+        new_ids = {id(node) for node, _ in new_nodes}
+        kept = sorted(
+            (
+                (path, node)
+                for path, node in _iter_nodes(header)
+                if _is_packed_file(node) and id(node) not in new_ids
+            ),
+            key=lambda item: int(item[1]["offset"]),
+        )
+
+        runs: List[List[int]] = []
+        offset = 0
+        for path, node in kept:
+            start, end = self._body_range(path, int(node["offset"]), node["size"])
+            if runs and runs[-1][1] == start:
+                runs[-1][1] = end
+            elif end > start:
+                runs.append([start, end])
+            node["offset"] = str(offset)
+            offset += node["size"]
+        for node, _ in new_nodes:
+            node["offset"] = str(offset)
+            offset += node["size"]
+
+        log.debug(
+            f"拼接 ASAR: 保留 {len(kept)} 个文件 ({len(runs)} 段区间), 替换 / 新增 {len(new_nodes)} 个文件"
+        )
+        bodies: List[AsarBody] = [(self.path, start, end - start) for start, end in runs]
+        for node, source in new_nodes:
+            bodies.append((source, 0, node["size"]) if isinstance(source, Path) else source)
+        write_archive(Path(output_path), header, bodies)
+
+
+def pack_directory(src_dir: Path, output_path: Path):
+    """
+    将目录打包为 ASAR 归档
+
+    先遍历目录, 由文件大小分配偏移并流式计算完整性校验, 写出头部后再将各文件内容直接拷贝至输出;
+    头部格式与 asar 库的 create_archive 一致, 子项按名称排序以保证相同目录的输出不变
+
+    Args:
+        src_dir: 待打包的目录
+        output_path: 输出路径
+
+    Raises:
+        ValueError: 链接指向目录之外, 或单个文件过大
+    """
+    src_dir = Path(src_dir).resolve()
+    header: Dict[str, Any] = {"files": {}}
+    bodies: List[AsarBody] = []
+    offset = 0
+
+    def add_dir(directory: Path, files: Dict[str, Any]):
+        nonlocal offset
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.is_symlink():
+                link = os.path.relpath(path.resolve(), src_dir)
+                if link == os.pardir or link.startswith(os.pardir + os.sep):
+                    raise ValueError(f"{path.relative_to(src_dir)}: 链接 {link} 指向打包目录之外")
+                files[entry.name] = {"link": link}
+            elif entry.is_dir():
+                node: Dict[str, Any] = {"files": {}}
+                files[entry.name] = node
+                add_dir(path, node["files"])
+            else:
+                integrity, size = compute_integrity(_iter_file_blocks(path))
+                if size > MAX_FILE_SIZE:
+                    raise ValueError(f"{path.relative_to(src_dir)}: 文件过大, 无法打包进 ASAR")
+                node = {"size": size, "integrity": integrity, "offset": str(offset)}
+                if os.name != "nt" and entry.stat().st_mode & 0o100:
+                    node["executable"] = True
+                files[entry.name] = node
+                bodies.append((path, 0, size))
+                offset += size
+
+    add_dir(src_dir, header["files"])
+    log.debug(f"打包 ASAR: {len(bodies)} 个文件, 共 {offset / 1024 / 1024:.2f} MB")
+    write_archive(Path(output_path), header, bodies)
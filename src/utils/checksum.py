@@ -0,0 +1,158 @@
+"""
+资源文件 SHA-256 校验
+负责边下载边计算摘要, 以及从 Release 元数据 / 校验文件中获取期望的摘要
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List
+from loguru import logger as log
+from utils.httpClient import http_client
+from config.config import BASE_DOWNLOAD_URLS, GITHUB_API_URL, CHECKSUM_SIDECAR_SUFFIX
+
+HASH_CHUNK_SIZE = 1024 * 1024
+_SHA256_PATTERN = re.compile(r"\b([0-9a-fA-F]{64})\b")
+
+
+class ChecksumMismatchError(Exception):
+    """下载内容与期望的 SHA-256 不一致"""
+
+
+def sha256_file(path: Path) -> str:
+    """计算文件的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_tree(root: Path) -> str:
+    """计算目录内容的摘要, 涵盖其中全部文件的相对路径与内容"""
+    digest = hashlib.sha256()
+    root = Path(root)
+    for path in sorted(root.rglob("*")):
+        if path.is_file():
+            digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+            digest.update(bytes.fromhex(sha256_file(path)))
+    return digest.hexdigest()
+
+
+class IncrementalHasher:
+    """
+    跟随写入进度计算文件的 SHA-256
+
+    顺序写入时直接调用 update() 传入数据; 分段乱序写入时调用 advance_to(),
+    从磁盘读取新近变为连续的前缀部分 (通常仍在系统页缓存中), 下载结束时无需再完整读一遍文件。
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.position = 0
+        self._digest = hashlib.sha256()
+
+    def update(self, data: bytes):
+        self._digest.update(data)
+        self.position += len(data)
+
+    def advance_to(self, offset: int):
+        if offset <= self.position or self.path is None:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.position)
+            while self.position < offset:
+                chunk = f.read(min(HASH_CHUNK_SIZE, offset - self.position))
+                if not chunk:
+                    break
+                self.update(chunk)
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def verify_digest(filename: str, actual: str, expected: str | None):
+    """
+    校验摘要, 不一致时抛出 ChecksumMismatchError
+
+    Args:
+        filename: 文件名, 仅用于日志
+        actual: 实际 SHA-256
+        expected: 期望 SHA-256, 为空时跳过校验
+    """
+    if not expected:
+        log.debug(f"{filename} 没有可用的期望摘要, 跳过校验 (SHA-256: {actual})")
+        return
+    if actual.lower() != expected.lower():
+        raise ChecksumMismatchError(
+            f"{filename} 校验失败, 期望 SHA-256 {expected}, 实际 {actual}"
+        )
+    log.info(f"{filename} SHA-256 校验通过")
+
+
+def _fetch_digests_from_release(tag: str, filenames: List[str]) -> Dict[str, str]:
+    resp = http_client.get(
+        f"{GITHUB_API_URL}/tags/{tag}",
+        timeout=5,
+        headers={"Accept": "application/vnd.github+json"},
+    )
+    resp.raise_for_status()
+    digests = {}
+    for asset in resp.json().get("assets", []):
+        digest = asset.get("digest") or ""
+        if asset.get("name") in filenames and digest.startswith("sha256:"):
+            digests[asset["name"]] = digest.split(":", 1)[1]
+    return digests
+
+
+def _fetch_digest_from_sidecar(url: str) -> str | None:
+    resp = http_client.get(url, timeout=5)
+    resp.raise_for_status()
+    match = _SHA256_PATTERN.search(resp.text[:4096])
+    return match.group(1).lower() if match else None
+
+
+def fetch_expected_digests(
+    tag: str, filenames: List[str], base_urls: List[str]
+) -> Dict[str, str]:
+    """
+    获取资源文件的期望 SHA-256
+
+    优先使用 GitHub Release 元数据中的 asset digest, 其次尝试从公网下载源获取
+    <filename>.sha256 校验文件。校验文件不从局域网设备获取, 以免同一设备为自己提供的文件作担保。
+
+    Args:
+        tag: 版本标签
+        filenames: 需要校验的文件名列表
+        base_urls: 已排序的下载源列表, 其中不属于 BASE_DOWNLOAD_URLS 的下载源会被忽略
+
+    Returns:
+        文件名到 SHA-256 的映射, 未能获取的文件不包含在内
+    """
+    digests: Dict[str, str] = {}
+    try:
+        digests.update(_fetch_digests_from_release(tag, filenames))
+    except Exception as e:
+        log.debug(f"从 Release 元数据获取摘要失败: {e}")
+
+    mirror_urls = [base_url for base_url in base_urls if base_url in BASE_DOWNLOAD_URLS]
+    for filename in filenames:
+        if filename in digests:
+            continue
+        for base_url in mirror_urls[:3]:
+            try:
+                digest = _fetch_digest_from_sidecar(
+                    f"{base_url}/{tag}/{filename}{CHECKSUM_SIDECAR_SUFFIX}"
+                )
+            except Exception:
+                continue
+            if digest:
+                digests[filename] = digest
+                break
+
+    for filename in filenames:
+        if filename in digests:
+            log.info(f"已获取 {filename} 的期望 SHA-256: {digests[filename][:12]}...")
+        else:
+            log.warning(f"未能获取 {filename} 的期望 SHA-256, 下载后将不进行校验")
+    return digests
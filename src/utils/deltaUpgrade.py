@@ -0,0 +1,143 @@
+"""
+增量更新
+将新版本 ZIP (资源缓存中的本地文件或远程文件) 中央目录中的条目 (名称、大小、CRC32) 与已安装目录中的文件逐一比对,
+仅获取新增或发生变化的条目, 并删除新版本中已不存在的文件与目录
+"""
+
+import os
+import shutil
+import zlib
+from pathlib import Path
+from typing import List, Set
+from loguru import logger as log
+from utils.remoteZip import RemoteZip
+from utils.zipExtractor import LocalZip
+from utils.zipFormat import ZipEntry, safe_entry_path
+from config.config import DELTA_STAGING_DIR
+
+CRC_CHUNK_SIZE = 1024 * 1024
+
+
+def _crc32_file(path: Path) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CRC_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _key(relative_path: str) -> str:
+    """Windows 文件系统不区分大小写, 比对路径时统一大小写"""
+    return relative_path.casefold() if os.name == "nt" else relative_path
+
+
+class DeltaUpgrade:
+    """基于 ZIP 中央目录的增量更新"""
+
+    def __init__(
+        self,
+        archive: RemoteZip | LocalZip,
+        installed_dir: Path,
+        staging_dir: str = DELTA_STAGING_DIR,
+    ):
+        """
+        初始化增量更新
+
+        Args:
+            archive: 已读取中央目录的新版本 ZIP
+            installed_dir: 已安装的目录, 其内容应与 ZIP 根目录对应
+            staging_dir: 变化条目的暂存目录, 全部获取成功后才会写入 installed_dir
+        """
+        self.archive = archive
+        self.installed_dir = Path(installed_dir)
+        self.staging_dir = Path(staging_dir)
+        self.changed: List[ZipEntry] = []
+        self.directories: List[ZipEntry] = []
+        self.removed_files: List[Path] = []
+        self.removed_dirs: List[Path] = []
+
+    def plan(self):
+        """比对已安装文件, 大小一致时才计算 CRC32"""
+        self.changed.clear()
+        self.directories.clear()
+        self.removed_files.clear()
+        self.removed_dirs.clear()
+
+        file_keys: Set[str] = set()
+        dir_keys: Set[str] = set()
+        unchanged = 0
+        for entry in self.archive.entries:
+            target = safe_entry_path(self.installed_dir, entry.name)
+            if target is None:
+                continue
+            relative_path = target.relative_to(self.installed_dir)
+            dir_keys.update(_key(parent.as_posix()) for parent in relative_path.parents)
+            if entry.is_dir:
+                dir_keys.add(_key(relative_path.as_posix()))
+                self.directories.append(entry)
+                continue
+            file_keys.add(_key(relative_path.as_posix()))
+            if (
+                target.is_file()
+                and target.stat().st_size == entry.file_size
+                and _crc32_file(target) == entry.crc
+            ):
+                unchanged += 1
+            else:
+                self.changed.append(entry)
+
+        for path in self.installed_dir.rglob("*"):
+            key = _key(path.relative_to(self.installed_dir).as_posix())
+            if path.is_dir() and not path.is_symlink():
+                if key not in dir_keys:
+                    self.removed_dirs.append(path)
+            elif key not in file_keys:
+                self.removed_files.append(path)
+
+        log.info(
+            f"增量更新: {unchanged} 个文件未变化, {len(self.changed)} 个文件需要获取 ({self.transfer_size / 1024:.1f} KB), {len(self.removed_files)} 个文件将被删除"
+        )
+
+    @property
+    def transfer_size(self) -> int:
+        return sum(entry.compress_size for entry in self.changed)
+
+    def fetch(self):
+        """将变化的条目获取到暂存目录"""
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        self.archive.extract(self.staging_dir, self.changed)
+
+    def apply(self):
+        """删除已不存在的文件, 再将暂存的文件移入已安装目录"""
+        for path in self.removed_files:
+            path.unlink(missing_ok=True)
+        # 由浅至深删除, 上层目录删除后其子目录随之消失
+        for path in sorted(self.removed_dirs, key=lambda p: len(p.parts)):
+            if path.exists():
+                shutil.rmtree(path)
+
+        for entry in self.directories:
+            target = safe_entry_path(self.installed_dir, entry.name)
+            if target.exists() and not target.is_dir():
+                target.unlink()
+            target.mkdir(parents=True, exist_ok=True)
+
+        for entry in self.changed:
+            source = safe_entry_path(self.staging_dir, entry.name)
+            target = safe_entry_path(self.installed_dir, entry.name)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.is_dir():
+                shutil.rmtree(target)
+            try:
+                os.replace(source, target)
+            except OSError:
+                # 暂存目录与安装目录不在同一分区
+                shutil.move(str(source), str(target))
+        log.success(
+            f"增量更新完成: 更新 {len(self.changed)} 个文件, 删除 {len(self.removed_files)} 个文件"
+        )
+
+    def cleanup(self):
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
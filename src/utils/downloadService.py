@@ -0,0 +1,221 @@
+"""
+后台下载服务
+在常驻后台线程的事件循环中调度下载任务: 按优先级排队, 限制全局及单个主机上的并发任务数,
+提交后返回 concurrent.futures.Future, 安装流程与界面预取均可等待或取消同一套任务;
+远程解压等经 RemoteZip 读取的任务同样在此排队, 与下载任务共用并发上限
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+from loguru import logger as log
+from config.config import DOWNLOAD_SERVICE_MAX_JOBS, DOWNLOAD_SERVICE_MAX_JOBS_PER_HOST
+
+# 任务优先级, 数值越小越先开始
+PRIORITY_INSTALL = 0
+PRIORITY_PREFETCH = 10
+
+_background_loop: asyncio.AbstractEventLoop | None = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """获取常驻后台线程中运行的事件循环, 下载任务与测速均在其中调度, 不随单次调用结束"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever,
+                daemon=True,
+                name="AuraNetworkLoop",
+            ).start()
+        return _background_loop
+
+
+class DownloadJob:
+    """一个下载任务"""
+
+    def __init__(
+        self,
+        urls: List[str],
+        dest_folder: str,
+        filename: str,
+        sha256: str | None = None,
+        priority: int = PRIORITY_INSTALL,
+        progress_cb: Callable[[int, int, str], None] | None = None,
+    ):
+        """
+        初始化下载任务
+
+        Args:
+            urls: 按优先级排序的完整文件 URL 列表
+            dest_folder: 目标目录
+            filename: 文件名
+            sha256: 期望的 SHA-256, 为空时沿用 Release 元数据中的摘要
+            priority: 优先级, 见 PRIORITY_*
+            progress_cb: 进度回调
+        """
+        self.urls = urls
+        self.dest_folder = dest_folder
+        self.filename = filename
+        self.sha256 = sha256
+        self.priority = priority
+        self.progress_cb = progress_cb
+        self.cancel_event = threading.Event()
+
+    @property
+    def host(self) -> str:
+        return self.urls[0].split("//")[1].split("/")[0]
+
+    def report_progress(self, downloaded_size: int, total_size: int, filename: str):
+        """转发进度; 任务被取消后抛出取消异常, 使下载线程尽快退出"""
+        if self.cancel_event.is_set():
+            raise Exception("INSTALLATION_CANCELLED")
+        if self.progress_cb:
+            self.progress_cb(downloaded_size, total_size, filename)
+
+    def run(self) -> Path | None:
+        """在下载线程中执行任务, 返回下载后的文件路径, 失败时为 None"""
+        # fileDownloader 依赖本模块调度下载, 此处延迟导入
+        from utils import fileDownloader
+
+        if self.sha256:
+            fileDownloader.expectedDigests[
+                fileDownloader.digest_key(self.urls[0], self.filename)
+            ] = self.sha256
+        return fileDownloader.download_from_urls(
+            self.urls, self.dest_folder, self.filename, self.report_progress
+        )
+
+
+class RemoteZipJob(DownloadJob):
+    """经 RemoteZip 按需读取远程 ZIP 的任务, 与下载任务共用全局及单主机并发上限"""
+
+    def __init__(
+        self,
+        urls: List[str],
+        filename: str,
+        work: Callable[[Callable[[int, int, str], None]], Any],
+        priority: int = PRIORITY_INSTALL,
+        progress_cb: Callable[[int, int, str], None] | None = None,
+    ):
+        """
+        初始化远程 ZIP 任务
+
+        Args:
+            urls: 按优先级排序的完整文件 URL 列表, 用于确定任务所在主机
+            filename: 文件名
+            work: 实际读取远程 ZIP 的函数, 接收本任务的进度回调 (任务被取消后抛出取消异常),
+                其返回值即为任务结果
+            priority: 优先级, 见 PRIORITY_*
+            progress_cb: 进度回调
+        """
+        super().__init__(urls, "", filename, priority=priority, progress_cb=progress_cb)
+        self.work = work
+
+    def run(self) -> Any:
+        return self.work(self.report_progress)
+
+
+class DownloadService:
+    """按优先级与并发上限调度下载任务的后台服务"""
+
+    def __init__(
+        self,
+        max_jobs: int = DOWNLOAD_SERVICE_MAX_JOBS,
+        max_jobs_per_host: int = DOWNLOAD_SERVICE_MAX_JOBS_PER_HOST,
+    ):
+        """
+        初始化下载服务
+
+        Args:
+            max_jobs: 同时运行的任务数上限
+            max_jobs_per_host: 首选下载源位于同一主机的任务数上限
+        """
+        self.max_jobs = max_jobs
+        self.max_jobs_per_host = max_jobs_per_host
+        # 以下状态仅在后台事件循环中访问
+        self._pending: List[Tuple[int, int, DownloadJob, asyncio.Future]] = []
+        self._running = 0
+        self._running_per_host: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_jobs, thread_name_prefix="AuraDownload"
+        )
+
+    def submit(self, job: DownloadJob) -> concurrent.futures.Future:
+        """
+        提交下载任务
+
+        Returns:
+            结果为 job.run() 返回值 (下载任务为下载后的文件路径, 失败时为 None) 的 Future; 调用 cancel() 可取消排队中
+            或正在下载的任务, 在事件循环中可通过 asyncio.wrap_future 等待
+        """
+        return asyncio.run_coroutine_threadsafe(self._run(job), get_background_loop())
+
+    async def _run(self, job: DownloadJob) -> Any:
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending.append((job.priority, next(self._sequence), job, waiter))
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # 名额已分配但任务尚未开始时被取消, 需归还名额
+            if waiter.done() and not waiter.cancelled():
+                self._release(job)
+            log.info(f"已取消排队中的下载任务 {job.filename}")
+            raise
+
+        try:
+            return await self._execute(job)
+        finally:
+            self._release(job)
+
+    def _dispatch(self):
+        """按优先级为排队中的任务分配名额, 所在主机已满的任务让位于后续任务"""
+        self._pending.sort(key=lambda entry: entry[:2])
+        for entry in list(self._pending):
+            if self._running >= self.max_jobs:
+                break
+            _, _, job, waiter = entry
+            if waiter.cancelled():
+                self._pending.remove(entry)
+                continue
+            if self._running_per_host.get(job.host, 0) >= self.max_jobs_per_host:
+                continue
+            self._pending.remove(entry)
+            self._running += 1
+            self._running_per_host[job.host] = self._running_per_host.get(job.host, 0) + 1
+            waiter.set_result(None)
+
+    def _release(self, job: DownloadJob):
+        self._running -= 1
+        self._running_per_host[job.host] -= 1
+        if not self._running_per_host[job.host]:
+            del self._running_per_host[job.host]
+        self._dispatch()
+
+    async def _execute(self, job: DownloadJob) -> Any:
+        thread_future = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._run_blocking, job
+        )
+        try:
+            return await asyncio.shield(thread_future)
+        except asyncio.CancelledError:
+            job.cancel_event.set()
+            log.info(f"正在取消下载任务 {job.filename}...")
+            # 下载线程退出后再释放名额, 避免被取消的任务与新任务同时占用连接
+            await asyncio.wait([thread_future])
+            raise
+
+    @staticmethod
+    def _run_blocking(job: DownloadJob) -> Any:
+        return job.run()
+
+# 全局下载服务实例
+download_service = DownloadService()
@@ -1,108 +1,962 @@
 import requests
+import urllib3.exceptions
 import time
-import zipfile
 import shutil
-import os
+import threading
+from collections import deque
 from pathlib import Path
 from loguru import logger as log
 from config.config import (
     BASE_DOWNLOAD_URLS,
+    CONCURRENT_DOWNLOAD_SPREAD_MIRRORS,
     AURA_FILENAME,
-    CORE_FILENAME,
+    AURA_ZIP_ROOT_NAMES,
     TEMP_INSTALL_DIR,
+    SEGMENTED_DOWNLOAD_ENABLED,
+    SEGMENTED_MAX_MIRRORS,
+    SEGMENTED_CONNECTIONS_PER_MIRROR,
+    SEGMENT_SIZE_BYTES,
+    SEGMENT_MIN_SPLIT_BYTES,
+    SEGMENTED_MIN_FILE_SIZE,
+    SEGMENTED_MIRROR_MAX_FAILURES,
+    DOWNLOAD_STALL_SECONDS,
+    DOWNLOAD_STALL_MIN_BYTES_PER_SEC,
+    DOWNLOAD_VERIFY_SHA256,
+    DOWNLOAD_CHUNK_MIN_BYTES,
+    DOWNLOAD_CHUNK_MAX_BYTES,
+    DOWNLOAD_CHUNK_TARGET_SECONDS,
+    MIRROR_PROBE_MODE,
+    MIRROR_PROBE_BYTES,
+    MIRROR_SCORE_REFERENCE_BYTES,
+    MIRROR_RACE_QUORUM,
+    MIRROR_RACE_DEADLINE_SECONDS,
+    DOWNLOAD_HEDGE_ENABLED,
+    DOWNLOAD_HEDGE_AFTER_SECONDS,
+    DOWNLOAD_HEDGE_MIN_BYTES_PER_SEC,
+    DOWNLOAD_HEDGE_MIN_REMAINING_BYTES,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_PREWARM_ENABLED,
+    HTTP_PREWARM_MIRRORS,
+    GITHUB_API_URL,
+    REMOTE_ZIP_EXTRACT_ENABLED,
+)
+from utils.partialDownload import PartialDownload, cleanup_stale_partials
+from utils.artifactCache import artifact_cache
+from utils.mirrorScoreboard import mirror_scoreboard
+from utils.progressReporter import ThrottledProgress
+from utils.httpClient import http_client
+from utils.networkLimits import network_limits
+from utils.peerCache import is_peer_url, lan_peers
+from utils.remoteZip import RemoteZip, RemoteZipError
+from utils.zipExtractor import LocalZip, extract_zip
+from utils.zipFormat import ZipFormatError, ZipLayoutError
+from utils.deltaUpgrade import DeltaUpgrade
+from utils.downloadService import (
+    DownloadJob,
+    PRIORITY_INSTALL,
+    RemoteZipJob,
+    download_service,
+    get_background_loop,
+)
+from utils.checksum import (
+    ChecksumMismatchError,
+    IncrementalHasher,
+    fetch_expected_digests,
+    sha256_file,
+    verify_digest,
 )
 import typeDefs.lifecycle
 import lifecycle as lifecycleMgr
 import asyncio
-import aiohttp
-import time
-from typing import List, Tuple
+import concurrent.futures
+from typing import Callable, Collection, List, Tuple
 
 
 desiredTag = None
+# "{tag}/{filename}" -> 期望的 SHA-256 (来自 Release 元数据或校验文件)
+expectedDigests: dict[str, str] = {}
+# "{tag}/{filename}" -> 下载完成并校验后的 SHA-256
+downloadedDigests: dict[str, str] = {}
+
+DOWNLOAD_HEADERS = {
+    "Accept-Encoding": "",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+}
+# (连接超时, 读取超时), 读取超时与停滞检测窗口一致, 完全无数据时同样能及时切换下载源
+DOWNLOAD_TIMEOUT = (HTTP_CONNECT_TIMEOUT, DOWNLOAD_STALL_SECONDS)
+PARTIAL_SAVE_INTERVAL_SECONDS = 1.0
+HEDGE_COPY_CHUNK_SIZE = 1024 * 1024
+# 取消对冲下载时等待对冲线程退出的最长时间
+HEDGE_CANCEL_JOIN_SECONDS = 1.0
+PROBE_TIMEOUT = (5, 10)
+
+
+class DownloadStalledError(requests.exceptions.RequestException):
+    """下载速度持续低于下限"""
+
+
+class _StallDetector:
+    """按固定时间窗口检测下载是否停滞"""
+
+    def __init__(self):
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+
+    def feed(self, size: int):
+        self._window_bytes += size
+        elapsed = time.monotonic() - self._window_start
+        if elapsed < DOWNLOAD_STALL_SECONDS:
+            return
+        speed = self._window_bytes / elapsed
+        if speed < DOWNLOAD_STALL_MIN_BYTES_PER_SEC:
+            raise DownloadStalledError(
+                f"下载速度过低 ({speed / 1024:.1f} KB/s, 持续 {elapsed:.0f}s)"
+            )
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+
+
+def _iter_chunks(response: requests.Response):
+    """
+    以自适应大小读取响应体
+
+    读块大小按实测速度调整为约 DOWNLOAD_CHUNK_TARGET_SECONDS 秒的数据量,
+    高速时减少循环与回调次数, 低速时保证停滞检测与进度回报的及时性。
+    来自局域网设备的数据不占用出口带宽, 不计入全局限速。
+    """
+    throttled = not is_peer_url(response.url)
+    chunk_size = DOWNLOAD_CHUNK_MIN_BYTES
+    while True:
+        start = time.monotonic()
+        try:
+            chunk = response.raw.read(chunk_size)
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except urllib3.exceptions.SSLError as e:
+            raise requests.exceptions.SSLError(e)
+        if not chunk:
+            return
+        if throttled:
+            network_limits.throttle(len(chunk))
+        yield chunk
+
+        elapsed = time.monotonic() - start
+        if elapsed > 0:
+            target = len(chunk) / elapsed * DOWNLOAD_CHUNK_TARGET_SECONDS
+            # 每次最多翻倍, 避免单次命中缓冲区的瞬时高速把读块直接放大到上限
+            if chunk_size < DOWNLOAD_CHUNK_MAX_BYTES and chunk_size * 2 <= target:
+                chunk_size *= 2
+            while chunk_size > DOWNLOAD_CHUNK_MIN_BYTES and chunk_size > target:
+                chunk_size //= 2
+
+
+def _report_progress(downloaded_size: int, total_size: int, filename: str):
+    callbackFuncName = typeDefs.lifecycle.GLOBAL_CALLBACKS.REPORT_DOWNLOAD_PROGRESS.value
+    if callbackFuncName in lifecycleMgr.callbacks.keys():
+        if lifecycleMgr.callbacks[callbackFuncName]:
+            lifecycleMgr.callbacks[callbackFuncName](
+                downloaded_size, total_size, filename
+            )  # type: ignore
+
+
+def _get_host(url: str) -> str:
+    return url.split("//")[1].split("/")[0]
+
+
+def zip_root_names(filename: str) -> Tuple[str, ...]:
+    """解压 filename 时允许去除的外层目录名称"""
+    return AURA_ZIP_ROOT_NAMES if filename == AURA_FILENAME else ()
+
+
+def _base_of(url: str) -> str:
+    """由 "{base_url}/{tag}/{filename}" 形式的完整 URL 得到下载源 base_url"""
+    return url.rsplit("/", 2)[0]
+
+
+def _parse_content_range_total(content_range: str) -> int:
+    """从 "bytes 0-0/12345" 形式的 Content-Range 中取出文件总大小, 未知时返回 0"""
+    total = content_range.rsplit("/", 1)[-1] if "/" in content_range else ""
+    return int(total) if total.isdigit() else 0
+
+
+def _parse_content_range_start(content_range: str) -> int:
+    """从 "bytes 100-199/12345" 形式的 Content-Range 中取出起始偏移, 无法解析时返回 -1"""
+    span = content_range.split(" ", 1)[-1].split("-", 1)[0]
+    return int(span) if span.isdigit() else -1
+
+
+def _tag_of(url: str) -> str:
+    """由 "{base_url}/{tag}/{filename}" 形式的完整 URL 得到版本标签"""
+    return url.rsplit("/", 2)[-2]
+
+
+def digest_key(url: str, filename: str) -> str:
+    """expectedDigests / downloadedDigests 的键, 不同版本的同名文件互不干扰"""
+    return f"{_tag_of(url)}/{filename}"
+
+
+def _partial_for(url: str, filename: str) -> PartialDownload:
+    return PartialDownload(_tag_of(url), filename)
+
+
+class CombinedProgress:
+    """
+    将多个文件的下载进度合并为一个按字节加权的总进度
+
+    各文件的下载线程分别调用 file_callback(filename) 返回的回调;
+    任一线程的回报触发取消后, 其余线程的下一次回报也会抛出同样的取消异常。
+    各文件的大小在其首次回报 (探测完成) 时才能得知, 全部得知之前总大小按未知 (0) 回报,
+    避免后开始的文件加入总大小时百分比回退。
+    """
+
+    def __init__(
+        self,
+        filenames: List[str],
+        report: Callable[[int, int, str], None] = _report_progress,
+    ):
+        self._lock = threading.Lock()
+        self._progress = {filename: (0, 0) for filename in filenames}
+        self._label = ", ".join(filenames)
+        self._cancel_error: Exception | None = None
+        self._reporter = ThrottledProgress(report)
+
+    def file_callback(self, filename: str) -> Callable[[int, int, str], None]:
+        def callback(downloaded_size: int, total_size: int, _filename: str):
+            with self._lock:
+                if self._cancel_error:
+                    raise self._cancel_error
+                self._progress[filename] = (downloaded_size, total_size)
+                downloaded = sum(cur for cur, _ in self._progress.values())
+                totals = [full for _, full in self._progress.values()]
+                total = sum(totals) if all(totals) else 0
+                try:
+                    self._reporter(downloaded, total, self._label)
+                except Exception as e:
+                    self._cancel_error = e
+                    raise
+
+        return callback
+
+    def flush(self):
+        self._reporter.flush()
+
+
+class _HedgedTransfer:
+    """
+    对冲下载: 在后台线程中从另一个下载源获取 [start, total_size) 区间
+
+    数据写入 .part 旁的独立 .hedge 文件, 与主连接互不干扰; 对冲先完成时,
+    由主线程将主连接尚未获取的部分从 .hedge 拷贝进 .part。
+    """
+
+    def __init__(self, url: str, partial: PartialDownload, start: int, etag: str | None):
+        self.url = url
+        self.start = start
+        self.total_size = partial.total_size
+        self.etag = etag
+        self.path = partial.part_path.with_suffix(".hedge")
+        self.received = 0
+        self.finished = threading.Event()
+        self.succeeded = False
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def position(self) -> int:
+        return self.start + self.received
+
+    def begin(self):
+        log.info(
+            f"当前下载源速度不理想, 从 {_get_host(self.url)} 对冲下载剩余的 {(self.total_size - self.start) / 1024 / 1024:.2f} MB"
+        )
+        self._thread.start()
+
+    def _run(self):
+        headers = dict(DOWNLOAD_HEADERS)
+        headers["Range"] = f"bytes={self.start}-{self.total_size - 1}"
+        try:
+            request_start = time.monotonic()
+            with http_client.get(
+                self.url, stream=True, timeout=DOWNLOAD_TIMEOUT, headers=headers
+            ) as r:
+                r.raise_for_status()
+                etag = r.headers.get("etag")
+                if r.status_code != 206 or _parse_content_range_total(
+                    r.headers.get("content-range", "")
+                ) != self.total_size:
+                    raise requests.exceptions.InvalidHeader("下载源未返回所需的分段内容")
+                if self.etag and etag and etag != self.etag:
+                    raise requests.exceptions.InvalidHeader("两个下载源上的文件不一致")
+                transfer_start = time.monotonic()
+                stall_detector = _StallDetector()
+                with open(self.path, "wb") as f:
+                    for chunk in _iter_chunks(r):
+                        if self._stop_event.is_set():
+                            return
+                        f.write(chunk)
+                        self.received += len(chunk)
+                        stall_detector.feed(len(chunk))
+            if self.position < self.total_size:
+                raise requests.exceptions.ChunkedEncodingError("连接在下载完成前关闭")
+            mirror_scoreboard.record_success(
+                _base_of(self.url),
+                transfer_start - request_start,
+                self.received,
+                time.monotonic() - transfer_start,
+            )
+            self.succeeded = True
+        except requests.exceptions.RequestException as e:
+            if not self._stop_event.is_set():
+                log.warning(f"对冲下载失败 ({_get_host(self.url)}): {e}")
+                mirror_scoreboard.record_failure(_base_of(self.url))
+        except OSError as e:
+            if not self._stop_event.is_set():
+                log.warning(f"写入对冲下载数据失败: {e}")
+        finally:
+            if self._stop_event.is_set():
+                # cancel() 未等到本线程退出时, .hedge 文件由本线程在关闭后删除
+                self._remove_data()
+            self.finished.set()
 
+    def wait(self) -> bool:
+        """等待对冲下载结束, 返回是否成功"""
+        self.finished.wait()
+        return self.succeeded
 
-def download_file(url: str, dest_folder: str, filename: str) -> Path | str | None:
+    def copy_into(self, file, offset: int):
+        """将 [offset, total_size) 部分从 .hedge 写入已打开的 .part 文件"""
+        with open(self.path, "rb") as src:
+            src.seek(offset - self.start)
+            file.seek(offset)
+            shutil.copyfileobj(src, file, HEDGE_COPY_CHUNK_SIZE)
+
+    def _remove_data(self):
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            log.debug(f"删除对冲下载数据失败: {e}")
+
+    def cancel(self):
+        """
+        停止对冲下载并删除 .hedge 文件
+
+        对冲线程只在两次读取之间检查停止标志, 读取停滞时可能要到读取超时才会退出;
+        此处最多等待 HEDGE_CANCEL_JOIN_SECONDS, 不阻塞已完成的下载, 未退出的对冲线程退出时自行删除 .hedge 文件
+        """
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join(HEDGE_CANCEL_JOIN_SECONDS)
+        self._remove_data()
+
+
+def _should_hedge(hedge_url: str, speed: float, remaining: int) -> bool:
+    """主连接速度低于下限, 或预计完成时间慢于下一个下载源的评分估算时进行对冲"""
+    # 限速时对冲只会分走同一份带宽
+    if remaining < DOWNLOAD_HEDGE_MIN_REMAINING_BYTES or network_limits.is_rate_limited:
+        return False
+    hedge_base = _base_of(hedge_url)
+    if not mirror_scoreboard.is_available(hedge_base):
+        return False
+    if speed < DOWNLOAD_HEDGE_MIN_BYTES_PER_SEC:
+        return True
+    return remaining / speed > mirror_scoreboard.expected_seconds(hedge_base, remaining)
+
+
+def download_file(
+    url: str,
+    dest_folder: str,
+    filename: str,
+    progress_cb: Callable[[int, int, str], None] = _report_progress,
+    hedge_url: str | None = None,
+) -> Path | str | None:
+    """
+    单连接下载文件, 支持断点续传
+
+    Args:
+        hedge_url: 备用下载源的完整 URL, 主连接过慢时从此处对冲下载剩余部分
+    """
     dest_path = Path(dest_folder) / filename
+    partial = _partial_for(url, filename)
+    key = digest_key(url, filename)
+    hedge: _HedgedTransfer | None = None
     log.info(f"正在从 {url} 下载 {filename}, 目标目录: {dest_path}")
 
     try:
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        if partial.load() and partial.is_complete:
+            log.info(f"{filename} 已在上次运行中下载完成")
+            digest = sha256_file(partial.part_path)
+            verify_digest(filename, digest, expectedDigests.get(key))
+            partial.finalize(dest_path)
+            downloadedDigests[key] = digest
+            return dest_path
 
-        downloadHeaders = {
-            "Accept-Encoding": "",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
-        }
-        with requests.get(url, stream=True, timeout=60, headers=downloadHeaders) as r:
+        offset = partial.contiguous_prefix()
+        headers = dict(DOWNLOAD_HEADERS)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if partial.etag:
+                headers["If-Range"] = partial.etag
+
+        request_start = time.monotonic()
+        with http_client.get(
+            url, stream=True, timeout=DOWNLOAD_TIMEOUT, headers=headers
+        ) as r:
             r.raise_for_status()
-            total_size = int(r.headers.get("content-length", 0))
+            ttfb = time.monotonic() - request_start
+            etag = r.headers.get("etag")
+            if r.status_code == 206:
+                total_size = _parse_content_range_total(
+                    r.headers.get("content-range", "")
+                )
+            else:
+                total_size = int(r.headers.get("content-length", 0))
+
+            if offset and (
+                r.status_code != 206 or not partial.matches(etag, total_size)
+            ):
+                log.warning(f"下载源不支持续传或文件已变化, 将从头下载 {filename}")
+                offset = 0
+            hasher = IncrementalHasher(partial.part_path)
+            if offset:
+                log.info(f"从 {offset / 1024 / 1024:.2f} MB 处继续下载 {filename}")
+                hasher.advance_to(offset)
+            else:
+                partial.reset(url, etag, total_size)
+            partial.url = url
+
             log.info(
                 f"文件大小: {total_size / 1024 / 1024:.2f} MB"
                 if total_size
                 else "文件大小: 未知"
             )
 
-            with open(dest_path, "wb") as f:
-                downloaded_size = 0
-                chunk_size = 8192
-                for chunk in r.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
+            can_hedge = bool(DOWNLOAD_HEDGE_ENABLED and hedge_url and total_size)
+            primary_failed = False
+            transfer_start = time.monotonic()
+            with open(partial.part_path, "r+b") as f:
+                f.seek(offset)
+                downloaded_size = offset
+                progress = ThrottledProgress(progress_cb)
+                stall_detector = _StallDetector()
+                last_save = time.monotonic()
+                try:
+                    for chunk in _iter_chunks(r):
+                        if chunk:
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            partial.add_range(
+                                downloaded_size, downloaded_size + len(chunk)
+                            )
+                            downloaded_size += len(chunk)
+                            progress(
+                                max(downloaded_size, hedge.position if hedge else 0),
+                                total_size,
+                                filename,
+                            )
+                            stall_detector.feed(len(chunk))
+                            if (
+                                time.monotonic() - last_save
+                                >= PARTIAL_SAVE_INTERVAL_SECONDS
+                            ):
+                                f.flush()
+                                partial.save()
+                                last_save = time.monotonic()
+                            if hedge:
+                                if hedge.succeeded:
+                                    break
+                            elif (
+                                can_hedge
+                                and time.monotonic() - transfer_start
+                                >= DOWNLOAD_HEDGE_AFTER_SECONDS
+                            ):
+                                can_hedge = False
+                                speed = (downloaded_size - offset) / (
+                                    time.monotonic() - transfer_start
+                                )
+                                if _should_hedge(
+                                    hedge_url, speed, total_size - downloaded_size
+                                ):
+                                    hedge = _HedgedTransfer(
+                                        hedge_url, partial, downloaded_size, etag
+                                    )
+                                    hedge.begin()
+                except requests.exceptions.RequestException as e:
+                    # 主连接失败时, 若对冲下载仍在进行则由其完成剩余部分
+                    if not hedge or (hedge.finished.is_set() and not hedge.succeeded):
+                        raise
+                    log.warning(f"从 {_get_host(url)} 下载失败, 等待对冲下载完成: {e}")
+                    primary_failed = True
+                    while not hedge.finished.wait(0.1):
+                        progress(hedge.position, total_size, filename)
+                    if not hedge.succeeded:
+                        raise
+                finally:
+                    f.flush()
+                    partial.save()
 
-                        callbackFuncName = (
-                            typeDefs.lifecycle.GLOBAL_CALLBACKS.REPORT_DOWNLOAD_PROGRESS.value
-                        )
-                        if callbackFuncName in lifecycleMgr.callbacks.keys():
-                            if lifecycleMgr.callbacks[callbackFuncName]:
-                                lifecycleMgr.callbacks[callbackFuncName](
-                                    downloaded_size, total_size, f.name.split("\\")[-1]
-                                )  # type: ignore
+                primary_size = downloaded_size - offset
+                if hedge and hedge.succeeded and downloaded_size < total_size:
+                    log.info(
+                        f"对冲下载源 {_get_host(hedge_url)} 先完成, 已取消 {_get_host(url)} 上的下载"
+                    )
+                    hedge.copy_into(f, downloaded_size)
+                    f.flush()
+                    partial.add_range(downloaded_size, total_size)
+                    partial.save()
+                    downloaded_size = total_size
+                    hasher.advance_to(total_size)
+                    progress(downloaded_size, total_size, filename)
+                progress.flush()
+
+        if total_size and downloaded_size < total_size:
+            raise requests.exceptions.ChunkedEncodingError(
+                f"连接在下载完成前关闭 ({downloaded_size} / {total_size} 字节)"
+            )
 
+        digest = hasher.hexdigest()
+        verify_digest(filename, digest, expectedDigests.get(key))
+        if primary_failed:
+            mirror_scoreboard.record_failure(_base_of(url))
+        else:
+            mirror_scoreboard.record_success(
+                _base_of(url),
+                ttfb,
+                primary_size,
+                time.monotonic() - transfer_start,
+            )
+        partial.finalize(dest_path)
+        downloadedDigests[key] = digest
         log.success(f"文件 {filename} 下载成功。")
         return dest_path
+    except ChecksumMismatchError as e:
+        log.error(f"{e}, 已丢弃下载数据")
+        mirror_scoreboard.record_failure(_base_of(url))
+        partial.discard()
+        return None
     except requests.exceptions.RequestException as e:
         log.error(f"下载文件 {filename} 时发生网络错误: {e}")
-        if dest_path.exists():
-            os.remove(dest_path)
+        mirror_scoreboard.record_failure(_base_of(url))
+        if partial.bytes_written:
+            log.info(
+                f"已保留 {partial.bytes_written / 1024 / 1024:.2f} MB 下载数据, 将在下次尝试时续传"
+            )
         return None
     except Exception as e:
         if "INSTALLATION_CANCELLED" in str(e):
             return "DL_CANCEL"
         log.error(f"写入文件 {filename} 时发生意外错误: {e}")
-        if dest_path.exists():
-            os.remove(dest_path)
+        partial.discard()
         return None
+    finally:
+        if hedge:
+            hedge.cancel()
 
 
-async def test_download_source_speed(
-    base_url: str, test_filename: str = None
+class _Segment:
+    """分段下载中的一个字节区间 [start, end), pos 为已写入位置"""
+
+    __slots__ = ("start", "end", "pos")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+        self.pos = start
+
+    @property
+    def remaining(self) -> int:
+        return max(self.end - self.pos, 0)
+
+
+class SegmentedDownload:
+    """
+    基于 HTTP Range 的多下载源分段并行下载
+
+    文件被切分为若干分段放入共享队列, 每个下载源对应若干工作线程, 从队列中领取分段。
+    队列耗尽后, 空闲线程会将仍在进行中、剩余量最大的分段对半拆分并接管后半部分,
+    从而把慢速下载源上的剩余数据重新分配给较快的下载源。
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        partial: PartialDownload,
+        filename: str,
+        progress_cb: Callable[[int, int, str], None] = _report_progress,
+    ):
+        self.urls = urls
+        self.partial = partial
+        self.total_size = partial.total_size
+        self.filename = filename
+        self.progress_cb = progress_cb
+
+        self._lock = threading.Lock()
+        self._done_event = threading.Event()
+        self._stop_event = threading.Event()
+        # 仅为尚未写入的区间创建分段, 以便从上次中断处继续
+        self._pending: deque[_Segment] = deque(
+            _Segment(start, min(start + SEGMENT_SIZE_BYTES, missing_end))
+            for missing_start, missing_end in partial.missing_ranges()
+            for start in range(missing_start, missing_end, SEGMENT_SIZE_BYTES)
+        )
+        self._active: list[_Segment] = []
+        self._downloaded_size = partial.bytes_written
+        self._alive_workers = 0
+        self._hasher = IncrementalHasher(partial.part_path)
+
+    def _next_segment(self) -> _Segment | None:
+        with self._lock:
+            if self._pending:
+                segment = self._pending.popleft()
+                self._active.append(segment)
+                return segment
+
+            if not self._active:
+                return None
+
+            victim = max(self._active, key=lambda seg: seg.remaining)
+            if victim.remaining < SEGMENT_MIN_SPLIT_BYTES * 2:
+                return None
+            mid = victim.pos + victim.remaining // 2
+            segment = _Segment(mid, victim.end)
+            victim.end = mid
+            self._active.append(segment)
+            return segment
+
+    def _release_segment(self, segment: _Segment, finished: bool):
+        with self._lock:
+            if segment in self._active:
+                self._active.remove(segment)
+            if not finished and segment.remaining > 0:
+                self._pending.appendleft(_Segment(segment.pos, segment.end))
+
+    def _fetch_segment(self, url: str, segment: _Segment, file):
+        headers = dict(DOWNLOAD_HEADERS)
+        headers["Range"] = f"bytes={segment.pos}-{segment.end - 1}"
+        stall_detector = _StallDetector()
+        request_start = time.monotonic()
+        with http_client.get(
+            url, stream=True, timeout=DOWNLOAD_TIMEOUT, headers=headers
+        ) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise requests.exceptions.InvalidHeader(
+                    f"下载源未返回分段内容 (HTTP {r.status_code})"
+                )
+            # 多个下载源写入同一个 .part 文件, 区间或文件版本不一致时必须丢弃, 交由其他下载源重试
+            content_range = r.headers.get("content-range", "")
+            if (
+                _parse_content_range_start(content_range) != segment.pos
+                or _parse_content_range_total(content_range) != self.total_size
+            ):
+                raise requests.exceptions.InvalidHeader(
+                    f"下载源返回的区间与请求不一致: {content_range!r}"
+                )
+            etag = r.headers.get("etag")
+            if self.partial.etag and etag and etag != self.partial.etag:
+                raise requests.exceptions.InvalidHeader("下载源上的文件与其他下载源不一致")
+            transfer_start = time.monotonic()
+            ttfb = transfer_start - request_start
+            fetched_size = 0
+            for chunk in _iter_chunks(r):
+                if self._stop_event.is_set():
+                    return False
+                if not chunk:
+                    continue
+                with self._lock:
+                    # 分段可能已被其他线程拆分, 只写入仍归属于本分段的部分
+                    offset = segment.pos
+                    allowed = segment.remaining
+                    data = chunk[:allowed]
+                    segment.pos += len(data)
+                    self._downloaded_size += len(data)
+                if data:
+                    file.seek(offset)
+                    file.write(data)
+                    fetched_size += len(data)
+                    with self._lock:
+                        self.partial.add_range(offset, offset + len(data))
+                if segment.remaining == 0:
+                    break
+                stall_detector.feed(len(chunk))
+        # 连接在分段结束前关闭时由 _worker 记为失败, 此处不能再记一次成功, 否则连续失败计数会被重置
+        if segment.remaining > 0:
+            return False
+        mirror_scoreboard.record_success(
+            _base_of(url), ttfb, fetched_size, time.monotonic() - transfer_start
+        )
+        return True
+
+    def _worker(self, url: str):
+        failures = 0
+        try:
+            # 无缓冲写入, 保证 sidecar 记录的区间均已真正写入 .part
+            with open(self.partial.part_path, "r+b", buffering=0) as f:
+                while not self._stop_event.is_set():
+                    segment = self._next_segment()
+                    if segment is None:
+                        return
+                    finished = False
+                    try:
+                        finished = self._fetch_segment(url, segment, f)
+                        if not finished and not self._stop_event.is_set():
+                            raise requests.exceptions.ChunkedEncodingError(
+                                "连接在分段结束前关闭"
+                            )
+                        failures = 0
+                    except requests.exceptions.RequestException as e:
+                        failures += 1
+                        mirror_scoreboard.record_failure(_base_of(url))
+                        log.warning(
+                            f"从 {_get_host(url)} 下载分段 {segment.pos}-{segment.end} 失败 ({failures}/{SEGMENTED_MIRROR_MAX_FAILURES}): {e}"
+                        )
+                    finally:
+                        self._release_segment(segment, finished)
+                    if failures >= SEGMENTED_MIRROR_MAX_FAILURES:
+                        log.warning(f"下载源 {_get_host(url)} 失败次数过多, 已停用")
+                        return
+        except Exception as e:
+            log.error(f"分段下载线程发生意外错误 ({_get_host(url)}): {e}")
+        finally:
+            with self._lock:
+                self._alive_workers -= 1
+                if self._alive_workers == 0:
+                    self._done_event.set()
+
+    def run(self) -> bool:
+        workers = []
+        for url in self.urls:
+            for _ in range(SEGMENTED_CONNECTIONS_PER_MIRROR):
+                workers.append(threading.Thread(target=self._worker, args=(url,), daemon=True))
+        self._alive_workers = len(workers)
+        for worker in workers:
+            worker.start()
+
+        try:
+            # 进度回报在调用线程中进行, 以便取消异常能正常向上传播
+            last_save = time.monotonic()
+            while not self._done_event.wait(0.1):
+                self.progress_cb(self._downloaded_size, self.total_size, self.filename)
+                with self._lock:
+                    contiguous_size = self.partial.contiguous_prefix()
+                self._hasher.advance_to(contiguous_size)
+                if time.monotonic() - last_save >= PARTIAL_SAVE_INTERVAL_SECONDS:
+                    with self._lock:
+                        self.partial.save()
+                    last_save = time.monotonic()
+        finally:
+            self._stop_event.set()
+            for worker in workers:
+                worker.join()
+            self.partial.save()
+
+        with self._lock:
+            remaining = sum(seg.remaining for seg in self._pending) + sum(
+                seg.remaining for seg in self._active
+            )
+        self.progress_cb(self._downloaded_size, self.total_size, self.filename)
+        return remaining == 0
+
+    def hexdigest(self) -> str:
+        """下载完成后文件的 SHA-256"""
+        self._hasher.advance_to(self.total_size)
+        return self._hasher.hexdigest()
+
+
+def _probe_range_support(url: str) -> Tuple[int, bool, str | None]:
+    """
+    使用 Range: bytes=0-0 请求探测文件大小以及下载源是否支持分段下载
+
+    Returns:
+        (文件大小, 是否支持 Range, ETag)
+    """
+    headers = dict(DOWNLOAD_HEADERS)
+    headers["Range"] = "bytes=0-0"
+    with http_client.get(url, stream=True, timeout=15, headers=headers) as r:
+        r.raise_for_status()
+        etag = r.headers.get("etag")
+        if r.status_code == 206:
+            total = _parse_content_range_total(r.headers.get("content-range", ""))
+            if total:
+                return total, True, etag
+        return int(r.headers.get("content-length", 0)), False, etag
+
+
+def download_file_segmented(
+    urls: List[str],
+    dest_folder: str,
+    filename: str,
+    progress_cb: Callable[[int, int, str], None] = _report_progress,
+) -> Path | str | None:
+    """
+    从多个下载源分段并行下载同一个文件
+
+    Args:
+        urls: 按优先级排序的完整文件 URL 列表
+        dest_folder: 目标目录
+        filename: 文件名
+        progress_cb: 进度回调, 默认回报给全局生命周期回调
+
+    Returns:
+        下载成功时返回文件路径, 取消时返回 "DL_CANCEL", 失败时返回 None
+    """
+    dest_path = Path(dest_folder) / filename
+    partial = _partial_for(urls[0], filename)
+    key = digest_key(urls[0], filename)
+
+    total_size = 0
+    supports_range = False
+    etag = None
+    for index, url in enumerate(urls):
+        try:
+            total_size, supports_range, etag = _probe_range_support(url)
+            break
+        except requests.exceptions.RequestException as e:
+            log.warning(f"探测下载源 {_get_host(url)} 失败: {e}")
+    else:
+        return None
+
+    if not supports_range or total_size < SEGMENTED_MIN_FILE_SIZE:
+        log.info(f"{filename} 不满足分段下载条件, 使用单连接下载")
+        hedge_url = urls[index + 1] if index + 1 < len(urls) else None
+        return download_file(url, dest_folder, filename, progress_cb, hedge_url)
+
+    log.info(
+        f"正在从 {len(urls)} 个下载源分段下载 {filename}, 文件大小: {total_size / 1024 / 1024:.2f} MB"
+    )
+    try:
+        if partial.load() and partial.matches(etag, total_size):
+            log.info(
+                f"发现未完成的下载, 已完成 {partial.bytes_written / 1024 / 1024:.2f} MB, 继续下载 {filename}"
+            )
+            partial.total_size = total_size
+        else:
+            partial.reset(url, etag, total_size)
+
+        task = SegmentedDownload(urls, partial, filename, progress_cb)
+        if task.run():
+            digest = task.hexdigest()
+            verify_digest(filename, digest, expectedDigests.get(key))
+            partial.finalize(dest_path)
+            downloadedDigests[key] = digest
+            log.success(f"文件 {filename} 下载成功。")
+            return dest_path
+        log.error(f"分段下载 {filename} 未能完成, 所有下载源均已失败")
+    except ChecksumMismatchError as e:
+        log.error(f"{e}, 已丢弃下载数据")
+        partial.discard()
+    except Exception as e:
+        if "INSTALLATION_CANCELLED" in str(e):
+            return "DL_CANCEL"
+        log.error(f"分段下载 {filename} 时发生意外错误: {e}")
+        partial.discard()
+
+    return None
+
+
+def _measure_source_throughput(
+    base_url: str, test_filename: str
 ) -> Tuple[str, float, bool]:
-    test_url = f"{base_url}/{desiredTag}/{AURA_FILENAME}" if test_filename else base_url
+    test_url = f"{base_url}/{desiredTag}/{test_filename}"
+    headers = dict(DOWNLOAD_HEADERS)
+    headers["Range"] = f"bytes=0-{MIRROR_PROBE_BYTES - 1}"
 
     try:
-        start_time = time.time()
+        start_time = time.monotonic()
+        with http_client.get(
+            test_url, stream=True, timeout=PROBE_TIMEOUT, headers=headers
+        ) as response:
+            if response.status_code not in (200, 206):
+                mirror_scoreboard.record_failure(base_url)
+                return (base_url, float("inf"), False)
+            ttfb = time.monotonic() - start_time
+            asset_size = _parse_content_range_total(
+                response.headers.get("content-range", "")
+            ) or int(response.headers.get("content-length", 0))
 
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=10)
-        ) as session:
-            async with session.head(test_url) as response:
-                if response.status == 200:
-                    response_time = time.time() - start_time
-                    return (base_url, response_time, True)
-                else:
-                    return (base_url, float("inf"), False)
+            transfer_start = time.monotonic()
+            received = 0
+            # 206 响应完整读完后连接会回到连接池, 供随后的下载复用
+            for chunk in response.iter_content(64 * 1024):
+                received += len(chunk)
+                if response.status_code == 200 and received >= MIRROR_PROBE_BYTES:
+                    break
+            transfer_seconds = max(time.monotonic() - transfer_start, 1e-3)
 
+        throughput = received / transfer_seconds
+        mirror_scoreboard.record_success(base_url, ttfb, received, transfer_seconds)
+        expected_seconds = ttfb + (
+            asset_size or MIRROR_SCORE_REFERENCE_BYTES
+        ) / max(throughput, 1)
+        log.debug(
+            f"下载源 {_get_host(base_url)} 首字节 {ttfb:.2f}s, 速度 {throughput / 1024:.0f} KB/s, 预计 {expected_seconds:.1f}s"
+        )
+        return (base_url, expected_seconds, True)
     except Exception as e:
         log.warning(f"测速失败 {base_url}: {e}")
+        mirror_scoreboard.record_failure(base_url)
         return (base_url, float("inf"), False)
 
 
+async def test_download_source_throughput(
+    base_url: str, test_filename: str = AURA_FILENAME
+) -> Tuple[str, float, bool]:
+    """
+    下载资源文件开头的 MIRROR_PROBE_BYTES 字节, 分别测量首字节时间与吞吐量
+
+    Returns:
+        (下载源, 按文件实际大小估算的完成时间, 是否可用)
+    """
+    return await asyncio.to_thread(_measure_source_throughput, base_url, test_filename)
+
+
+def _measure_source_latency(base_url: str, test_url: str) -> Tuple[str, float, bool]:
+    try:
+        start_time = time.time()
+        response = http_client.head(test_url, timeout=PROBE_TIMEOUT)
+        if response.status_code == 200:
+            response_time = time.time() - start_time
+            mirror_scoreboard.record_success(base_url, response_time)
+            return (base_url, response_time, True)
+        else:
+            mirror_scoreboard.record_failure(base_url)
+            return (base_url, float("inf"), False)
+
+    except Exception as e:
+        log.warning(f"测速失败 {base_url}: {e}")
+        mirror_scoreboard.record_failure(base_url)
+        return (base_url, float("inf"), False)
+
+
+async def test_download_source_speed(
+    base_url: str, test_filename: str = None
+) -> Tuple[str, float, bool]:
+    test_url = f"{base_url}/{desiredTag}/{AURA_FILENAME}" if test_filename else base_url
+    return await asyncio.to_thread(_measure_source_latency, base_url, test_url)
+
+
+def _probe_func():
+    return (
+        test_download_source_throughput
+        if MIRROR_PROBE_MODE == "range"
+        else test_download_source_speed
+    )
+
+
 async def benchmark_download_sources(tag_name: str) -> List[str]:
-    log.info("正在测试下载源速度...")
+    """
+    对全部下载源测量响应时间, 用于在后台刷新评分数据
+
+    无论 MIRROR_PROBE_MODE 如何均只发出 HEAD 请求, 不下载数据, 以免与正在进行的下载争抢带宽;
+    吞吐量数据来自实际下载以及首次运行时的竞速测速 (见 race_download_sources)
+    """
+    log.info("正在测试下载源响应时间...")
 
     tasks = [
-        test_download_source_speed(url, AURA_FILENAME) for url in BASE_DOWNLOAD_URLS
+        test_download_source_speed(url, AURA_FILENAME)
+        for url in BASE_DOWNLOAD_URLS
+        if mirror_scoreboard.is_available(url)
     ]
     results = await asyncio.gather(*tasks)
 
@@ -121,34 +975,187 @@ async def benchmark_download_sources(tag_name: str) -> List[str]:
     return sorted_urls if sorted_urls else BASE_DOWNLOAD_URLS
 
 
-def download_file_multi_sources(
-    filename: str, dest_folder: str, use_speed_optimization: bool = True
-) -> Path | None:
+_background_probe: concurrent.futures.Future | None = None
+
+
+def _start_background_probe():
+    """在后台以 HEAD 请求重新测速, 仅用于更新评分数据"""
+    global _background_probe
+    if _background_probe and not _background_probe.done():
+        return
+
+    log.info("下载源评分数据已过期, 将在后台重新测速")
+    _background_probe = asyncio.run_coroutine_threadsafe(
+        benchmark_download_sources(desiredTag), get_background_loop()
+    )
+    _background_probe.add_done_callback(lambda _: mirror_scoreboard.save())
+
+
+def race_download_sources() -> List[str]:
     """
-    尝试从多个下载源下载文件
+    并发测速, 按完成顺序处理结果
+
+    已有 MIRROR_RACE_QUORUM 个下载源可用, 或达到 MIRROR_RACE_DEADLINE_SECONDS 时立即返回;
+    截止时仍无可用下载源则继续等待第一个可用结果。尚未完成的测速在后台继续运行,
+    其结果仅写入评分板。
+
+    Returns:
+        可用下载源按预计完成时间排序, 其后为尚未返回结果的下载源
     """
-    global desiredTag
+    log.info("正在测试下载源速度...")
+    probe = _probe_func()
+    loop = get_background_loop()
+    futures = {
+        asyncio.run_coroutine_threadsafe(probe(url, AURA_FILENAME), loop): url
+        for url in BASE_DOWNLOAD_URLS
+        if mirror_scoreboard.is_available(url)
+    }
+    available_sources: list[tuple[str, float]] = []
+    answered: set[str] = set()
+
+    def collect(timeout: float | None, quorum: int):
+        for future in concurrent.futures.as_completed(futures, timeout=timeout):
+            url, score, available = future.result()
+            answered.add(url)
+            if available:
+                available_sources.append((url, score))
+                if len(available_sources) >= quorum:
+                    return
+
+    try:
+        collect(MIRROR_RACE_DEADLINE_SECONDS, MIRROR_RACE_QUORUM)
+    except concurrent.futures.TimeoutError:
+        log.info(
+            f"测速已达截止时间 ({MIRROR_RACE_DEADLINE_SECONDS}s), {len(available_sources)} 个下载源可用"
+        )
+        if not available_sources:
+            # 各测速请求自带超时, 此处不会无限等待
+            collect(None, 1)
+
+    pending = []
+    for future, url in futures.items():
+        if not future.done():
+            pending.append(url)
+        elif url not in answered:
+            # 已完成但未被处理的测速结果同样纳入排序
+            _, score, available = future.result()
+            if available:
+                available_sources.append((url, score))
+    if pending:
+        log.debug(f"{len(pending)} 个下载源的测速将在后台继续")
+        for future in futures:
+            if not future.done():
+                future.add_done_callback(lambda _: mirror_scoreboard.save())
+
+    available_sources.sort(key=lambda x: x[1])
+    for url, score in available_sources[:3]:
+        log.info(f"下载源 {_get_host(url)} 预计完成时间: {score:.2f}s")
+
+    sorted_urls = [url for url, _ in available_sources]
+    sorted_urls += sorted(pending, key=mirror_scoreboard.expected_seconds)
+    return sorted_urls if sorted_urls else BASE_DOWNLOAD_URLS
+
+
+def rank_download_sources() -> List[str]:
+    """
+    对下载源进行排序
+
+    已配置的局域网设备始终排在最前; 评分板中已有数据时直接按评分排序 (数据过期时在后台重新测速),
+    首次运行没有评分数据时竞速测速 (见 race_download_sources), 失败时返回默认顺序
+    """
+    if lan_peers:
+        log.info(f"将优先从局域网设备下载: {', '.join(lan_peers)}")
+    return lan_peers + _rank_mirrors()
+
+
+def spread_sources(download_urls: List[str], index: int) -> List[str]:
+    """
+    多文件并发时第 index 个文件使用的下载源顺序
+
+    启用 CONCURRENT_DOWNLOAD_SPREAD_MIRRORS 时将公网下载源轮转 index 位, 使各文件落在不同的下载源上;
+    局域网设备不参与轮转, 始终排在最前
+    """
+    peers = [url for url in download_urls if is_peer_url(url)]
+    mirrors = [url for url in download_urls if not is_peer_url(url)]
+    if not CONCURRENT_DOWNLOAD_SPREAD_MIRRORS or not mirrors:
+        return download_urls
+    shift = index % len(mirrors)
+    return peers + mirrors[shift:] + mirrors[:shift]
+
+
+def _rank_mirrors() -> List[str]:
+    if mirror_scoreboard.has_data(BASE_DOWNLOAD_URLS):
+        if mirror_scoreboard.is_stale(BASE_DOWNLOAD_URLS):
+            _start_background_probe()
+        download_urls = mirror_scoreboard.rank(BASE_DOWNLOAD_URLS)
+        log.info(
+            f"已按下载源评分排序, 首选下载源: {', '.join(_get_host(url) for url in download_urls[:3])}"
+        )
+        return download_urls
 
     download_urls = BASE_DOWNLOAD_URLS
+    try:
+        optimized_urls = race_download_sources()
 
-    if use_speed_optimization and desiredTag:
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            optimized_urls = loop.run_until_complete(
-                benchmark_download_sources(desiredTag)
-            )
-            loop.close()
+        if optimized_urls:
+            download_urls = optimized_urls
+            log.info("测速完成, 将按测速顺序进行下载")
+    except Exception as e:
+        log.warning(f"测速失败, 使用默认顺序: {e}")
+    return download_urls
 
-            if optimized_urls:
-                download_urls = optimized_urls
-                log.info("测速完成, 将按测速顺序进行下载")
-        except Exception as e:
-            log.warning(f"测速失败, 使用默认顺序: {e}")
 
-    for base_url in download_urls:
-        url = f"{base_url}/{desiredTag}/{filename}"
-        result = download_file(url, dest_folder, filename)
+def prewarm_connections():
+    """
+    预先建立到评分最高的几个下载源及 GitHub API 的连接
+
+    在用户选择版本期间完成 DNS 解析与 TLS 握手, 开始安装后的测速与下载直接复用这些连接。
+    """
+    if not HTTP_PREWARM_ENABLED:
+        return
+    download_urls = (
+        lan_peers + mirror_scoreboard.rank(BASE_DOWNLOAD_URLS)[:HTTP_PREWARM_MIRRORS]
+    )
+    log.info(
+        f"正在预热到 {', '.join(_get_host(url) for url in download_urls)} 的连接"
+    )
+    http_client.prewarm(download_urls + [GITHUB_API_URL])
+
+
+def download_from_urls(
+    urls: List[str],
+    dest_folder: str,
+    filename: str,
+    progress_cb: Callable[[int, int, str], None] = _report_progress,
+) -> Path | None:
+    """
+    依次尝试分段下载与逐个下载源单连接下载
+
+    局域网设备可用时只从局域网设备分段下载, 不再将分段分摊到公网下载源;
+    局域网设备均不可用或下载失败后, 再从公网下载源分段下载
+
+    Args:
+        urls: 按优先级排序的完整文件 URL 列表
+    """
+    if SEGMENTED_DOWNLOAD_ENABLED:
+        peer_urls = [url for url in urls if is_peer_url(url)]
+        mirror_urls = [url for url in urls if not is_peer_url(url)]
+        for group in (peer_urls, mirror_urls):
+            if not group:
+                continue
+            result = download_file_segmented(
+                group[:SEGMENTED_MAX_MIRRORS], dest_folder, filename, progress_cb
+            )
+            if result == "DL_CANCEL":
+                log.warning("下载已取消")
+                return None
+            elif result:
+                return result  # type: ignore
+        log.warning("分段下载失败, 尝试逐个下载源下载...")
+
+    for index, url in enumerate(urls):
+        hedge_url = urls[index + 1] if index + 1 < len(urls) else None
+        result = download_file(url, dest_folder, filename, progress_cb, hedge_url)
         if result == "DL_CANCEL":
             log.warning("下载已取消")
             return None
@@ -160,27 +1167,135 @@ def download_file_multi_sources(
     return None
 
 
-def unzip_file(zip_path: Path, extract_to: Path) -> bool:
+def download_file_multi_sources(
+    filename: str,
+    dest_folder: str,
+    use_speed_optimization: bool = True,
+    download_urls: List[str] | None = None,
+    progress_cb: Callable[[int, int, str], None] = _report_progress,
+) -> Path | None:
+    """
+    尝试从多个下载源下载文件
+
+    Args:
+        download_urls: 已排序的下载源列表, 提供时跳过测速
+    """
+    if download_urls is None:
+        download_urls = BASE_DOWNLOAD_URLS
+        if use_speed_optimization and desiredTag:
+            download_urls = rank_download_sources()
+
+    return download_from_urls(
+        [f"{base_url}/{desiredTag}/{filename}" for base_url in download_urls],
+        dest_folder,
+        filename,
+        progress_cb,
+    )
+
+
+def _load_expected_digests(filenames: List[str], download_urls: List[str]):
+    """获取尚未记录的期望 SHA-256, 写入 expectedDigests"""
+    if not DOWNLOAD_VERIFY_SHA256 or not desiredTag:
+        return
+    missing_files = [
+        filename for filename in filenames if f"{desiredTag}/{filename}" not in expectedDigests
+    ]
+    if not missing_files:
+        return
+    expectedDigests.update(
+        {
+            f"{desiredTag}/{filename}": digest
+            for filename, digest in fetch_expected_digests(
+                desiredTag, missing_files, download_urls
+            ).items()
+        }
+    )
+
+
+def download_files_concurrently(
+    filenames: List[str],
+    dest_folder: str,
+    download_urls: List[str] | None = None,
+) -> List[Path | None]:
+    """
+    通过后台下载服务同时下载多个文件, 共用一次测速结果, 并合并回报下载进度
+
+    启用 CONCURRENT_DOWNLOAD_SPREAD_MIRRORS 时, 第 i 个文件从排名第 i 的下载源开始,
+    使各文件尽量落在不同的下载源上以叠加带宽。
+
+    Args:
+        download_urls: 已排序的下载源列表, 提供时跳过测速
+
+    Returns:
+        与 filenames 一一对应的下载结果, 失败的文件对应 None
+    """
+    if download_urls is None:
+        download_urls = rank_download_sources()
+    _load_expected_digests(filenames, download_urls)
+    progress = CombinedProgress(filenames)
+
+    futures = []
+    for index, filename in enumerate(filenames):
+        job = DownloadJob(
+            [
+                f"{base_url}/{desiredTag}/{filename}"
+                for base_url in spread_sources(download_urls, index)
+            ],
+            dest_folder,
+            filename,
+            priority=PRIORITY_INSTALL,
+            progress_cb=progress.file_callback(filename),
+        )
+        futures.append(download_service.submit(job))
+    results = [future.result() for future in futures]
+    mirror_scoreboard.save()
+    if all(results):
+        progress.flush()
+    return results
+
+
+def unzip_file(
+    zip_path: Path,
+    extract_to: Path,
+    progress_cb: Callable[[int, int, str], None] | None = None,
+    root_names: Collection[str] = (),
+) -> bool:
+    """
+    并行解压本地 ZIP 文件
+
+    Args:
+        zip_path: ZIP 文件路径
+        extract_to: 目标目录
+        progress_cb: 进度回调, 按已解压的压缩数据字节数回报
+        root_names: 允许去除的外层目录名称, 目录结构在写入任何文件前即完成检查
+    """
     log.info(f"正在解压 {zip_path.name}, 目标目录: {extract_to}")
+    reporter = ThrottledProgress(progress_cb) if progress_cb else None
     try:
-        extract_to.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            zf.extractall(extract_to)
+        extract_zip(zip_path, extract_to, reporter, root_names)
+        if reporter:
+            reporter.flush()
         log.success(f"解压 {zip_path.name} 成功。")
         return True
-    except zipfile.BadZipFile:
-        log.error(f"解压时发生错误: {zip_path.name} 不是一个有效的 ZIP 文件。")
+    except ZipLayoutError as e:
+        log.error(f"解压时发生错误: {zip_path.name} 结构不正确: {e}")
+        return False
+    except ZipFormatError as e:
+        log.error(f"解压时发生错误: {zip_path.name} 不是一个有效的 ZIP 文件或已损坏: {e}")
         return False
     except Exception as e:
         log.error(f"解压时发生错误: 文件名称: {zip_path.name} | 错误: {e}")
         return False
 
 
-def download_release_files(tagName) -> tuple[Path | None, Path | None]:
-    log.info(f"准备下载 HugoAura 资源文件...")
-
+def _prepare_release_download(tagName) -> Path | None:
+    """重置本次下载的状态并重建临时文件夹, 失败时返回 None"""
     global desiredTag
     desiredTag = tagName
+    expectedDigests.clear()
+    downloadedDigests.clear()
+    # 未完成的下载保存在 PARTIAL_DOWNLOAD_DIR 中, 清理临时文件夹不会影响续传
+    cleanup_stale_partials()
     temp_dir = Path(TEMP_INSTALL_DIR)
     if temp_dir.exists():
         log.info(f"正在清理旧的临时文件夹: {temp_dir}")
@@ -188,7 +1303,7 @@ def download_release_files(tagName) -> tuple[Path | None, Path | None]:
             shutil.rmtree(temp_dir)
         except OSError as e:
             log.error(f"清理失败 {temp_dir}, 请确保当前用户有 %TEMP% 的写入权限: {e}")
-            return None, None
+            return None
     try:
         temp_dir.mkdir(parents=True, exist_ok=True)
         log.info(f"成功创建临时文件夹: {temp_dir}")
@@ -196,16 +1311,213 @@ def download_release_files(tagName) -> tuple[Path | None, Path | None]:
         log.error(
             f"未能创建临时文件夹 {temp_dir}, 错误信息: {e} | 请确保当前用户有 %TEMP% 的写入权限"
         )
-        return None, None
+        return None
+    return temp_dir
+
+
+def extract_files_remote(
+    filenames: List[str],
+    extract_dirs: dict[str, Path],
+    download_urls: List[str] | None = None,
+) -> List[str]:
+    """
+    通过远程 ZIP 读取器直接将资源文件解压到目标目录, 各文件作为后台下载服务的任务同时进行并合并回报进度
+
+    Args:
+        download_urls: 已排序的下载源列表, 提供时跳过测速
+
+    Returns:
+        远程解压失败的文件名列表 (其解压目录已被清理)
+    """
+    if download_urls is None:
+        download_urls = rank_download_sources()
+    progress = CombinedProgress(filenames)
+
+    def extract(filename: str, progress_cb: Callable[[int, int, str], None]) -> bool:
+        remote_zip = RemoteZip(
+            urls_by_file[filename],
+            filename,
+            DOWNLOAD_HEADERS,
+            progress_cb,
+            zip_root_names(filename),
+        )
+        try:
+            remote_zip.open()
+            remote_zip.extract(extract_dirs[filename])
+            return True
+        except (RemoteZipError, requests.exceptions.RequestException, OSError) as e:
+            log.warning(f"远程解压 {filename} 失败, 将完整下载后解压: {e}")
+            shutil.rmtree(extract_dirs[filename], ignore_errors=True)
+            return False
+
+    urls_by_file = {
+        filename: [
+            f"{base_url}/{desiredTag}/{filename}"
+            for base_url in spread_sources(download_urls, index)
+        ]
+        for index, filename in enumerate(filenames)
+    }
+    futures = [
+        download_service.submit(
+            RemoteZipJob(
+                urls_by_file[filename],
+                filename,
+                lambda progress_cb, name=filename: extract(name, progress_cb),
+                priority=PRIORITY_INSTALL,
+                progress_cb=progress.file_callback(filename),
+            )
+        )
+        for filename in filenames
+    ]
+    results = [future.result() for future in futures]
+    mirror_scoreboard.save()
+    if all(results):
+        progress.flush()
+    return [name for name, ok in zip(filenames, results) if not ok]
+
 
-    downloaded_core_path = download_file_multi_sources(CORE_FILENAME, str(temp_dir))
-    if not downloaded_core_path:
-        log.critical("下载 core.zip 时发生错误, 安装进程终止。")
-        return None, None
+def _can_extract_remotely(tag: str, filename: str) -> bool:
+    """
+    是否可以远程解压该文件
+
+    远程解压不在本地保存完整文件, 结果既无法存入资源缓存 (也就无法离线重装、回滚或供局域网设备下载),
+    也无法校验整个文件的 SHA-256 (各条目的 CRC32 只能发现损坏, 不能发现被篡改的下载源),
+    因此仅在这两项本就不适用时使用: 该版本不进入资源缓存, 且没有可用的期望 SHA-256
+    """
+    return (
+        REMOTE_ZIP_EXTRACT_ENABLED
+        and not artifact_cache.is_cacheable(tag)
+        and f"{tag}/{filename}" not in expectedDigests
+    )
 
-    downloaded_zip_path = download_file_multi_sources(AURA_FILENAME, str(temp_dir))
-    if not downloaded_zip_path:
-        log.critical("下载 aura.zip 时发生错误, 安装进程终止。")
-        return downloaded_core_path, None
 
-    return downloaded_core_path, downloaded_zip_path
+def extract_release_files(tagName, extract_dirs: dict[str, Path]) -> bool:
+    """
+    获取资源文件并解压到各自的目标目录
+
+    本地资源缓存命中的文件直接从缓存解压; 其余文件完整下载 (分段 / 续传 / 对冲)、校验 SHA-256
+    并存入资源缓存后再解压。满足 _can_extract_remotely 的文件改为边下载边解压,
+    远程解压失败时同样回退为完整下载。
+
+    Args:
+        tagName: 版本标签
+        extract_dirs: 文件名 -> 解压目标目录
+
+    Returns:
+        是否全部成功
+    """
+    log.info("准备获取 HugoAura 资源文件...")
+
+    temp_dir = _prepare_release_download(tagName)
+    if not temp_dir:
+        return False
+
+    pending_files = []
+    for filename, extract_to in extract_dirs.items():
+        cached_path = artifact_cache.lookup(tagName, filename, str(temp_dir))
+        if not cached_path:
+            pending_files.append(filename)
+        elif not unzip_file(cached_path, extract_to, root_names=zip_root_names(filename)):
+            return False
+    if not pending_files:
+        return True
+
+    # 测速与期望 SHA-256 只获取一次, 远程解压与完整下载共用
+    download_urls = rank_download_sources()
+    _load_expected_digests(pending_files, download_urls)
+    remote_files = [name for name in pending_files if _can_extract_remotely(tagName, name)]
+    try:
+        if remote_files:
+            failed_files = extract_files_remote(remote_files, extract_dirs, download_urls)
+            pending_files = [
+                name for name in pending_files if name not in remote_files or name in failed_files
+            ]
+    except Exception as e:
+        if "INSTALLATION_CANCELLED" in str(e):
+            log.warning("下载已取消")
+            return False
+        raise
+
+    if not pending_files:
+        return True
+
+    results = download_files_concurrently(pending_files, str(temp_dir), download_urls)
+    for filename, path in zip(pending_files, results):
+        if not path:
+            log.critical(f"下载 {filename} 时发生错误, 安装进程终止。")
+            return False
+        artifact_cache.store(
+            tagName, filename, path, downloadedDigests.get(f"{tagName}/{filename}")
+        )
+        if not unzip_file(
+            path, extract_dirs[filename], root_names=zip_root_names(filename)
+        ):
+            return False
+    return True
+
+
+def prepare_delta_upgrade(tagName, installed_dir: Path) -> DeltaUpgrade | None:
+    """
+    为已安装的 aura 目录准备增量更新
+
+    读取新版本 aura.zip 的中央目录并与已安装文件比对, 将变化的条目获取到暂存目录,
+    实际写入安装目录由调用方在合适的时机调用 DeltaUpgrade.apply() 完成。
+
+    资源缓存 (包括已接管的后台预取) 中有该版本时, 从已校验的本地文件比对, 无需访问网络;
+    否则与 extract_release_files 相同, 仅在满足 _can_extract_remotely 时通过 Range 请求获取变化的条目,
+    其余情况交由调用方完整下载、校验并存入资源缓存。
+
+    Returns:
+        已完成获取的增量更新; 无法增量更新时返回 None, 由调用方回退为完整安装
+    """
+    global desiredTag
+    desiredTag = tagName
+    log.info(f"检测到已安装的 {installed_dir}, 尝试增量更新...")
+
+    progress = ThrottledProgress(_report_progress)
+    cached_path = artifact_cache.lookup(tagName, AURA_FILENAME, TEMP_INSTALL_DIR)
+    if not cached_path:
+        if artifact_cache.is_cacheable(tagName):
+            log.info(f"{AURA_FILENAME} 将完整下载并存入资源缓存, 不进行增量更新")
+            return None
+        download_urls = rank_download_sources()
+        expectedDigests.clear()
+        _load_expected_digests([AURA_FILENAME], download_urls)
+        if not _can_extract_remotely(tagName, AURA_FILENAME):
+            log.info(f"{AURA_FILENAME} 有可校验的 SHA-256, 将完整下载并校验, 不进行增量更新")
+            return None
+        urls = [f"{base_url}/{tagName}/{AURA_FILENAME}" for base_url in download_urls]
+
+    def prepare(progress_cb: Callable[[int, int, str], None]) -> DeltaUpgrade | None:
+        if cached_path:
+            archive = LocalZip(cached_path, progress_cb, AURA_ZIP_ROOT_NAMES)
+        else:
+            archive = RemoteZip(
+                urls, AURA_FILENAME, DOWNLOAD_HEADERS, progress_cb, AURA_ZIP_ROOT_NAMES
+            )
+        delta_upgrade = DeltaUpgrade(archive, installed_dir)
+        try:
+            archive.open()
+            delta_upgrade.plan()
+            delta_upgrade.fetch()
+            return delta_upgrade
+        except (ZipFormatError, requests.exceptions.RequestException, OSError) as e:
+            log.warning(f"增量更新准备失败, 将完整获取 {AURA_FILENAME}: {e}")
+            delta_upgrade.cleanup()
+            return None
+
+    try:
+        if cached_path:
+            delta_upgrade = prepare(progress)
+        else:
+            # 远程比对经后台下载服务排队, 与其他下载共用全局及单主机并发上限
+            job = RemoteZipJob(urls, AURA_FILENAME, prepare, progress_cb=progress)
+            delta_upgrade = download_service.submit(job).result()
+    finally:
+        mirror_scoreboard.save()
+        if cached_path:
+            cached_path.unlink(missing_ok=True)
+    if delta_upgrade is None:
+        return None
+    progress.flush()
+    return delta_upgrade
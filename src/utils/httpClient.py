@@ -0,0 +1,164 @@
+"""
+共享 HTTP 客户端
+测速、API 请求与文件下载统一通过同一个带连接池的 requests.Session 发出,
+按主机保持长连接, 测速时建立的连接 (及其 DNS 解析与 TLS 握手) 可直接被随后的下载复用
+"""
+
+import threading
+import time
+from typing import List
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util.retry import Retry
+from loguru import logger as log
+from config.config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_CONNECT_RETRIES,
+    HTTP_RETRY_BACKOFF,
+    HTTP_POOL_MAXSIZE,
+    HTTP_POOL_TIMEOUT,
+)
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+
+class _BoundedWaitPoolMixin:
+    """连接池已满时最多等待 HTTP_POOL_TIMEOUT 秒; requests 不向连接池传递 pool_timeout, 此处补上默认值"""
+
+    def urlopen(self, *args, **kwargs):
+        kwargs.setdefault("pool_timeout", HTTP_POOL_TIMEOUT)
+        return super().urlopen(*args, **kwargs)
+
+
+class _BoundedWaitHTTPConnectionPool(_BoundedWaitPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _BoundedWaitHTTPSConnectionPool(_BoundedWaitPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _BoundedWaitAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _BoundedWaitHTTPConnectionPool,
+            "https": _BoundedWaitHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """带连接池与统一重试 / 超时策略的 HTTP 客户端"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session: requests.Session | None = None
+        self.max_connections_per_host = 0
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def set_max_connections_per_host(self, limit: int):
+        """
+        限制到同一主机的并发连接数, 0 表示不限
+
+        限制生效时连接池满后新请求将等待已有连接释放, 而不是额外建立连接;
+        等待超过 HTTP_POOL_TIMEOUT 秒时按连接失败处理
+        """
+        with self._lock:
+            if limit == self.max_connections_per_host:
+                return
+            self.max_connections_per_host = limit
+            if self._session is not None:
+                self._mount_adapters(self._session)
+
+    def _mount_adapters(self, session: requests.Session):
+        # 仅重试建连阶段的失败; 读取失败与错误状态码交由调用方切换下载源处理
+        retry = Retry(
+            total=HTTP_CONNECT_RETRIES,
+            connect=HTTP_CONNECT_RETRIES,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=HTTP_RETRY_BACKOFF,
+            raise_on_status=False,
+        )
+        adapter = _BoundedWaitAdapter(
+            pool_connections=32,
+            pool_maxsize=self.max_connections_per_host or HTTP_POOL_MAXSIZE,
+            max_retries=retry,
+            pool_block=self.max_connections_per_host > 0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        self._mount_adapters(session)
+        session.hooks["response"].append(self._log_timing)
+        return session
+
+    @staticmethod
+    def _log_timing(response: requests.Response, *args, **kwargs):
+        """记录从发出请求到收到响应头的耗时"""
+        log.debug(
+            f"HTTP {response.request.method} {urlsplit(response.url).netloc} -> {response.status_code} ({response.elapsed.total_seconds() * 1000:.0f} ms)"
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        发出请求, 参数与 requests.request 一致
+
+        未指定 timeout 时使用 (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        """
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        try:
+            return self.session.request(method, url, **kwargs)
+        except EmptyPoolError as e:
+            # requests 不转换该异常, 转为 ConnectionError 以便调用方按连接失败切换下载源
+            raise requests.exceptions.ConnectionError(e)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def prewarm(self, urls: List[str]):
+        """
+        在后台预先完成到各主机的 DNS 解析与 TCP / TLS 握手
+
+        每个主机发出一次不跟随重定向的 HEAD 请求, 连接随后保留在连接池中,
+        供测速与下载直接复用; 失败仅记录日志。立即返回, 不等待连接建立。
+        """
+        origins = {}
+        for url in urls:
+            parts = urlsplit(url)
+            origins.setdefault(f"{parts.scheme}://{parts.netloc}", url)
+
+        def warm(url: str):
+            start = time.monotonic()
+            try:
+                self.head(url, allow_redirects=False).close()
+                log.debug(
+                    f"已预热到 {urlsplit(url).netloc} 的连接 ({time.monotonic() - start:.2f}s)"
+                )
+            except requests.exceptions.RequestException as e:
+                log.debug(f"预热到 {urlsplit(url).netloc} 的连接失败: {e}")
+
+        for url in origins.values():
+            threading.Thread(
+                target=warm, args=(url,), daemon=True, name="AuraPrewarm"
+            ).start()
+
+
+# 全局 HTTP 客户端实例
+http_client = HttpClient()
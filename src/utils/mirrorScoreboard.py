@@ -0,0 +1,196 @@
+"""
+下载源评分板
+持久化记录每个下载源的 EWMA 首字节时间 (TTFB)、吞吐量及连续失败次数,
+数据来自测速与实际下载, 用于下载源排序; 连续失败的下载源会被熔断一段时间
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger as log
+from config.config import (
+    MIRROR_SCOREBOARD_PATH,
+    MIRROR_SCORE_EWMA_ALPHA,
+    MIRROR_SCORE_STALE_SECONDS,
+    MIRROR_SCORE_REFERENCE_BYTES,
+    MIRROR_BREAKER_FAILURE_THRESHOLD,
+    MIRROR_BREAKER_COOLDOWN_SECONDS,
+)
+
+SAVE_INTERVAL_SECONDS = 2.0
+
+
+def _ewma(old: Optional[float], new: float) -> float:
+    if old is None:
+        return new
+    return MIRROR_SCORE_EWMA_ALPHA * new + (1 - MIRROR_SCORE_EWMA_ALPHA) * old
+
+
+class MirrorScoreboard:
+    """下载源评分板"""
+
+    def __init__(self, path: str = MIRROR_SCOREBOARD_PATH):
+        """
+        初始化评分板
+
+        Args:
+            path: 评分数据 JSON 文件路径
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._scores: Optional[Dict[str, Dict]] = None
+        self._last_save = 0.0
+        self._dirty = False
+
+    def _entries(self) -> Dict[str, Dict]:
+        """加载评分数据, 调用方需持有锁"""
+        if self._scores is None:
+            try:
+                self._scores = json.loads(self.path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._scores = {}
+            except (OSError, ValueError) as e:
+                log.warning(f"下载源评分数据损坏, 将重建: {e}")
+                self._scores = {}
+        return self._scores
+
+    def _entry(self, base_url: str) -> Dict:
+        return self._entries().setdefault(
+            base_url,
+            {
+                "ttfb": None,
+                "throughput": None,
+                "failures": 0,
+                "successes": 0,
+                "open_until": 0.0,
+                "updated_at": 0.0,
+            },
+        )
+
+    def _maybe_save(self):
+        """距上次写盘超过间隔时保存, 调用方需持有锁"""
+        self._dirty = True
+        if time.monotonic() - self._last_save >= SAVE_INTERVAL_SECONDS:
+            self._save_locked()
+
+    def _save_locked(self):
+        if not self._dirty or self._scores is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(self._scores, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            log.warning(f"保存下载源评分失败: {e}")
+        self._last_save = time.monotonic()
+
+    def save(self):
+        """立即保存评分数据"""
+        with self._lock:
+            self._save_locked()
+
+    def record_success(
+        self,
+        base_url: str,
+        ttfb: Optional[float] = None,
+        size: int = 0,
+        transfer_seconds: float = 0.0,
+    ):
+        """
+        记录一次成功的请求
+
+        Args:
+            base_url: 下载源
+            ttfb: 从发出请求到收到响应头的时间 (秒)
+            size: 传输的字节数
+            transfer_seconds: 收到响应头后传输数据所用的时间 (秒)
+        """
+        with self._lock:
+            entry = self._entry(base_url)
+            if ttfb is not None:
+                entry["ttfb"] = _ewma(entry["ttfb"], ttfb)
+            # 数据量过小时测得的吞吐量主要反映延迟, 不计入
+            if size >= 64 * 1024 and transfer_seconds > 0:
+                entry["throughput"] = _ewma(entry["throughput"], size / transfer_seconds)
+            if entry["failures"] >= MIRROR_BREAKER_FAILURE_THRESHOLD:
+                log.info(f"下载源 {base_url} 已恢复")
+            entry["failures"] = 0
+            entry["open_until"] = 0.0
+            entry["successes"] += 1
+            entry["updated_at"] = time.time()
+            self._maybe_save()
+
+    def record_failure(self, base_url: str):
+        """记录一次失败, 连续失败达到阈值时熔断该下载源"""
+        with self._lock:
+            entry = self._entry(base_url)
+            entry["failures"] += 1
+            entry["updated_at"] = time.time()
+            if entry["failures"] >= MIRROR_BREAKER_FAILURE_THRESHOLD:
+                was_open = entry["open_until"] > time.time()
+                entry["open_until"] = time.time() + MIRROR_BREAKER_COOLDOWN_SECONDS
+                if not was_open:
+                    log.warning(
+                        f"下载源 {base_url} 连续失败 {entry['failures']} 次, 将在 {MIRROR_BREAKER_COOLDOWN_SECONDS // 60} 分钟内跳过"
+                    )
+            self._maybe_save()
+
+    def is_available(self, base_url: str) -> bool:
+        """熔断中的下载源在冷却结束前不可用"""
+        with self._lock:
+            entry = self._entries().get(base_url)
+            return not entry or entry["open_until"] <= time.time()
+
+    def has_data(self, base_urls: List[str]) -> bool:
+        with self._lock:
+            entries = self._entries()
+            return any(entries.get(url, {}).get("successes") for url in base_urls)
+
+    def is_stale(self, base_urls: List[str]) -> bool:
+        """任一下载源缺少数据或数据超过期限时视为过期"""
+        deadline = time.time() - MIRROR_SCORE_STALE_SECONDS
+        with self._lock:
+            entries = self._entries()
+            return any(
+                entries.get(url, {}).get("updated_at", 0.0) < deadline
+                for url in base_urls
+            )
+
+    def expected_seconds(
+        self, base_url: str, size: int = MIRROR_SCORE_REFERENCE_BYTES
+    ) -> float:
+        """按评分估算从该下载源下载 size 字节所需时间, 没有数据时返回无穷大"""
+        with self._lock:
+            entry = self._entries().get(base_url)
+        if not entry or entry["ttfb"] is None:
+            return float("inf")
+        if not entry["throughput"]:
+            # 尚无吞吐量数据时仅按延迟排序, 排在有完整数据的下载源之后
+            expected = 1e6 + entry["ttfb"]
+        else:
+            expected = entry["ttfb"] + size / entry["throughput"]
+        # 尚未达到熔断阈值的失败同样降低排名
+        return expected * (1 + entry["failures"])
+
+    def rank(self, base_urls: List[str]) -> List[str]:
+        """
+        按预计完成时间排序, 熔断中的下载源被排除
+
+        Returns:
+            排序后的下载源; 若全部处于熔断状态, 则按原顺序全部返回
+        """
+        available = [url for url in base_urls if self.is_available(url)]
+        if not available:
+            log.warning("所有下载源均处于熔断状态, 将全部重试")
+            return list(base_urls)
+        # sorted 为稳定排序, 没有数据的下载源保持原有相对顺序
+        return sorted(available, key=self.expected_seconds)
+
+
+# 全局下载源评分板实例
+mirror_scoreboard = MirrorScoreboard()
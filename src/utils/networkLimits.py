@@ -0,0 +1,148 @@
+"""
+网络限速
+批量部署时大量设备同时下载会占满出口带宽, 此处提供进程内的全局令牌桶限速、
+单主机连接数上限及启动随机延迟, 参数来自配置文件, 可由命令行参数覆盖;
+来自局域网设备的下载不经过出口, 不计入全局限速
+"""
+
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from loguru import logger as log
+from utils.httpClient import http_client
+from config.config import (
+    NETWORK_LIMITS_CONFIG_PATH,
+    NETWORK_MAX_BYTES_PER_SEC,
+    NETWORK_MAX_CONNECTIONS_PER_HOST,
+    NETWORK_START_JITTER_SECONDS,
+)
+
+_RATE_UNITS = {"": 1, "K": 1024, "M": 1024 * 1024, "G": 1024 * 1024 * 1024}
+
+
+def parse_rate(value: str | int | float) -> int:
+    """
+    解析速率, 支持 "512K", "2M", "1.5m" 等写法, 单位为字节/秒
+
+    Raises:
+        ValueError: 格式不正确
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = value.strip().upper().removesuffix("/S").removesuffix("B")
+    unit = text[-1:] if text[-1:] in _RATE_UNITS else ""
+    number = float(text[: len(text) - len(unit)])
+    if number < 0:
+        raise ValueError(f"速率不能为负数: {value}")
+    return int(number * _RATE_UNITS[unit])
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    令牌按 rate 字节/秒的速度补充, 最多积累 capacity 字节; 单次取用超过余量时允许欠账,
+    调用方等待至欠账还清, 多个线程共用时总速率仍不超过 rate
+    """
+
+    def __init__(self, rate: int, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, size: int):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= size
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+class NetworkLimits:
+    """全局网络限速设置"""
+
+    def __init__(self):
+        self.max_bytes_per_sec = 0
+        self.max_connections_per_host = 0
+        self.jitter_seconds = 0.0
+        self._bucket: TokenBucket | None = None
+
+    def configure(self, args=None, config_path: str = NETWORK_LIMITS_CONFIG_PATH):
+        """
+        依次应用默认配置、配置文件与命令行参数
+
+        Args:
+            args: 命令行参数对象, 其中的 max_rate / max_conns_per_host / jitter 非空时覆盖配置文件
+            config_path: JSON 配置文件路径, 键名与上述参数相同, 文件不存在时忽略
+        """
+        settings = {
+            "max_rate": NETWORK_MAX_BYTES_PER_SEC,
+            "max_conns_per_host": NETWORK_MAX_CONNECTIONS_PER_HOST,
+            "jitter": NETWORK_START_JITTER_SECONDS,
+        }
+        try:
+            file_settings = json.loads(Path(config_path).read_text(encoding="utf-8"))
+            settings.update(
+                {key: file_settings[key] for key in settings if key in file_settings}
+            )
+            log.info(f"已读取网络限速配置: {config_path}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log.warning(f"网络限速配置文件无效, 已忽略: {e}")
+        for key in settings:
+            value = getattr(args, key, None)
+            if value is not None:
+                settings[key] = value
+
+        try:
+            self.max_bytes_per_sec = parse_rate(settings["max_rate"])
+            self.max_connections_per_host = int(settings["max_conns_per_host"])
+            self.jitter_seconds = float(settings["jitter"])
+        except (TypeError, ValueError) as e:
+            log.warning(f"网络限速参数无效, 将不限速: {e}")
+            self.max_bytes_per_sec = self.max_connections_per_host = 0
+            self.jitter_seconds = 0.0
+
+        # 桶容量为 0.5 秒的数据量, 限制瞬时突发
+        self._bucket = (
+            TokenBucket(self.max_bytes_per_sec, max(self.max_bytes_per_sec // 2, 1))
+            if self.max_bytes_per_sec > 0
+            else None
+        )
+        http_client.set_max_connections_per_host(self.max_connections_per_host)
+        if self.max_bytes_per_sec or self.max_connections_per_host or self.jitter_seconds:
+            log.info(
+                f"网络限速: 总速率 {f'{self.max_bytes_per_sec / 1024:.0f} KB/s' if self.max_bytes_per_sec else '不限'}, "
+                f"单主机连接数 {self.max_connections_per_host or '不限'}, 启动随机延迟 {self.jitter_seconds:g}s"
+            )
+
+    @property
+    def is_rate_limited(self) -> bool:
+        return self._bucket is not None
+
+    def throttle(self, size: int):
+        """下载循环每读取 size 字节调用一次, 超出总速率时阻塞等待"""
+        bucket = self._bucket
+        if bucket:
+            bucket.consume(size)
+
+    def apply_jitter(self):
+        """开始联网前随机等待, 错开同时启动的大量设备"""
+        if self.jitter_seconds > 0:
+            delay = random.uniform(0, self.jitter_seconds)
+            log.info(f"随机延迟 {delay:.1f}s 后开始下载")
+            time.sleep(delay)
+
+
+# 全局网络限速实例
+network_limits = NetworkLimits()
@@ -0,0 +1,162 @@
+"""
+可续传下载的 .part 文件管理
+
+每个下载中的文件对应一个 <filename>.part 数据文件和一个 <filename>.part.json 元数据文件,
+元数据记录来源 URL, ETag, 文件总大小以及已写入的字节区间, 用于断线重连 / 切换下载源 /
+重新启动安装器后继续下载。
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from loguru import logger as log
+from config.config import PARTIAL_DOWNLOAD_DIR, PARTIAL_DOWNLOAD_MAX_AGE_SECONDS
+
+
+class PartialDownload:
+    """单个文件的 .part 数据及其 sidecar 元数据"""
+
+    def __init__(self, tag: str, filename: str):
+        self.part_path = Path(PARTIAL_DOWNLOAD_DIR) / tag / f"{filename}.part"
+        self.meta_path = Path(f"{self.part_path}.json")
+        self.url: str | None = None
+        self.etag: str | None = None
+        self.total_size = 0
+        self.ranges: list[list[int]] = []
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(end - start for start, end in self.ranges)
+
+    @property
+    def is_complete(self) -> bool:
+        return self.total_size > 0 and self.ranges == [[0, self.total_size]]
+
+    def load(self) -> bool:
+        """
+        读取 sidecar 元数据
+
+        Returns:
+            存在可用于续传的数据时返回 True
+        """
+        if not self.part_path.exists() or not self.meta_path.exists():
+            return False
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            self.url = meta.get("url")
+            self.etag = meta.get("etag")
+            self.total_size = int(meta.get("total_size", 0))
+            self.ranges = [[int(start), int(end)] for start, end in meta.get("ranges", [])]
+        except (OSError, ValueError, TypeError) as e:
+            log.warning(f"读取续传信息 {self.meta_path} 失败, 将重新下载: {e}")
+            self.reset(None, None, 0)
+            return False
+        return self.bytes_written > 0
+
+    def save(self):
+        """原子地写入 sidecar 元数据"""
+        meta = {
+            "url": self.url,
+            "etag": self.etag,
+            "total_size": self.total_size,
+            "bytes_written": self.bytes_written,
+            "ranges": self.ranges,
+        }
+        tmp_path = Path(f"{self.meta_path}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(tmp_path, self.meta_path)
+        except OSError as e:
+            log.warning(f"写入续传信息 {self.meta_path} 失败: {e}")
+
+    def matches(self, etag: str | None, total_size: int) -> bool:
+        """判断下载源返回的文件是否与已下载部分为同一文件"""
+        if self.total_size and total_size and self.total_size != total_size:
+            return False
+        if self.etag and etag and self.etag != etag:
+            return False
+        return True
+
+    def reset(self, url: str | None, etag: str | None, total_size: int):
+        """丢弃已下载数据, 重新开始"""
+        self.url = url
+        self.etag = etag
+        self.total_size = total_size
+        self.ranges = []
+        self.part_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.part_path, "wb") as f:
+            if total_size:
+                f.truncate(total_size)
+        self.save()
+
+    def add_range(self, start: int, end: int):
+        """记录 [start, end) 已写入, 并与相邻区间合并"""
+        if end <= start:
+            return
+        if self.ranges and self.ranges[-1][0] <= start <= self.ranges[-1][1]:
+            # 顺序写入的快速路径: 直接延长最后一个区间
+            self.ranges[-1][1] = max(self.ranges[-1][1], end)
+            return
+        merged = []
+        for cur_start, cur_end in sorted(self.ranges + [[start, end]]):
+            if merged and cur_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], cur_end)
+            else:
+                merged.append([cur_start, cur_end])
+        self.ranges = merged
+
+    def contiguous_prefix(self) -> int:
+        """从文件开头起连续已写入的字节数"""
+        if self.ranges and self.ranges[0][0] == 0:
+            return self.ranges[0][1]
+        return 0
+
+    def missing_ranges(self) -> list[tuple[int, int]]:
+        """尚未写入的 [start, end) 区间列表"""
+        missing = []
+        pos = 0
+        for start, end in self.ranges:
+            if start > pos:
+                missing.append((pos, start))
+            pos = max(pos, end)
+        if pos < self.total_size:
+            missing.append((pos, self.total_size))
+        return missing
+
+    def finalize(self, dest_path: Path) -> Path:
+        """下载完成后将 .part 移动至目标路径并清理元数据"""
+        if self.total_size:
+            with open(self.part_path, "r+b") as f:
+                f.truncate(self.total_size)
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        if dest_path.exists():
+            os.remove(dest_path)
+        shutil.move(str(self.part_path), str(dest_path))
+        self.discard()
+        return dest_path
+
+    def discard(self):
+        """删除 .part 数据及元数据"""
+        for path in (self.part_path, self.meta_path):
+            try:
+                if path.exists():
+                    os.remove(path)
+            except OSError as e:
+                log.warning(f"删除续传文件 {path} 失败: {e}")
+
+
+def cleanup_stale_partials():
+    """清理超过保留期限的续传数据"""
+    partial_root = Path(PARTIAL_DOWNLOAD_DIR)
+    if not partial_root.exists():
+        return
+    deadline = time.time() - PARTIAL_DOWNLOAD_MAX_AGE_SECONDS
+    for tag_dir in partial_root.iterdir():
+        try:
+            if tag_dir.is_dir() and tag_dir.stat().st_mtime < deadline:
+                log.info(f"正在清理过期的续传数据: {tag_dir}")
+                shutil.rmtree(tag_dir)
+        except OSError as e:
+            log.warning(f"清理续传数据 {tag_dir} 失败: {e}")
@@ -0,0 +1,182 @@
+"""
+ASAR 修补结果缓存
+以 (原始 ASAR 的 SHA-256, core 内容摘要, 修补规则版本) 为键 gzip 压缩保存修补后的 ASAR,
+输入完全一致的重装直接解压出上次的结果, 超出容量时按最近最少使用淘汰
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+from loguru import logger as log
+from utils.checksum import HASH_CHUNK_SIZE, sha256_file, sha256_tree
+from config.config import (
+    PATCHED_ASAR_CACHE_COMPRESSLEVEL,
+    PATCHED_ASAR_CACHE_DIR,
+    PATCHED_ASAR_CACHE_ENABLED,
+    PATCHED_ASAR_CACHE_MAX_BYTES,
+)
+
+
+class PatchedAsarCache:
+    """ASAR 修补结果缓存"""
+
+    def __init__(self, cache_dir: str = PATCHED_ASAR_CACHE_DIR):
+        """
+        初始化修补结果缓存
+
+        Args:
+            cache_dir: 缓存根目录, 其下 objects/ 存放以键命名的 .asar.gz 文件, index.json 为索引
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self._lock = threading.Lock()
+
+    def _object_path(self, key: str) -> Path:
+        return self.objects_dir / f"{key}.asar.gz"
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            return json.loads(self.index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.warning(f"修补结果缓存索引损坏, 将重建: {e}")
+            return {}
+
+    def _save_index(self, index: Dict[str, Dict]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+
+    def make_key(self, input_asar_path: Path, core_dir: Path, patch_version: int) -> Optional[str]:
+        """
+        计算缓存键
+
+        Args:
+            input_asar_path: 原始 ASAR 路径
+            core_dir: 已解压的 core 目录
+            patch_version: 修补规则版本
+
+        Returns:
+            缓存键; 缓存未启用或无法读取输入时返回 None
+        """
+        if not PATCHED_ASAR_CACHE_ENABLED:
+            return None
+        try:
+            asar_sha256 = sha256_file(Path(input_asar_path))
+            core_digest = sha256_tree(Path(core_dir))
+        except OSError as e:
+            log.warning(f"计算修补结果缓存键失败: {e}")
+            return None
+        return hashlib.sha256(
+            f"{asar_sha256}:{core_digest}:{patch_version}".encode()
+        ).hexdigest()
+
+    def restore(self, key: str, output_path: Path) -> bool:
+        """
+        从缓存中取出修补结果
+
+        Args:
+            key: 缓存键
+            output_path: 输出路径
+
+        Returns:
+            是否命中
+        """
+        output_path = Path(output_path)
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if not entry:
+                return False
+            tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+            try:
+                digest = hashlib.sha256()
+                with gzip.open(self._object_path(key), "rb") as src, open(tmp_path, "wb") as dst:
+                    while chunk := src.read(HASH_CHUNK_SIZE):
+                        digest.update(chunk)
+                        dst.write(chunk)
+                if digest.hexdigest() != entry["sha256"]:
+                    raise zlib.error("解压结果与记录的 SHA-256 不一致")
+                os.replace(tmp_path, output_path)
+                entry["last_used"] = time.time()
+                self._save_index(index)
+            except (OSError, EOFError, zlib.error) as e:
+                log.warning(f"修补结果缓存 {key[:12]}... 已损坏, 将重新修补: {e}")
+                tmp_path.unlink(missing_ok=True)
+                index.pop(key, None)
+                self._save_index(index)
+                self._remove_object(key)
+                return False
+
+        log.success(f"修补结果缓存命中 ({key[:12]}...), 跳过 ASAR 修补")
+        return True
+
+    def store(self, key: str, path: Path):
+        """
+        将修补结果压缩后存入缓存
+
+        Args:
+            key: 缓存键
+            path: 修补后的 ASAR 路径
+        """
+        object_path = self._object_path(key)
+        tmp_path = object_path.with_suffix(".tmp")
+        try:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            digest = hashlib.sha256()
+            with open(path, "rb") as src, gzip.open(
+                tmp_path, "wb", compresslevel=PATCHED_ASAR_CACHE_COMPRESSLEVEL
+            ) as dst:
+                while chunk := src.read(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+                    dst.write(chunk)
+            with self._lock:
+                os.replace(tmp_path, object_path)
+                index = self._load_index()
+                now = time.time()
+                index[key] = {
+                    "sha256": digest.hexdigest(),
+                    "size": object_path.stat().st_size,
+                    "stored_at": now,
+                    "last_used": now,
+                }
+                self._evict(index)
+                self._save_index(index)
+            log.info(
+                f"已将修补结果存入缓存 ({key[:12]}..., 压缩后 {index[key]['size'] / 1024 / 1024:.2f} MB)"
+            )
+        except OSError as e:
+            log.warning(f"写入修补结果缓存失败: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _remove_object(self, key: str):
+        try:
+            self._object_path(key).unlink(missing_ok=True)
+        except OSError as e:
+            log.warning(f"删除修补结果缓存文件失败: {e}")
+
+    def _evict(self, index: Dict[str, Dict]):
+        """按总容量淘汰缓存项, 调用方需持有锁"""
+        by_last_used = sorted(index.items(), key=lambda item: item[1]["last_used"])
+        total_size = sum(entry["size"] for entry in index.values())
+        # 保留最近使用的一项, 避免单个结果超出容量时刚写入就被淘汰
+        for key, entry in by_last_used[:-1]:
+            if total_size <= PATCHED_ASAR_CACHE_MAX_BYTES:
+                break
+            log.info(f"修补结果缓存超出容量, 正在淘汰 {key[:12]}...")
+            index.pop(key)
+            total_size -= entry["size"]
+            self._remove_object(key)
+
+
+# 全局修补结果缓存实例
+patched_asar_cache = PatchedAsarCache()
@@ -0,0 +1,154 @@
+"""
+局域网资源共享
+--serve-cache 模式下将本地资源缓存通过 HTTP 提供给同一网络中的其他设备:
+    /<tag>/<filename>           与下载源相同的路径格式, 可直接作为下载源使用
+    /<tag>/<filename>.sha256    校验文件
+    /sha256/<digest>            按内容寻址
+均支持 HEAD 与单区间 Range 请求; 客户端在 LAN_PEERS / --peer 中配置的设备会排在公网下载源之前
+"""
+
+import re
+import socket
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Tuple
+from loguru import logger as log
+from utils.artifactCache import artifact_cache
+from config.config import (
+    CHECKSUM_SIDECAR_SUFFIX,
+    LAN_PEERS,
+    PEER_CACHE_BIND,
+    PEER_CACHE_PORT,
+)
+
+_DIGEST_PATH = re.compile(r"^/sha256/([0-9a-f]{64})$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# 已配置的局域网设备, 形如 "http://192.168.1.10:8765"
+lan_peers: List[str] = [peer.rstrip("/") for peer in LAN_PEERS]
+
+
+def add_lan_peers(peers: List[str]):
+    """追加局域网设备 (来自命令行参数)"""
+    for peer in peers:
+        peer = peer.rstrip("/")
+        if "//" not in peer:
+            peer = f"http://{peer}"
+        if peer not in lan_peers:
+            lan_peers.append(peer)
+
+
+def is_peer_url(url: str) -> bool:
+    """URL 是否指向已配置的局域网设备"""
+    return any(url == peer or url.startswith(f"{peer}/") for peer in lan_peers)
+
+
+class _PeerCacheHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "AuraPeerCache"
+
+    def log_message(self, format, *args):
+        log.debug(f"[{self.client_address[0]}] {format % args}")
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _resolve(self) -> Tuple[Path | None, str | None, bool]:
+        """
+        Returns:
+            (缓存对象路径, SHA-256, 是否为校验文件请求)
+        """
+        path = self.path.split("?", 1)[0]
+        match = _DIGEST_PATH.match(path)
+        if match:
+            return artifact_cache.object_path(match.group(1)), match.group(1), False
+
+        parts = path.strip("/").split("/")
+        if len(parts) != 2 or not all(parts) or ".." in parts:
+            return None, None, False
+        tag, filename = parts
+        is_sidecar = filename.endswith(CHECKSUM_SIDECAR_SUFFIX)
+        if is_sidecar:
+            filename = filename[: -len(CHECKSUM_SIDECAR_SUFFIX)]
+        sha256 = artifact_cache.digest_of(tag, filename)
+        if not sha256:
+            return None, None, is_sidecar
+        return artifact_cache.object_path(sha256), sha256, is_sidecar
+
+    def _send_empty(self, code: int, headers: dict | None = None):
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _serve(self, send_body: bool):
+        object_path, sha256, is_sidecar = self._resolve()
+        if not object_path:
+            self._send_empty(404)
+            return
+
+        if is_sidecar:
+            body = f"{sha256}  {Path(self.path).name[: -len(CHECKSUM_SIDECAR_SUFFIX)]}\n".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        size = object_path.stat().st_size
+        start, end = 0, size - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        etag = f'"{sha256}"'
+        if range_header and (not if_range or if_range == etag):
+            match = _RANGE.match(range_header.strip())
+            if match and (match.group(1) or match.group(2)):
+                if match.group(1):
+                    start = int(match.group(1))
+                    if match.group(2):
+                        end = min(int(match.group(2)), size - 1)
+                else:
+                    start = max(size - int(match.group(2)), 0)
+                if start >= size or start > end:
+                    self._send_empty(416, {"Content-Range": f"bytes */{size}"})
+                    return
+                status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if not send_body:
+            return
+        try:
+            with open(object_path, "rb") as f:
+                # socket.sendfile 在支持的平台上使用零拷贝发送
+                self.connection.sendfile(f, start, end - start + 1)
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            self.close_connection = True
+
+
+def serve_cache(port: int = PEER_CACHE_PORT, bind: str = PEER_CACHE_BIND):
+    """在前台运行局域网资源共享服务, 直到被中断"""
+    server = ThreadingHTTPServer((bind, port), _PeerCacheHandler)
+    server.daemon_threads = True
+    log.info(
+        f"局域网资源共享已启动: http://{bind}:{server.server_port}/ (资源缓存: {artifact_cache.cache_dir})"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("局域网资源共享已停止")
+    finally:
+        server.server_close()
@@ -0,0 +1,54 @@
+"""
+下载进度回报节流
+下载循环中每个数据块都会产生一次进度, 直接逐块回报会导致大量日志与 Tk 事件,
+此处按时间间隔与字节增量合并回报, 并保证最终进度一定会被送达
+"""
+
+import threading
+import time
+from typing import Callable
+from config.config import PROGRESS_REPORT_MAX_HZ, PROGRESS_REPORT_MIN_BYTES
+
+
+class ThrottledProgress:
+    """按时间与字节增量节流的进度回调包装"""
+
+    def __init__(
+        self,
+        callback: Callable[[int, int, str], None],
+        max_hz: float = PROGRESS_REPORT_MAX_HZ,
+        min_bytes: int = PROGRESS_REPORT_MIN_BYTES,
+    ):
+        self.callback = callback
+        self.min_interval = 1.0 / max_hz
+        self.min_bytes = min_bytes
+        self._lock = threading.Lock()
+        self._last_time = 0.0
+        self._last_size = -1
+        self._pending: tuple[int, int, str] | None = None
+
+    def __call__(self, downloaded_size: int, total_size: int, filename: str):
+        now = time.monotonic()
+        with self._lock:
+            self._pending = (downloaded_size, total_size, filename)
+            is_final = total_size > 0 and downloaded_size >= total_size
+            if not is_final and (
+                now - self._last_time < self.min_interval
+                or downloaded_size - self._last_size < self.min_bytes
+            ):
+                return
+            self._last_time = now
+            self._last_size = downloaded_size
+            self._pending = None
+        self.callback(downloaded_size, total_size, filename)
+
+    def flush(self):
+        """送达最后一次被合并掉的进度"""
+        with self._lock:
+            pending = self._pending
+            self._pending = None
+            if pending:
+                self._last_time = time.monotonic()
+                self._last_size = pending[0]
+        if pending:
+            self.callback(*pending)
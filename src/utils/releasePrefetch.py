@@ -0,0 +1,192 @@
+"""
+版本资源预取
+图形界面加载版本列表后, 以低优先级在后台下载所选版本的资源文件并存入本地资源缓存;
+切换版本时改为预取新版本, 开始安装时若版本一致则接管正在进行的预取, 安装流程随后直接命中缓存
+"""
+
+import concurrent.futures
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, List
+from loguru import logger as log
+from config.config import (
+    AURA_FILENAME,
+    BASE_DOWNLOAD_URLS,
+    CORE_FILENAME,
+    DOWNLOAD_VERIFY_SHA256,
+    PREFETCH_DIR,
+    PREFETCH_ENABLED,
+)
+from utils import fileDownloader
+from utils.artifactCache import artifact_cache
+from utils.checksum import fetch_expected_digests
+from utils.downloadService import DownloadJob, PRIORITY_PREFETCH, download_service
+from utils.mirrorScoreboard import mirror_scoreboard
+from utils.peerCache import lan_peers
+
+
+class _Prefetch:
+    """一次预取"""
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.cancel_event = threading.Event()
+        self.futures: List[concurrent.futures.Future] = []
+        # 被安装流程接管后, 进度转发至此
+        self.progress_cb: Callable[[int, int, str], None] | None = None
+        # 接管后进度回调抛出的取消异常, 由 adopt() 在预取结束后重新抛出
+        self.cancel_error: Exception | None = None
+        self.thread: threading.Thread | None = None
+
+    def report(self, downloaded_size: int, total_size: int, filename: str):
+        if self.progress_cb:
+            try:
+                self.progress_cb(downloaded_size, total_size, filename)
+            except Exception as e:
+                self.cancel_error = e
+                raise
+
+
+class ReleasePrefetcher:
+    """所选版本资源文件的后台预取"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current: _Prefetch | None = None
+
+    def start(self, tag: str | None):
+        """
+        开始预取指定版本, 正在预取其他版本时先取消
+
+        Args:
+            tag: 版本标签, 为空时仅取消当前预取
+        """
+        if not PREFETCH_ENABLED:
+            return
+        with self._lock:
+            current = self._current
+            if current and current.tag == tag and not current.cancel_event.is_set():
+                return
+            self._cancel_locked()
+            # 不进入资源缓存的版本 (如 vAutoBuild) 预取后无法被安装流程取用
+            if not artifact_cache.is_cacheable(tag):
+                return
+            prefetch = _Prefetch(tag)  # type: ignore
+            prefetch.thread = threading.Thread(
+                target=self._run, args=(prefetch,), daemon=True, name="AuraPrefetch"
+            )
+            self._current = prefetch
+        prefetch.thread.start()
+
+    def cancel(self):
+        """取消当前预取"""
+        with self._lock:
+            self._cancel_locked()
+
+    def _cancel_locked(self):
+        prefetch, self._current = self._current, None
+        if not prefetch:
+            return
+        prefetch.cancel_event.set()
+        for future in prefetch.futures:
+            future.cancel()
+        log.info(f"已取消预取 {prefetch.tag}")
+
+    def adopt(self, tag: str, progress_cb: Callable[[int, int, str], None]) -> bool:
+        """
+        由安装流程接管预取: 版本一致时转发进度并等待预取结束, 否则取消预取
+
+        Args:
+            tag: 即将安装的版本标签
+            progress_cb: 安装流程的下载进度回调, 其抛出的取消异常会取消预取
+
+        Returns:
+            是否接管了预取 (预取成功的文件已存入资源缓存)
+
+        Raises:
+            Exception: 接管期间 progress_cb 抛出的取消异常, 预取结束后原样抛出
+        """
+        with self._lock:
+            prefetch = self._current
+            if not prefetch or prefetch.tag != tag:
+                self._cancel_locked()
+                return False
+            prefetch.progress_cb = progress_cb
+        log.info(f"接管正在进行的 {tag} 预取")
+        prefetch.thread.join()  # type: ignore
+        with self._lock:
+            if self._current is prefetch:
+                self._current = None
+        if prefetch.cancel_error:
+            raise prefetch.cancel_error
+        return True
+
+    def _run(self, prefetch: _Prefetch):
+        tag = prefetch.tag
+        filenames = [
+            filename
+            for filename in (CORE_FILENAME, AURA_FILENAME)
+            if not artifact_cache.contains(tag, filename)
+        ]
+        if not filenames:
+            log.debug(f"{tag} 的资源文件均已在资源缓存中, 无需预取")
+            return
+
+        dest_folder = Path(PREFETCH_DIR) / tag
+        try:
+            # 不进行测速, 以免与安装流程的测速争抢带宽; 无评分数据时按默认顺序下载
+            download_urls = lan_peers + mirror_scoreboard.rank(BASE_DOWNLOAD_URLS)
+            digests = (
+                fetch_expected_digests(tag, filenames, download_urls)
+                if DOWNLOAD_VERIFY_SHA256
+                else {}
+            )
+            progress = fileDownloader.CombinedProgress(filenames, prefetch.report)
+            log.info(f"开始在后台预取 {tag}: {', '.join(filenames)}")
+
+            for index, filename in enumerate(filenames):
+                job = DownloadJob(
+                    [
+                        f"{base_url}/{tag}/{filename}"
+                        for base_url in fileDownloader.spread_sources(
+                            download_urls, index
+                        )
+                    ],
+                    str(dest_folder),
+                    filename,
+                    sha256=digests.get(filename),
+                    priority=PRIORITY_PREFETCH,
+                    progress_cb=progress.file_callback(filename),
+                )
+                with self._lock:
+                    if prefetch.cancel_event.is_set():
+                        return
+                    prefetch.futures.append(download_service.submit(job))
+
+            results = []
+            for filename, future in zip(filenames, prefetch.futures):
+                try:
+                    path = future.result()
+                except concurrent.futures.CancelledError:
+                    path = None
+                results.append(path)
+                if path:
+                    artifact_cache.store(
+                        tag,
+                        filename,
+                        path,
+                        fileDownloader.downloadedDigests.get(f"{tag}/{filename}"),
+                    )
+            if all(results):
+                progress.flush()
+                log.success(f"{tag} 预取完成")
+        except Exception as e:
+            log.warning(f"预取 {tag} 失败: {e}")
+        finally:
+            mirror_scoreboard.save()
+            shutil.rmtree(dest_folder, ignore_errors=True)
+
+
+# 全局版本预取实例
+release_prefetcher = ReleasePrefetcher()
@@ -0,0 +1,341 @@
+"""
+远程 ZIP 随机访问
+先通过 Range 请求获取 ZIP 末尾的中央目录, 再按条目偏移分批并行获取数据,
+边下载边解压并校验 CRC32, 直接写入目标目录, 无需先在本地保存完整的 ZIP 文件
+"""
+
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Collection, Dict, Iterator, List
+import requests
+from loguru import logger as log
+from utils.httpClient import http_client
+from utils.mirrorScoreboard import mirror_scoreboard
+from utils.networkLimits import network_limits
+from utils.peerCache import is_peer_url
+from utils.zipFormat import (
+    LOCAL_HEADER_SIZE,
+    TAIL_BYTES,
+    ZipEntry,
+    ZipFormatError,
+    inflate_entry,
+    local_header_length,
+    locate_central_directory,
+    parse_central_directory,
+    resolve_layout,
+    safe_entry_path,
+)
+from config.config import (
+    DOWNLOAD_STALL_SECONDS,
+    HTTP_CONNECT_TIMEOUT,
+    REMOTE_ZIP_BATCH_BYTES,
+    REMOTE_ZIP_MAX_GAP_BYTES,
+    REMOTE_ZIP_WORKERS,
+)
+
+READ_CHUNK_SIZE = 256 * 1024
+RANGE_TIMEOUT = (HTTP_CONNECT_TIMEOUT, DOWNLOAD_STALL_SECONDS)
+
+
+class RemoteZipError(ZipFormatError):
+    """远程 ZIP 无法解析, 或条目数据校验失败"""
+
+
+def _parse_content_range(content_range: str) -> tuple[int, int]:
+    """从 "bytes 100-199/12345" 中取出 (起始偏移, 文件总大小)"""
+    try:
+        span, total = content_range.split(" ", 1)[1].split("/", 1)
+        return int(span.split("-", 1)[0]), int(total)
+    except (IndexError, ValueError):
+        raise RemoteZipError(f"无法解析 Content-Range: {content_range!r}")
+
+
+class _ChunkReader:
+    """将响应体的数据块包装为可按字节数读取的流"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = memoryview(b"")
+
+    def iter_exact(self, size: int) -> Iterator[memoryview]:
+        while size > 0:
+            if not self._buffer:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    raise RemoteZipError("数据在条目结束前中断")
+                self._buffer = memoryview(chunk)
+            part = self._buffer[:size]
+            self._buffer = self._buffer[len(part) :]
+            size -= len(part)
+            yield part
+
+    def read_exact(self, size: int) -> bytes:
+        return b"".join(self.iter_exact(size))
+
+    def skip(self, size: int):
+        for _ in self.iter_exact(size):
+            pass
+
+
+class RemoteZip:
+    """
+    基于 HTTP Range 的远程 ZIP 读取器
+
+    open() 读取中央目录后, extract() 将相邻的条目合并为不超过 REMOTE_ZIP_BATCH_BYTES
+    的批次, 由多个线程分别从不同下载源获取并解压; 某个批次失败时换下一个下载源重试整批。
+    中央目录由局域网设备提供时, 各批次只在局域网设备间轮转, 公网下载源仅在局域网设备失败后使用。
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        filename: str,
+        headers: Dict[str, str] | None = None,
+        progress_cb: Callable[[int, int, str], None] | None = None,
+        root_names: Collection[str] = (),
+    ):
+        """
+        Args:
+            urls: 按优先级排序的完整文件 URL 列表, 各下载源上的文件必须一致
+            filename: 文件名, 用于日志与进度回报
+            headers: 每个请求附带的请求头
+            progress_cb: 进度回调, 按已获取的压缩数据字节数回报
+            root_names: 允许去除的外层目录名称, 见 resolve_layout
+        """
+        self.urls = urls
+        self.filename = filename
+        self.headers = headers or {}
+        self.progress_cb = progress_cb
+        self.root_names = root_names
+        self.size = 0
+        self.etag: str | None = None
+        self.entries: List[ZipEntry] = []
+        # 各批次轮流作为首选的下载源, open() 后确定
+        self._spread_urls = urls
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._downloaded_size = 0
+        self._total_size = 0
+
+    def _get_range(self, url: str, byte_range: str) -> tuple[bytes, int]:
+        """获取一段数据, 返回 (数据, 起始偏移)"""
+        headers = dict(self.headers)
+        headers["Range"] = f"bytes={byte_range}"
+        # 先检查状态码再读取响应体, 避免不支持 Range 的下载源返回整个文件
+        with http_client.get(
+            url, stream=True, timeout=RANGE_TIMEOUT, headers=headers
+        ) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise RemoteZipError(f"下载源不支持 Range 请求 (HTTP {r.status_code})")
+            start, total = _parse_content_range(r.headers.get("content-range", ""))
+            if self.size and total != self.size:
+                raise RemoteZipError("下载源上的文件与中央目录不一致")
+            self.size = total
+            self.etag = self.etag or r.headers.get("etag")
+            return r.content, start
+
+    def open(self):
+        """
+        从第一个可用的下载源读取中央目录, 读取失败的下载源在后续获取条目时排在最后
+
+        Raises:
+            ZipLayoutError: 目录结构不正确, 与下载源无关, 不再尝试其他下载源
+        """
+        failed_urls = []
+        for url in self.urls:
+            try:
+                self._read_central_directory(url)
+                log.info(
+                    f"已读取 {self.filename} 的中央目录, 共 {len(self.entries)} 个条目, 文件大小: {self.size / 1024 / 1024:.2f} MB"
+                )
+                self.urls = [u for u in self.urls if u not in failed_urls] + failed_urls
+                self._spread_urls = (
+                    [u for u in self.urls if is_peer_url(u) and u not in failed_urls]
+                    if is_peer_url(url)
+                    else self.urls
+                )
+                break
+            except (requests.exceptions.RequestException, ZipFormatError, struct.error) as e:
+                log.warning(f"从 {url} 读取中央目录失败: {e}")
+                mirror_scoreboard.record_failure(url.rsplit("/", 2)[0])
+                failed_urls.append(url)
+                self.size = 0
+                self.etag = None
+        else:
+            raise RemoteZipError(f"所有下载源均无法读取 {self.filename} 的中央目录")
+
+        self.entries, prefix = resolve_layout(self.entries, self.filename, self.root_names)
+        if prefix:
+            log.info(f"{self.filename} 中的文件位于外层目录 {prefix} 下, 解压时将去除该目录")
+
+    def _read_central_directory(self, url: str):
+        data, start = self._get_range(url, f"-{TAIL_BYTES}")
+        count, cd_size, cd_offset = locate_central_directory(
+            data, start, lambda begin, end: self._get_range(url, f"{begin}-{end - 1}")[0]
+        )
+        if cd_offset < start:
+            head, _ = self._get_range(url, f"{cd_offset}-{start - 1}")
+            data = head + data
+            start = cd_offset
+        central_directory = data[cd_offset - start : cd_offset - start + cd_size]
+        self.entries = parse_central_directory(central_directory, count, cd_offset)
+
+    def _plan_batches(self, entries: List[ZipEntry]) -> List[List[ZipEntry]]:
+        """将位置相邻 (间隔不超过 REMOTE_ZIP_MAX_GAP_BYTES) 的条目合并为批次"""
+        batches: List[List[ZipEntry]] = []
+        for entry in sorted(entries, key=lambda entry: entry.header_offset):
+            if batches:
+                batch = batches[-1]
+                gap = entry.header_offset - batch[-1].end_offset
+                if (
+                    gap <= REMOTE_ZIP_MAX_GAP_BYTES
+                    and entry.end_offset - batch[0].header_offset <= REMOTE_ZIP_BATCH_BYTES
+                ):
+                    batch.append(entry)
+                    continue
+            batches.append([entry])
+        return batches
+
+    def _advance(self, size: int):
+        with self._lock:
+            self._downloaded_size += size
+            downloaded_size = self._downloaded_size
+        if self.progress_cb:
+            self.progress_cb(downloaded_size, self._total_size, self.filename)
+
+    def _iter_response(self, r: requests.Response, counter: List[int]) -> Iterator[bytes]:
+        # 来自局域网设备的数据不占用出口带宽, 不计入全局限速
+        throttled = not is_peer_url(r.url)
+        for chunk in r.iter_content(READ_CHUNK_SIZE):
+            if self._stop_event.is_set():
+                raise RemoteZipError("解压已中止")
+            if throttled:
+                network_limits.throttle(len(chunk))
+            counter[0] += len(chunk)
+            self._advance(len(chunk))
+            yield chunk
+
+    def _write_entry(self, entry: ZipEntry, data: Iterator[memoryview], dest: Path):
+        target = safe_entry_path(dest, entry.name)
+        if target is None or entry.is_dir:
+            for _ in data:
+                pass
+            if target is not None:
+                target.mkdir(parents=True, exist_ok=True)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        inflate_entry(entry, data, target)
+
+    def _extract_batch(self, url: str, batch: List[ZipEntry], dest: Path, counter: List[int]):
+        start = batch[0].header_offset
+        end = batch[-1].end_offset
+        headers = dict(self.headers)
+        headers["Range"] = f"bytes={start}-{end - 1}"
+        if self.etag:
+            headers["If-Range"] = self.etag
+
+        request_start = time.monotonic()
+        with http_client.get(
+            url, stream=True, timeout=RANGE_TIMEOUT, headers=headers
+        ) as r:
+            r.raise_for_status()
+            if r.status_code != 206 or _parse_content_range(
+                r.headers.get("content-range", "")
+            ) != (start, self.size):
+                raise RemoteZipError("下载源未返回所需的分段内容")
+            transfer_start = time.monotonic()
+            reader = _ChunkReader(self._iter_response(r, counter))
+            position = start
+            for entry in batch:
+                reader.skip(entry.header_offset - position)
+                header_length = local_header_length(
+                    entry, reader.read_exact(LOCAL_HEADER_SIZE)
+                )
+                reader.skip(header_length - LOCAL_HEADER_SIZE)
+                self._write_entry(entry, reader.iter_exact(entry.compress_size), dest)
+                position = entry.header_offset + header_length + entry.compress_size
+            # 跳过最后一个条目之后的数据描述符
+            reader.skip(end - position)
+        mirror_scoreboard.record_success(
+            url.rsplit("/", 2)[0],
+            transfer_start - request_start,
+            end - start,
+            time.monotonic() - transfer_start,
+        )
+
+    def _fetch_batch(self, index: int, batch: List[ZipEntry], dest: Path):
+        # 各批次从不同的下载源开始, 以叠加多个下载源的带宽
+        shift = index % len(self._spread_urls)
+        urls = self._spread_urls[shift:] + self._spread_urls[:shift]
+        urls += [url for url in self.urls if url not in urls]
+        last_error: Exception | None = None
+        for url in urls:
+            if self._stop_event.is_set():
+                return
+            counter = [0]
+            try:
+                self._extract_batch(url, batch, dest, counter)
+                return
+            except (requests.exceptions.RequestException, ZipFormatError, struct.error, zlib.error) as e:
+                if self._stop_event.is_set():
+                    return
+                last_error = e
+                log.warning(
+                    f"从 {url} 获取 {self.filename} 的 {len(batch)} 个条目失败, 尝试下一个下载源: {e}"
+                )
+                mirror_scoreboard.record_failure(url.rsplit("/", 2)[0])
+                # 回退本批次已计入的进度, 重试时会重新获取
+                self._advance(-counter[0])
+        raise RemoteZipError(f"所有下载源均无法获取 {self.filename} 的部分条目: {last_error}")
+
+    def extract(self, dest: Path, entries: List[ZipEntry] | None = None) -> int:
+        """
+        将条目解压到目标目录
+
+        Args:
+            dest: 目标目录
+            entries: 需要解压的条目, 为空时解压全部条目
+
+        Returns:
+            解压的条目数
+        """
+        entries = self.entries if entries is None else entries
+        if not entries:
+            return 0
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        batches = self._plan_batches(entries)
+        self._total_size = sum(
+            batch[-1].end_offset - batch[0].header_offset for batch in batches
+        )
+        self._downloaded_size = 0
+        self._stop_event.clear()
+        log.info(
+            f"正在从远程 ZIP 解压 {self.filename}: {len(entries)} 个条目, {len(batches)} 个批次, 共 {self._total_size / 1024 / 1024:.2f} MB"
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=min(REMOTE_ZIP_WORKERS, len(batches)),
+            thread_name_prefix="AuraRemoteZip",
+        ) as pool:
+            futures = [
+                pool.submit(self._fetch_batch, index, batch, dest)
+                for index, batch in enumerate(batches)
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                self._stop_event.set()
+                for future in futures:
+                    future.cancel()
+                raise
+
+        log.success(f"远程解压 {self.filename} 完成, 共 {len(entries)} 个条目")
+        return len(entries)
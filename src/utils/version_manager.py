@@ -9,6 +9,7 @@ import requests
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from loguru import logger as log
+from utils.httpClient import http_client
 
 
 class VersionManager:
@@ -89,7 +90,7 @@ class VersionManager:
         try:
             # 获取所有releases
             releases_url = f"{self.api_base}/releases"
-            response = requests.get(releases_url, timeout=self.timeout)
+            response = http_client.get(releases_url, timeout=self.timeout)
             response.raise_for_status()
             
             releases_data = response.json()
@@ -0,0 +1,279 @@
+"""
+ZIP 格式解析
+远程 ZIP 读取器与本地并行解压共用的中央目录解析、条目路径清理及条目解压校验
+"""
+
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Callable, Collection, Iterable, List, Optional, Tuple
+
+_EOCD = struct.Struct("<IHHHHIIH")
+_EOCD_SIG = b"PK\x05\x06"
+_ZIP64_LOCATOR = struct.Struct("<IIQI")
+_ZIP64_LOCATOR_SIG = 0x07064B50
+_ZIP64_EOCD = struct.Struct("<IQHHIIQQQQ")
+_ZIP64_EOCD_SIG = 0x06064B50
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_CENTRAL_HEADER_SIG = 0x02014B50
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_LOCAL_HEADER_SIG = 0x04034B50
+_ZIP64_EXTRA_ID = 0x0001
+_ZIP64_LIMIT = 0xFFFFFFFF
+
+# EOCD 固定 22 字节, 其后最多跟随 65535 字节的注释
+TAIL_BYTES = _EOCD.size + 0xFFFF
+LOCAL_HEADER_SIZE = _LOCAL_HEADER.size
+
+
+class ZipFormatError(Exception):
+    """ZIP 无法解析, 或条目数据校验失败"""
+
+
+class ZipLayoutError(ZipFormatError):
+    """ZIP 可以解析, 但其中的目录结构不正确"""
+
+
+class ZipEntry:
+    """中央目录中的一个条目, end_offset 为下一个条目 (或中央目录) 的起始偏移"""
+
+    __slots__ = (
+        "name",
+        "flags",
+        "method",
+        "crc",
+        "compress_size",
+        "file_size",
+        "header_offset",
+        "end_offset",
+    )
+
+    def __init__(self, name, flags, method, crc, compress_size, file_size, header_offset):
+        self.name = name
+        self.flags = flags
+        self.method = method
+        self.crc = crc
+        self.compress_size = compress_size
+        self.file_size = file_size
+        self.header_offset = header_offset
+        self.end_offset = header_offset
+
+    @property
+    def is_dir(self) -> bool:
+        return self.name.endswith("/")
+
+
+def _entry_parts(name: str) -> List[str]:
+    parts = [
+        part
+        for part in name.replace("\\", "/").split("/")
+        if part not in ("", ".", "..")
+    ]
+    if parts:
+        parts[0] = os.path.splitdrive(parts[0])[1]
+    return [part for part in parts if part]
+
+
+def safe_entry_path(dest: Path, name: str) -> Optional[Path]:
+    """按 zipfile 的规则清理条目路径, 防止写出目标目录之外"""
+    parts = _entry_parts(name)
+    return dest.joinpath(*parts) if parts else None
+
+
+def resolve_layout(
+    entries: List[ZipEntry], filename: str, root_names: Collection[str] = ()
+) -> Tuple[List[ZipEntry], str]:
+    """
+    仅凭中央目录检查 ZIP 的目录结构, 并去除所有条目共有的外层目录
+
+    外层目录的每一层都须为 root_names 中的名称 (如打包时多套了一层 "aura/" 或 "aura/aura/"),
+    去除后条目名称即为其相对于解压目标目录的路径; 仅由外层目录本身构成的目录条目被丢弃。
+
+    Args:
+        entries: 中央目录中的条目, 名称会被原地改写
+        filename: 文件名, 用于错误信息
+        root_names: 允许作为外层目录去除的名称
+
+    Returns:
+        (去除外层目录后的条目, 被去除的前缀, 无则为空字符串)
+
+    Raises:
+        ZipLayoutError: 不含任何文件, 或同一路径既是文件又是目录
+    """
+    split = [(entry, _entry_parts(entry.name)) for entry in entries]
+    files = [parts for entry, parts in split if parts and not entry.is_dir]
+    if not files:
+        raise ZipLayoutError(f"{filename} 中没有任何文件")
+
+    depth = 0
+    while True:
+        # 外层目录须包含全部条目, 且每个文件都位于其下 (而非就是该层本身)
+        name = files[0][depth] if len(files[0]) > depth + 1 else None
+        if (
+            name not in root_names
+            or any(len(parts) <= depth + 1 or parts[depth] != name for parts in files)
+            or any(len(parts) > depth and parts[depth] != name for _, parts in split)
+        ):
+            break
+        depth += 1
+
+    file_paths = set()
+    dir_paths = set()
+    resolved = []
+    for entry, parts in split:
+        parts = parts[depth:]
+        if not parts:
+            continue
+        path = "/".join(parts)
+        if entry.is_dir:
+            dir_paths.add(path)
+        else:
+            file_paths.add(path)
+            dir_paths.update("/".join(parts[:i]) for i in range(1, len(parts)))
+        entry.name = path + "/" if entry.is_dir else path
+        resolved.append(entry)
+
+    conflicts = file_paths & dir_paths
+    if conflicts:
+        raise ZipLayoutError(
+            f"{filename} 中的条目 {sorted(conflicts)[0]} 既是文件又是目录"
+        )
+    prefix = "/".join(files[0][:depth]) + "/" if depth else ""
+    return resolved, prefix
+
+
+def locate_central_directory(
+    tail: bytes, tail_start: int, read_range: Callable[[int, int], bytes]
+) -> Tuple[int, int, int]:
+    """
+    由文件末尾的数据定位中央目录
+
+    Args:
+        tail: 文件末尾的数据, 需包含目录结束记录及其注释
+        tail_start: tail 在文件中的起始偏移
+        read_range: 读取文件 [start, end) 区间的函数, 用于获取 tail 之外的 ZIP64 记录
+
+    Returns:
+        (条目数, 中央目录大小, 中央目录偏移)
+    """
+    eocd_pos = tail.rfind(_EOCD_SIG)
+    if eocd_pos < 0:
+        raise ZipFormatError("未找到 ZIP 目录结束记录")
+    _, disk, cd_disk, _, count, cd_size, cd_offset, _ = _EOCD.unpack_from(tail, eocd_pos)
+    if disk or cd_disk:
+        raise ZipFormatError("不支持分卷 ZIP")
+
+    locator_pos = eocd_pos - _ZIP64_LOCATOR.size
+    if locator_pos >= 0:
+        signature, _, eocd64_offset, _ = _ZIP64_LOCATOR.unpack_from(tail, locator_pos)
+        if signature == _ZIP64_LOCATOR_SIG:
+            if eocd64_offset >= tail_start:
+                record = tail[
+                    eocd64_offset - tail_start : eocd64_offset - tail_start + _ZIP64_EOCD.size
+                ]
+            else:
+                record = read_range(eocd64_offset, eocd64_offset + _ZIP64_EOCD.size)
+            fields = _ZIP64_EOCD.unpack(record)
+            if fields[0] != _ZIP64_EOCD_SIG:
+                raise ZipFormatError("ZIP64 目录结束记录无效")
+            count, cd_size, cd_offset = fields[7], fields[8], fields[9]
+    return count, cd_size, cd_offset
+
+
+def parse_central_directory(data: bytes, count: int, cd_offset: int) -> List[ZipEntry]:
+    """解析中央目录, 并按条目在文件中的位置计算各条目的 end_offset"""
+    entries = []
+    pos = 0
+    for _ in range(count):
+        (
+            signature, _, _, flags, method, _, _, crc, compress_size, file_size,
+            name_len, extra_len, comment_len, _, _, _, header_offset,
+        ) = _CENTRAL_HEADER.unpack_from(data, pos)
+        if signature != _CENTRAL_HEADER_SIG:
+            raise ZipFormatError("中央目录条目无效")
+        pos += _CENTRAL_HEADER.size
+        raw_name = data[pos : pos + name_len]
+        extra = data[pos + name_len : pos + name_len + extra_len]
+        pos += name_len + extra_len + comment_len
+
+        if _ZIP64_LIMIT in (file_size, compress_size, header_offset):
+            extra_pos = 0
+            while extra_pos + 4 <= len(extra):
+                header_id, size = struct.unpack_from("<HH", extra, extra_pos)
+                if header_id == _ZIP64_EXTRA_ID:
+                    values = iter(
+                        struct.unpack_from(f"<{size // 8}Q", extra, extra_pos + 4)
+                    )
+                    if file_size == _ZIP64_LIMIT:
+                        file_size = next(values)
+                    if compress_size == _ZIP64_LIMIT:
+                        compress_size = next(values)
+                    if header_offset == _ZIP64_LIMIT:
+                        header_offset = next(values)
+                    break
+                extra_pos += 4 + size
+
+        name = bytes(raw_name).decode("utf-8" if flags & 0x800 else "cp437")
+        entries.append(
+            ZipEntry(name, flags, method, crc, compress_size, file_size, header_offset)
+        )
+
+    ordered = sorted(entries, key=lambda entry: entry.header_offset)
+    for entry, following in zip(ordered, ordered[1:] + [None]):
+        entry.end_offset = following.header_offset if following else cd_offset
+    return entries
+
+
+def local_header_length(entry: ZipEntry, header: bytes) -> int:
+    """由本地文件头的固定部分得到完整本地文件头 (含文件名与扩展字段) 的长度"""
+    fields = _LOCAL_HEADER.unpack(header)
+    if fields[0] != _LOCAL_HEADER_SIG:
+        raise ZipFormatError(f"条目 {entry.name} 的本地文件头无效")
+    return _LOCAL_HEADER.size + fields[9] + fields[10]
+
+
+def inflate_entry(
+    entry: ZipEntry,
+    data: Iterable[bytes | memoryview],
+    target: Path,
+    preallocate: bool = False,
+):
+    """
+    解压单个条目并写入 target, 校验 CRC32 与解压后大小
+
+    Args:
+        entry: 条目
+        data: 条目压缩数据的数据块
+        target: 目标文件, 其所在目录需已存在
+        preallocate: 是否先按解压后大小预分配文件, 减少写入过程中的扩展与碎片
+    """
+    if entry.flags & 0x1:
+        raise ZipFormatError(f"不支持加密的条目: {entry.name}")
+    if entry.method == 8:
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    elif entry.method == 0:
+        decompressor = None
+    else:
+        raise ZipFormatError(f"不支持的压缩方式 {entry.method}: {entry.name}")
+
+    crc = 0
+    size = 0
+    try:
+        with open(target, "wb") as f:
+            if preallocate and entry.file_size:
+                f.truncate(entry.file_size)
+            for part in data:
+                output = decompressor.decompress(part) if decompressor else part
+                f.write(output)
+                crc = zlib.crc32(output, crc)
+                size += len(output)
+            if decompressor:
+                output = decompressor.flush()
+                f.write(output)
+                crc = zlib.crc32(output, crc)
+                size += len(output)
+    except zlib.error as e:
+        raise ZipFormatError(f"条目 {entry.name} 解压失败: {e}")
+    if crc != entry.crc or size != entry.file_size:
+        raise ZipFormatError(f"条目 {entry.name} CRC32 校验失败")
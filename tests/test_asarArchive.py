@@ -0,0 +1,70 @@
+import hashlib
+import pytest
+from utils.asarArchive import AsarArchive, pack_directory
+
+FILES = {
+    "package.json": b'{"name": "app"}',
+    "main.js": b"require('./lib/a');\n" * 100,
+    "lib/a.js": bytes(range(256)) * 40,
+    "lib/b.js": b"module.exports = 'b';\n",
+    "lib/deep/c.js": b"c" * 5000,
+    "empty.txt": b"",
+}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    src_dir = tmp_path / "src"
+    for name, data in FILES.items():
+        path = src_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    pack_directory(src_dir, tmp_path / "app.asar")
+    with AsarArchive(tmp_path / "app.asar") as archive:
+        yield archive
+
+
+def read_all(archive):
+    return {
+        path: archive.cat(path)
+        for path, node in archive.index.walk()
+        if node.is_packed_file
+    }
+
+
+def test_pack_directory_round_trip(archive, tmp_path):
+    assert read_all(archive) == FILES
+    archive.extract(tmp_path / "out")
+    assert (tmp_path / "out" / "lib" / "deep" / "c.js").read_bytes() == FILES["lib/deep/c.js"]
+
+
+def test_splice_replaces_and_adds_files(archive, tmp_path):
+    replacement = tmp_path / "b.js"
+    replacement.write_bytes(b"module.exports = 'patched';\n" * 10)
+    output_path = tmp_path / "patched.asar"
+    archive.splice(
+        output_path,
+        {
+            "main.js": b"require('./hook');\n",
+            "lib/b.js": replacement,
+            "hook/index.js": b"console.log('hook');\n",
+        },
+    )
+
+    expected = dict(FILES)
+    expected["main.js"] = b"require('./hook');\n"
+    expected["lib/b.js"] = replacement.read_bytes()
+    expected["hook/index.js"] = b"console.log('hook');\n"
+    with AsarArchive(output_path) as patched:
+        assert read_all(patched) == expected
+        for path, data in expected.items():
+            integrity = patched.index.lookup(path).raw["integrity"]
+            assert integrity["hash"] == hashlib.sha256(data).hexdigest()
+        assert patched.ls("hook") == ["index.js"]
+
+
+def test_splice_without_replacements_keeps_contents(archive, tmp_path):
+    archive.splice(tmp_path / "copy.asar", {})
+    with AsarArchive(tmp_path / "copy.asar") as copy:
+        assert read_all(copy) == FILES
+        assert copy.index.export() == archive.index.export()
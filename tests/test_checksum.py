@@ -0,0 +1,38 @@
+import hashlib
+import pytest
+from utils.checksum import (
+    ChecksumMismatchError,
+    IncrementalHasher,
+    sha256_file,
+    verify_digest,
+)
+
+DATA = bytes(range(256)) * 5000
+
+
+def test_incremental_hasher_sequential_updates():
+    hasher = IncrementalHasher()
+    for offset in range(0, len(DATA), 4096):
+        hasher.update(DATA[offset : offset + 4096])
+    assert hasher.position == len(DATA)
+    assert hasher.hexdigest() == hashlib.sha256(DATA).hexdigest()
+
+
+def test_incremental_hasher_reads_contiguous_prefix_from_disk(tmp_path):
+    path = tmp_path / "aura.zip.part"
+    path.write_bytes(DATA)
+    hasher = IncrementalHasher(path)
+    hasher.advance_to(1000)
+    hasher.advance_to(500)
+    assert hasher.position == 1000
+    hasher.advance_to(len(DATA))
+    assert hasher.hexdigest() == hashlib.sha256(DATA).hexdigest()
+    assert hasher.hexdigest() == sha256_file(path)
+
+
+def test_verify_digest():
+    actual = hashlib.sha256(DATA).hexdigest()
+    verify_digest("aura.zip", actual, None)
+    verify_digest("aura.zip", actual, actual.upper())
+    with pytest.raises(ChecksumMismatchError):
+        verify_digest("aura.zip", actual, "0" * 64)
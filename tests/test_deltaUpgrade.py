@@ -0,0 +1,74 @@
+import zipfile
+import pytest
+from utils.deltaUpgrade import DeltaUpgrade
+from utils.zipExtractor import LocalZip
+
+NEW_FILES = {
+    "index.js": b"console.log('v2');\n",
+    "lib/same.js": b"unchanged\n" * 50,
+    "lib/resized.js": b"grown\n" * 20,
+    "lib/added.js": b"new file\n",
+}
+
+
+@pytest.fixture
+def installed_dir(tmp_path):
+    installed_dir = tmp_path / "aura"
+    files = {
+        "index.js": b"console.log('v1');\n",
+        "lib/same.js": NEW_FILES["lib/same.js"],
+        "lib/resized.js": b"grown\n",
+        "lib/removed.js": b"old file\n",
+        "old/nested/x.js": b"x\n",
+    }
+    for name, data in files.items():
+        path = installed_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return installed_dir
+
+
+@pytest.fixture
+def delta_upgrade(tmp_path, installed_dir):
+    zip_path = tmp_path / "aura.zip"
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in NEW_FILES.items():
+            zf.writestr(f"aura/{name}", data)
+    archive = LocalZip(zip_path, root_names=("aura",))
+    archive.open()
+    return DeltaUpgrade(archive, installed_dir, str(tmp_path / "staging"))
+
+
+def test_plan_detects_changed_and_removed_files(delta_upgrade, installed_dir):
+    delta_upgrade.plan()
+    assert sorted(entry.name for entry in delta_upgrade.changed) == [
+        "index.js",
+        "lib/added.js",
+        "lib/resized.js",
+    ]
+    assert delta_upgrade.transfer_size == sum(
+        entry.compress_size for entry in delta_upgrade.changed
+    )
+    assert sorted(
+        path.relative_to(installed_dir).as_posix() for path in delta_upgrade.removed_files
+    ) == ["lib/removed.js", "old/nested/x.js"]
+    assert sorted(
+        path.relative_to(installed_dir).as_posix() for path in delta_upgrade.removed_dirs
+    ) == ["old", "old/nested"]
+
+
+def test_fetch_and_apply_match_new_tree(delta_upgrade, installed_dir):
+    delta_upgrade.plan()
+    delta_upgrade.fetch()
+    delta_upgrade.apply()
+    delta_upgrade.cleanup()
+    assert {
+        path.relative_to(installed_dir).as_posix(): path.read_bytes()
+        for path in installed_dir.rglob("*")
+        if path.is_file()
+    } == NEW_FILES
+    assert not (installed_dir / "old").exists()
+
+    delta_upgrade.plan()
+    assert delta_upgrade.changed == []
+    assert delta_upgrade.removed_files == []
@@ -0,0 +1,80 @@
+import pytest
+from utils import networkLimits
+from utils.networkLimits import TokenBucket, parse_rate
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (1000, 1000),
+        (1.5, 1),
+        ("2048", 2048),
+        ("512K", 512 * 1024),
+        ("2M", 2 * 1024 * 1024),
+        ("1.5m", int(1.5 * 1024 * 1024)),
+        (" 1G ", 1024 * 1024 * 1024),
+        ("2MB", 2 * 1024 * 1024),
+        ("2mb/s", 2 * 1024 * 1024),
+        ("0", 0),
+    ],
+)
+def test_parse_rate(value, expected):
+    assert parse_rate(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "fast", "-1M", "M", "1T"])
+def test_parse_rate_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_rate(value)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(networkLimits.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(networkLimits.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_token_bucket_allows_burst_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1000, capacity=500)
+    bucket.consume(300)
+    bucket.consume(200)
+    assert clock.sleeps == []
+
+
+def test_token_bucket_waits_for_debt(clock):
+    bucket = TokenBucket(rate=1000, capacity=500)
+    bucket.consume(500)
+    bucket.consume(250)
+    assert clock.sleeps == [pytest.approx(0.25)]
+
+
+def test_token_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1000, capacity=500)
+    bucket.consume(500)
+    clock.now += 10
+    bucket.consume(500)
+    assert clock.sleeps == []
+    bucket.consume(100)
+    assert clock.sleeps == [pytest.approx(0.1)]
+
+
+def test_token_bucket_limits_average_rate(clock):
+    bucket = TokenBucket(rate=1000, capacity=100)
+    for _ in range(50):
+        bucket.consume(100)
+    assert clock.now == pytest.approx(4.9)
@@ -0,0 +1,89 @@
+import pytest
+from utils import partialDownload
+from utils.partialDownload import PartialDownload
+
+
+@pytest.fixture
+def partial(tmp_path, monkeypatch):
+    monkeypatch.setattr(partialDownload, "PARTIAL_DOWNLOAD_DIR", str(tmp_path))
+    partial = PartialDownload("v1", "aura.zip")
+    partial.reset("http://mirror/v1/aura.zip", '"etag"', 100)
+    return partial
+
+
+def test_add_range_extends_sequential_writes(partial):
+    partial.add_range(0, 10)
+    partial.add_range(10, 25)
+    assert partial.ranges == [[0, 25]]
+    assert partial.contiguous_prefix() == 25
+
+
+def test_add_range_merges_out_of_order_segments(partial):
+    partial.add_range(50, 60)
+    partial.add_range(0, 10)
+    partial.add_range(30, 40)
+    assert partial.ranges == [[0, 10], [30, 40], [50, 60]]
+    partial.add_range(5, 35)
+    assert partial.ranges == [[0, 40], [50, 60]]
+    partial.add_range(40, 50)
+    assert partial.ranges == [[0, 60]]
+
+
+def test_add_range_ignores_empty_range(partial):
+    partial.add_range(10, 10)
+    partial.add_range(20, 5)
+    assert partial.ranges == []
+
+
+def test_missing_ranges_and_completion(partial):
+    partial.add_range(10, 20)
+    partial.add_range(60, 70)
+    assert partial.contiguous_prefix() == 0
+    assert partial.missing_ranges() == [(0, 10), (20, 60), (70, 100)]
+    assert partial.bytes_written == 20
+    assert not partial.is_complete
+
+    for start, end in partial.missing_ranges():
+        partial.add_range(start, end)
+    assert partial.missing_ranges() == []
+    assert partial.is_complete
+
+
+def test_load_restores_saved_ranges(partial):
+    partial.add_range(0, 30)
+    partial.add_range(80, 100)
+    partial.save()
+
+    restored = PartialDownload("v1", "aura.zip")
+    assert restored.load()
+    assert restored.url == "http://mirror/v1/aura.zip"
+    assert restored.etag == '"etag"'
+    assert restored.total_size == 100
+    assert restored.ranges == [[0, 30], [80, 100]]
+
+
+def test_load_rejects_corrupt_metadata(partial):
+    partial.add_range(0, 30)
+    partial.save()
+    partial.meta_path.write_text("{", encoding="utf-8")
+
+    restored = PartialDownload("v1", "aura.zip")
+    assert not restored.load()
+    assert restored.ranges == []
+
+
+def test_matches_compares_etag_and_size(partial):
+    assert partial.matches('"etag"', 100)
+    assert partial.matches(None, 0)
+    assert not partial.matches('"other"', 100)
+    assert not partial.matches('"etag"', 99)
+
+
+def test_finalize_moves_part_and_discards_metadata(partial, tmp_path):
+    with open(partial.part_path, "r+b") as f:
+        f.write(b"x" * 100)
+    partial.add_range(0, 100)
+    dest = partial.finalize(tmp_path / "out" / "aura.zip")
+    assert dest.read_bytes() == b"x" * 100
+    assert not partial.part_path.exists()
+    assert not partial.meta_path.exists()
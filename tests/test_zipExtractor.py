@@ -0,0 +1,69 @@
+import zipfile
+import pytest
+from utils.zipExtractor import LocalZip, extract_zip
+from utils.zipFormat import ZipFormatError, ZipLayoutError
+
+FILES = {
+    "index.js": b"console.log('aura');\n" * 200,
+    "lib/a.js": bytes(range(256)) * 64,
+    "lib/empty.txt": b"",
+}
+
+
+def make_zip(path, files, prefix=""):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in files.items():
+            method = zipfile.ZIP_STORED if name.endswith(".txt") else zipfile.ZIP_DEFLATED
+            zf.writestr(prefix + name, data, compress_type=method)
+    return path
+
+
+def read_tree(root):
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+def test_extract_zip_strips_root_folder(tmp_path):
+    zip_path = make_zip(tmp_path / "aura.zip", FILES, prefix="aura/")
+    progress = []
+    count = extract_zip(
+        zip_path,
+        tmp_path / "out",
+        lambda done, total, name: progress.append((done, total)),
+        ("aura",),
+    )
+    assert count == len(FILES)
+    assert read_tree(tmp_path / "out") == FILES
+    assert progress[-1][0] == progress[-1][1]
+
+
+def test_extract_zip_detects_corrupted_entry(tmp_path):
+    zip_path = make_zip(tmp_path / "aura.zip", {"a.txt": b"a" * 1000})
+    data = zip_path.read_bytes()
+    offset = data.index(b"a" * 1000)
+    zip_path.write_bytes(data[:offset] + b"b" + data[offset + 1 :])
+    with pytest.raises(ZipFormatError):
+        extract_zip(zip_path, tmp_path / "out")
+
+
+def test_extract_zip_rejects_bad_layout_before_writing(tmp_path):
+    zip_path = tmp_path / "aura.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("lib", b"file")
+        zf.writestr("lib/a.js", b"dir")
+    with pytest.raises(ZipLayoutError):
+        extract_zip(zip_path, tmp_path / "out")
+    assert not (tmp_path / "out").exists()
+
+
+def test_local_zip_extracts_selected_entries(tmp_path):
+    archive = LocalZip(make_zip(tmp_path / "aura.zip", FILES))
+    archive.open()
+    selected = [entry for entry in archive.entries if entry.name.startswith("lib/")]
+    assert archive.extract(tmp_path / "out", selected) == 2
+    assert read_tree(tmp_path / "out") == {
+        name: data for name, data in FILES.items() if name.startswith("lib/")
+    }
@@ -0,0 +1,81 @@
+from pathlib import Path
+import pytest
+from utils.zipFormat import ZipEntry, ZipLayoutError, resolve_layout, safe_entry_path
+
+
+def make_entries(*names):
+    return [ZipEntry(name, 0, 0, 0, 0, 0, 0) for name in names]
+
+
+def resolved_names(entries):
+    return [entry.name for entry in entries]
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("a/b.txt", ("a", "b.txt")),
+        ("../../evil.txt", ("evil.txt",)),
+        ("/etc/passwd", ("etc", "passwd")),
+        ("a\\..\\b.txt", ("a", "b.txt")),
+        ("./a/./b/", ("a", "b")),
+    ],
+)
+def test_safe_entry_path_stays_inside_dest(name, expected):
+    dest = Path("dest")
+    assert safe_entry_path(dest, name) == dest.joinpath(*expected)
+
+
+@pytest.mark.parametrize("name", ["", "/", "..", "../..", "./"])
+def test_safe_entry_path_skips_empty_names(name):
+    assert safe_entry_path(Path("dest"), name) is None
+
+
+def test_resolve_layout_without_root_folder():
+    entries, prefix = resolve_layout(
+        make_entries("index.js", "lib/", "lib/a.js"), "aura.zip", ("aura",)
+    )
+    assert prefix == ""
+    assert resolved_names(entries) == ["index.js", "lib/", "lib/a.js"]
+
+
+def test_resolve_layout_strips_nested_root_folders():
+    entries, prefix = resolve_layout(
+        make_entries("aura/", "aura/aura/", "aura/aura/index.js", "aura/aura/lib/a.js"),
+        "aura.zip",
+        ("aura",),
+    )
+    assert prefix == "aura/aura/"
+    assert resolved_names(entries) == ["index.js", "lib/a.js"]
+
+
+def test_resolve_layout_keeps_unlisted_root_folder():
+    entries, prefix = resolve_layout(
+        make_entries("dist/index.js", "dist/lib/a.js"), "aura.zip", ("aura",)
+    )
+    assert prefix == ""
+    assert resolved_names(entries) == ["dist/index.js", "dist/lib/a.js"]
+
+
+def test_resolve_layout_keeps_root_folder_shared_with_top_level_files():
+    entries, prefix = resolve_layout(
+        make_entries("aura/index.js", "README.md"), "aura.zip", ("aura",)
+    )
+    assert prefix == ""
+    assert resolved_names(entries) == ["aura/index.js", "README.md"]
+
+
+def test_resolve_layout_does_not_strip_a_single_file():
+    entries, prefix = resolve_layout(make_entries("aura"), "aura.zip", ("aura",))
+    assert prefix == ""
+    assert resolved_names(entries) == ["aura"]
+
+
+def test_resolve_layout_rejects_archive_without_files():
+    with pytest.raises(ZipLayoutError):
+        resolve_layout(make_entries("aura/", "aura/lib/"), "aura.zip", ("aura",))
+
+
+def test_resolve_layout_rejects_file_and_directory_conflict():
+    with pytest.raises(ZipLayoutError):
+        resolve_layout(make_entries("lib", "lib/a.js"), "aura.zip")